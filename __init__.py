@@ -1,5 +1,6 @@
 import os
 import sys
+import time
 
 # Add libs directory to Python path
 libs_dir = os.path.join(os.path.dirname(__file__), 'libs')
@@ -10,19 +11,25 @@ from aqt import mw
 from aqt.qt import *
 from aqt.utils import showInfo, showWarning, getOnlyText
 from anki.hooks import addHook
-from anki.utils import stripHTML
+from anki.utils import stripHTML, ids2str, split_fields
 
 from .src.ui.dialogs.sentence_dialog import SentenceDialog
 from .src.ui.dialogs.article_dialog import GeneratedArticleDialog
 from .src.ui.dialogs.config_dialog import ConfigDialog
+from .src.ui.dialogs.stats_dialog import StatsDialog
 from .src.utils.logger import Logger
+from .src.utils.paths import get_user_files_dir
+from .src.utils.worker import AIWorker
 
 class VocabMaster:
     """VocabMaster plugin main class"""
     
     def __init__(self):
         self.config_path = os.path.join(os.path.dirname(__file__), 'config.json')
-        self.logger = Logger(__name__)
+        self.logger = Logger.get_instance(
+            os.path.join(get_user_files_dir(self.config_path), 'vocabmaster.log')
+        )
+        self.batch_worker = None
         self.setup_menu()
         
     def setup_menu(self):
@@ -39,8 +46,16 @@ class VocabMaster:
         sentence_action.triggered.connect(self.show_sentence_dialog)
         menu.addAction(sentence_action)
         
+        examples_action = QAction('Prepare Examples for Reviewed Words', mw)
+        examples_action.triggered.connect(self.prepare_examples)
+        menu.addAction(examples_action)
+        
         menu.addSeparator()
         
+        stats_action = QAction('Usage Statistics', mw)
+        stats_action.triggered.connect(self.show_stats_dialog)
+        menu.addAction(stats_action)
+        
         config_action = QAction('Settings', mw)
         config_action.triggered.connect(self.show_config_dialog)
         menu.addAction(config_action)
@@ -60,7 +75,7 @@ class VocabMaster:
             dialog = GeneratedArticleDialog(words, self.config_path, mw)
             dialog.exec()
         except Exception as e:
-            self.logger.error(f"Error showing article dialog: {e}")
+            self.logger.exception("Error showing article dialog: %s", e)
             showWarning(str(e))
             
     def show_sentence_dialog(self):
@@ -75,25 +90,73 @@ class VocabMaster:
             dialog = SentenceDialog(words, self.config_path, mw)
             dialog.exec()
         except Exception as e:
-            self.logger.error(f"Error showing sentence dialog: {e}")
+            self.logger.exception("Error showing sentence dialog: %s", e)
+            showWarning(str(e))
+            
+    def prepare_examples(self):
+        """Generate example sentences for all reviewed words in batches"""
+        try:
+            words = self.get_selected_words()
+            if not words:
+                showInfo("No reviewed words found in the current deck.")
+                return
+            if self.batch_worker is not None and self.batch_worker.isRunning():
+                showInfo("Examples are already being prepared.")
+                return
+                
+            progress = QProgressDialog("Preparing examples...", "Cancel", 0, len(words), mw)
+            progress.setWindowTitle("VocabMaster")
+            progress.setMinimumDuration(0)
+            
+            def on_progress(word: str, done: int, total: int):
+                progress.setLabelText(f"Prepared examples for '{word}' ({done}/{total})")
+                progress.setValue(done)
+                
+            def on_finished(results: dict):
+                progress.close()
+                showInfo(f"Prepared examples for {len(results)} of {len(words)} words.")
+                
+            def on_error(message: str):
+                progress.close()
+                showWarning(message)
+                
+            self.batch_worker = AIWorker(
+                "generate_examples_batch",
+                {"words": words, "count": 3},
+                self.config_path
+            )
+            self.batch_worker.progress.connect(on_progress)
+            self.batch_worker.batch_finished.connect(on_finished)
+            self.batch_worker.error.connect(on_error)
+            self.batch_worker.rate_limit.connect(lambda message, wait_time: on_error(
+                f"Rate limit exceeded. Please wait {wait_time} seconds and try again."))
+            progress.canceled.connect(self.batch_worker.stop)
+            self.batch_worker.start()
+        except Exception as e:
+            self.logger.exception("Error preparing examples: %s", e)
             showWarning(str(e))
             
     def get_selected_words(self) -> list[str]:
         """Get words from cards reviewed today in current deck"""
         from aqt import mw
         
-        # 获取当前deck中已复习的卡片
+        start = time.perf_counter()
+        # 获取当前deck中已复习的卡片所属的笔记
         query = "deck:current rated:1"
-        reviewed_cards = mw.col.find_cards(query)
+        note_ids = mw.col.find_notes(query)
+        if not note_ids:
+            return []
+            
+        # Read all first fields in one query instead of loading each card and note
+        fields = mw.col.db.list(f"select flds from notes where id in {ids2str(note_ids)}")
+        words = list(dict.fromkeys(
+            word for word in (stripHTML(split_fields(flds)[0]).strip() for flds in fields)
+            if word
+        ))
         
-        words = set()
-        for card_id in reviewed_cards:
-            card = mw.col.get_card(card_id)
-            note = card.note()
-            if note:
-                word = stripHTML(note.fields[0])
-                words.add(word)
-        return list(words)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.logger.info("Collected %d words from %d notes in %.1f ms", len(words), len(note_ids), elapsed_ms)
+        return words
         
     def show_config_dialog(self):
         """Show configuration dialog"""
@@ -101,7 +164,16 @@ class VocabMaster:
             dialog = ConfigDialog(self.config_path, mw)
             dialog.exec()
         except Exception as e:
-            self.logger.error(f"Error showing config dialog: {e}")
+            self.logger.exception("Error showing config dialog: %s", e)
+            showWarning(str(e))
+
+    def show_stats_dialog(self):
+        """Show request metrics dialog"""
+        try:
+            dialog = StatsDialog(self.config_path, mw)
+            dialog.exec()
+        except Exception as e:
+            self.logger.exception("Error showing stats dialog: %s", e)
             showWarning(str(e))
 
 # Create plugin instance
@@ -1,103 +1,99 @@
-from ast import Return
 import os
 import json
-import re
-import requests
+import hashlib
+import threading
 import time
-from typing import List, Dict, Optional, Union
-from datetime import datetime
-import jwt
-import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import List, Dict, Optional, Tuple, Callable, Iterator
 
-class RateLimitError(Exception):
-    """Exception raised when API rate limit is exceeded"""
-    def __init__(self, message: str, retry_after: int = 60):
-        super().__init__(message)
-        self.retry_after = retry_after
+from .cancel import CancelToken, RequestCancelled
+from .errors import APIError, ConfigError, RateLimitError
+from .hedging import HedgedRequest
+from .metrics import MetricsStore, RequestRecord
+from .prompt_templates import PromptTemplate, get_templates
+from .providers import Provider, create_provider, get_provider_class, provider_names
+from .response_cache import ResponseCache
+from .retry import RetryScheduler
+from .routing import Failover, Route, Router, routes_config_error
+from .scheduler import DEFAULT_PRIORITIES, Priority, estimate_tokens, get_request_scheduler
+from ..config.defaults import CONFIG_TYPES, DEFAULT_CONFIG
+from ..utils.logger import get_logger
+from ..utils.paths import get_user_files_dir
 
-class APIError(Exception):
-    """Base exception for API related errors"""
-    pass
+logger = get_logger(__name__)
 
-class ConfigError(Exception):
-    """Exception raised for configuration related errors"""
-    pass
+class MessagePreparer:
+    """Builds request messages from prompt templates with config values bound.
 
-from typing import Dict, List
+    Templates are compiled when the preparer is created, so each request
+    only fills in its own parameters.
+    """
 
-class MessagePreparer:
     def __init__(self, config: Dict):
         self.config = config
-
-    def _prepare_messages(self, action: str, params: Dict) -> List[Dict[str, str]]:
-        """Prepare messages for API request based on action with optimized prompts."""
-        action_handlers = {
+        bound = {
+            'target_language': config['target_language'],
+            'feedback_language': config['feedback_language']
+        }
+        self.templates = {
+            name: template.bind(**{k: v for k, v in bound.items() if k in template.fields})
+            for name, template in get_templates().items()
+        }
+        self.action_handlers = {
             "test": self._handle_test,
             "generate_article": self._handle_generate_article,
             "evaluate_sentence": self._handle_evaluate_sentence,
             "generate_examples": self._handle_generate_examples,
+            "generate_examples_batch": self._handle_generate_examples_batch,
         }
 
-        handler = action_handlers.get(action)
+    def _prepare_messages(self, action: str, params: Dict) -> List[Dict[str, str]]:
+        """Prepare messages for API request based on action with optimized prompts."""
+        handler = self.action_handlers.get(action)
         if not handler:
             raise ValueError(f"Unknown action: {action}")
 
-        return [{"role": "user", "content": handler(params)}]
+        return [{"role": "user", "content": handler(self.templates[action], params)}]
+
+    def prompt_version(self, action: str) -> str:
+        """Get the version of the prompt template used for an action"""
+        return self.templates[action].version
 
-    def _handle_test(self, params: Dict) -> str:
-        return f"Test message received: \"{params['message']}\"."
+    def _handle_test(self, template: PromptTemplate, params: Dict) -> str:
+        return template.render(message=params['message'])
 
-    def _handle_generate_article(self, params: Dict) -> str:
-        words = ', '.join(params['words'])
+    def _handle_generate_article(self, template: PromptTemplate, params: Dict) -> str:
         """Generate an article using the selected words"""
-        target_lang = self.config['target_language']
-        prompt = f"""Please write a short article (150-200 words) in {target_lang} that naturally incorporates these vocabulary words: {', '.join(words)}.
-        Make sure to use each word in a clear context that demonstrates its meaning.
-        Format the article with proper paragraphs and highlight each vocabulary word in bold."""
-        return prompt
-
-    def _handle_evaluate_sentence(self, params: Dict) -> str:
-        target_lang = self.config['target_language']
-        feedback_lang = self.config['feedback_language']
-        prompt = f"""Please evaluate this {target_lang} sentence using the word '{params['target_word']}':
-        "{params['sentence']}"
-        
-        Provide feedback in {feedback_lang} on:
-        1. Grammar and natural usage
-        2. Whether the word is used correctly
-        3. Suggestions for improvement if needed"""
-        return prompt
-
-    def _handle_generate_examples(self, params: Dict) -> str:
-        count = params.get('count', 3)
-        target_lang = self.config['target_language']
-        prompt = f"""Please generate {count} example sentences in {target_lang} using the word '{params['word']}'.
-        Remember the reponse should only contain sentences and not any other text.
-        Make the sentences:
-        1. Natural and contextual
-        2. Varied in structure
-        3. Clear in demonstrating the word's meaning"""
-        return prompt
+        return template.render(words=', '.join(params['words']))
+
+    def _handle_evaluate_sentence(self, template: PromptTemplate, params: Dict) -> str:
+        return template.render(target_word=params['target_word'], sentence=params['sentence'])
+
+    def _handle_generate_examples(self, template: PromptTemplate, params: Dict) -> str:
+        return template.render(count=params.get('count', 3), word=params['word'])
+
+    def _handle_generate_examples_batch(self, template: PromptTemplate, params: Dict) -> str:
+        return template.render(
+            count=params.get('count', 3),
+            words=json.dumps(params['words'], ensure_ascii=False)
+        )
     
 class APIHandler:
+    # Actions whose responses are reused for identical prompts
+    CACHEABLE_ACTIONS = ('evaluate_sentence', 'generate_examples')
+
     def __init__(self, config_path: str):
         self.config_path = config_path
-        self.default_config = {
-            'api_provider': 'OpenAI',
-            'openai_api_key': '',
-            'chatglm_api_key': '',
-            'target_language': 'English',
-            'feedback_language': 'English',
-            'openai_model': 'gpt-3.5-turbo',
-            'chatglm_model': 'glm-4',
-            'temperature': 0.7,
-            'max_retries': 3,
-            'retry_delay': 1,
-            'timeout': 60,
-            'chatglm_endpoint': 'https://open.bigmodel.cn/api/paas/v4/chat/completions'
-        }
+        self.default_config = DEFAULT_CONFIG
+        self.providers: Dict[str, Provider] = {}
+        self._providers_lock = threading.Lock()
+        self._hedge_executor = None
+        self.cache = None
+        self.metrics = None
         self.config = self.load_config()
         self.preparer = MessagePreparer(self.config)
+        self.router = Router(self.config)
         self.setup_api()
 
     def load_config(self) -> Dict:
@@ -116,36 +112,139 @@ class APIHandler:
         except Exception as e:
             raise ConfigError(f"Error loading config: {e}")
 
+    def reload_config(self) -> None:
+        """Re-read configuration from file, keeping warm connections when possible"""
+        self.config = self.load_config()
+        self.preparer = MessagePreparer(self.config)
+        self.setup_api()
+
     def _validate_config(self, config: Dict) -> None:
         """Validate configuration values"""
-        required_fields = {
-            'api_provider': str,
-            'temperature': (int, float),
-            'max_retries': int,
-            'retry_delay': (int, float),
-            'timeout': int
-        }
-
-        for field, expected_type in required_fields.items():
+        for field, expected_type in CONFIG_TYPES.items():
             if field not in config:
                 raise ConfigError(f"Missing required field: {field}")
             if not isinstance(config[field], expected_type):
                 raise ConfigError(f"Invalid type for {field}: expected {expected_type}, got {type(config[field])}")
 
-        if config['api_provider'] not in ['OpenAI', 'ChatGLM']:
-            raise ConfigError("Invalid API provider. Must be 'OpenAI' or 'ChatGLM'")
+        names = provider_names()
+        if config['api_provider'] not in names:
+            raise ConfigError(f"Invalid API provider. Must be one of {', '.join(names)}")
+
+        error = get_provider_class(config['api_provider']).config_error(config)
+        if error:
+            raise ConfigError(error)
 
-        if config['api_provider'] == 'OpenAI' and not config['openai_api_key']:
-            raise ConfigError("OpenAI API key is required when using OpenAI provider")
-        elif config['api_provider'] == 'ChatGLM' and not config['chatglm_api_key']:
-            raise ConfigError("ChatGLM API key is required when using ChatGLM provider")
+        error = routes_config_error(config)
+        if error:
+            raise ConfigError(error)
 
     def setup_api(self) -> None:
         """Set up API client based on provider"""
-        if self.config['api_provider'] == 'OpenAI':
-            import openai
-            openai.api_key = self.config['openai_api_key']
-        # Add setup for other providers as needed
+        # Providers are created on first use and keep their warm pools on reload
+        with self._providers_lock:
+            for provider in self.providers.values():
+                provider.configure(self.config)
+        self.router.configure(self.config)
+        self._setup_cache()
+        self._setup_metrics()
+
+    def get_provider(self, name: Optional[str] = None) -> Provider:
+        """Get the provider with the given name, by default the configured one"""
+        if name is None:
+            name = self.config['api_provider']
+        with self._providers_lock:
+            provider = self.providers.get(name)
+            if provider is None:
+                provider = create_provider(name, self.config)
+                self.providers[name] = provider
+            return provider
+
+    def _setup_cache(self) -> None:
+        """Open the response cache in the add-on's user_files directory"""
+        if not self.config['cache_enabled']:
+            return
+        if self.cache is None:
+            db_path = os.path.join(get_user_files_dir(self.config_path), 'response_cache.sqlite3')
+            self.cache = ResponseCache(db_path)
+        self.cache.ttl = self.config['cache_ttl']
+        self.cache.max_entries = self.config['cache_max_entries']
+
+    def _setup_metrics(self) -> None:
+        """Open the request metrics log in the add-on's user_files directory"""
+        if not self.config['metrics_enabled']:
+            return
+        if self.metrics is None:
+            db_path = os.path.join(get_user_files_dir(self.config_path), 'metrics.sqlite3')
+            self.metrics = MetricsStore(db_path)
+        self.metrics.max_entries = self.config['metrics_max_entries']
+
+    @contextmanager
+    def _track_request(self, action: str) -> Iterator[RequestRecord]:
+        """Measure a request and store it in the metrics log when it ends"""
+        route = self.router.primary(action)
+        record = RequestRecord(action, route.provider, route.model)
+        status = 'ok'
+        try:
+            yield record
+        except RequestCancelled:
+            status = 'cancelled'
+            raise
+        except Exception:
+            status = 'error'
+            raise
+        except BaseException:
+            # asyncio task cancellation
+            status = 'cancelled'
+            raise
+        finally:
+            if self.metrics is not None and self.config['metrics_enabled']:
+                self.metrics.record(record, status)
+
+    def metrics_summary(self, since: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Get per-action latency, token, retry and cache statistics"""
+        if self.metrics is None:
+            return {}
+        return self.metrics.summary(since)
+
+    def _cache_key(self, action: str, params: Dict) -> Optional[str]:
+        """Get the response cache key of a request, or None if it is not cacheable"""
+        if self.cache is None or not self.config['cache_enabled']:
+            return None
+        if action not in self.CACHEABLE_ACTIONS:
+            return None
+        # Any route may answer, the key names the preferred one
+        route = self.router.primary(action)
+        return ResponseCache.make_key(
+            route.provider,
+            route.model,
+            self.config['temperature'],
+            self._prepare_messages(action, params),
+            self.preparer.prompt_version(action)
+        )
+
+    def route_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get rolling latency and error rate of each route used so far"""
+        return self.router.stats()
+
+    def connection_stats(self) -> Dict[str, int]:
+        """Get connection reuse counters of the current provider's pool"""
+        return self.get_provider().stats()
+
+    def close(self) -> None:
+        """Release pooled connections"""
+        with self._providers_lock:
+            for provider in self.providers.values():
+                provider.close()
+        if self._hedge_executor is not None:
+            # Cancelled losers may still wait for a response, do not block on them
+            self._hedge_executor.shutdown(wait=False)
+            self._hedge_executor = None
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+        if self.metrics is not None:
+            self.metrics.close()
+            self.metrics = None
 
     def save_config(self, config_updates: Dict) -> None:
         """Save updated configuration"""
@@ -158,98 +257,235 @@ class APIHandler:
                 json.dump(new_config, f, indent=4)
             
             self.config = new_config
+            self.preparer = MessagePreparer(self.config)
             self.setup_api()
         except Exception as e:
             raise ConfigError(f"Error saving config: {e}")
 
-    def _make_api_request(self, action: str, params: Dict) -> str:
-        """Make API request with retry logic"""
-        retries = 0
-        while retries < self.config['max_retries']:
+    def _make_api_request(self, action: str, params: Dict,
+                          on_chunk: Optional[Callable[[str], None]] = None,
+                          force_refresh: bool = False,
+                          priority: Optional[Priority] = None,
+                          cancel_token: Optional[CancelToken] = None) -> str:
+        """Make API request with response caching and retry logic.
+
+        When on_chunk is given and streaming is enabled, each text delta is
+        passed to it as it arrives; the full text is still returned.
+        force_refresh skips the cache lookup but still stores the new response.
+        priority orders the request in the provider's queue and defaults
+        to the action's entry in DEFAULT_PRIORITIES. Cancelling cancel_token
+        aborts the request wherever it is waiting and raises RequestCancelled.
+        """
+        if not self.config['stream_responses']:
+            on_chunk = None
+
+        with self._track_request(action) as record:
+            cache_key = self._cache_key(action, params)
+            if cache_key is not None and not force_refresh:
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    record.cache_hit = True
+                    if on_chunk is not None:
+                        on_chunk(cached)
+                    return cached
+
+            if self.config['hedge_enabled'] and action in self.config['hedge_actions']:
+                result = self._hedged_request(action, params, on_chunk, priority,
+                                              cancel_token, record)
+            else:
+                result = self._request_with_retries(action, params, on_chunk, priority,
+                                                    cancel_token, record)
+            if cache_key is not None and result:
+                self.cache.put(cache_key, result)
+            return result
+
+    def _request_with_retries(self, action: str, params: Dict,
+                              on_chunk: Optional[Callable[[str], None]] = None,
+                              priority: Optional[Priority] = None,
+                              cancel_token: Optional[CancelToken] = None,
+                              record: Optional[RequestRecord] = None,
+                              routes: Optional[List[Route]] = None) -> str:
+        """Send the request along the action's routes, retrying and failing over on failure.
+
+        routes overrides the order given by the router.
+        """
+        if cancel_token is None:
+            cancel_token = CancelToken()
+        first_chunk = None
+
+        def deliver(chunk: str) -> None:
+            nonlocal first_chunk
+            if first_chunk is None:
+                first_chunk = time.monotonic()
+            on_chunk(chunk)
+
+        messages = self._prepare_messages(action, params)
+        failover = self._failover(action, params, priority, cancel_token, routes)
+        while True:
+            route, scheduler, wait = failover.current()
+            cancel_token.sleep(wait)
+            scheduler.before_attempt()
+            if record is not None:
+                record.provider, record.model = route
+            start = time.monotonic()
             try:
-                if self.config['api_provider'] == 'OpenAI':
-                    return self._make_openai_request(action, params)
-                elif self.config['api_provider'] == 'ChatGLM':
-                    return self._make_chatglm_request(action, params)
-                else:
-                    raise APIError(f"Unsupported API provider: {self.config['api_provider']}")
-            except RateLimitError:
-                raise
+                callback = deliver if on_chunk is not None else None
+                result = self.get_provider(route.provider).complete(
+                    messages, callback, cancel_token, record, route.model)
             except Exception as e:
-                retries += 1
-                if retries == self.config['max_retries']:
-                    raise APIError(f"API request failed after {retries} retries: {e}")
-                time.sleep(self.config['retry_delay'])
-
-    def _make_openai_request(self, action: str, params: Dict) -> str:
-        """Make request to OpenAI API"""
-        import openai
+                if cancel_token.cancelled:
+                    # Whatever failed was aborted by the cancellation
+                    raise RequestCancelled("Request cancelled") from e
+                self.router.record(action, route, time.monotonic() - start, ok=False)
+                if first_chunk is not None:
+                    # Retrying would repeat text the caller has already shown
+                    raise APIError(f"API stream interrupted: {e}")
+                # Raises when no attempt is left, so only real retries are counted
+                self._schedule_retry(action, failover, route, scheduler, e)
+                if record is not None:
+                    record.retries += 1
+                continue
+            # Closing a cancelled response can end it early without an error,
+            # its text is partial and must not count as a successful sample
+            cancel_token.raise_if_cancelled()
+            self.router.record(action, route, time.monotonic() - start,
+                               first_token=first_chunk - start if first_chunk else None)
+            return result
+
+    def _hedged_request(self, action: str, params: Dict,
+                        on_chunk: Optional[Callable[[str], None]] = None,
+                        priority: Optional[Priority] = None,
+                        cancel_token: Optional[CancelToken] = None,
+                        record: Optional[RequestRecord] = None) -> str:
+        """Send the request and race a backup copy against it if no text arrives in time.
+
+        The backup starts on the next route, or on another pooled connection
+        of the same route when there is only one.
+        """
+        routes = self.router.routes_for(action)
+        primary = routes[0]
+        records = {}
+
+        def run_leg(index: int, callback: Optional[Callable[[str], None]],
+                    token: CancelToken) -> str:
+            shift = index % len(routes)
+            records[index] = RequestRecord(action, *routes[shift])
+            return self._request_with_retries(action, params, callback, priority, token,
+                                              records[index], routes[shift:] + routes[:shift])
+
+        hedge = HedgedRequest(self._get_hedge_executor(), run_leg, on_chunk, cancel_token)
         try:
-            messages = self._prepare_messages(action, params)
-            response = openai.ChatCompletion.create(
-                model=self.config['openai_model'],
-                messages=messages,
-                temperature=self.config['temperature']
-            )
-            return response.choices[0].message.content.strip()
-        except openai.error.RateLimitError as e:
-            raise RateLimitError(str(e), retry_after=60)
-        except Exception as e:
-            raise APIError(f"OpenAI API error: {e}")
+            return hedge.run(self._hedge_delay(action, primary))
+        finally:
+            winner = hedge.winner
+            if record is not None:
+                record.hedged = hedge.hedged
+                leg_record = records.get(winner.index if winner else 0)
+                if leg_record is not None:
+                    record.provider, record.model = leg_record.provider, leg_record.model
+                    record.prompt_tokens = leg_record.prompt_tokens
+                    record.completion_tokens = leg_record.completion_tokens
+                    record.retries = sum(leg.retries for leg in records.values())
+            if winner is not None and winner.index > 0:
+                self._record_hedge_win(action, primary, hedge, record)
+
+    def _hedge_delay(self, action: str, route: Route) -> float:
+        """Get how long to wait for the first text before hedging"""
+        observed = self.router.first_token_percentile(
+            action, route, self.config['hedge_percentile'])
+        if observed is None:
+            return self.config['hedge_default_delay']
+        return max(self.config['hedge_min_delay'], observed)
+
+    def _record_hedge_win(self, action: str, primary: Route, hedge: HedgedRequest,
+                          record: Optional[RequestRecord] = None) -> None:
+        """Account for a primary that lost to the backup"""
+        elapsed = hedge.won_at - hedge.legs[0].started
+        expected = self.router.expected_first_token(action, primary, elapsed)
+        # The cancelled primary took at least this long. It counts as a failure
+        # so a route that keeps losing is degraded instead of hedged forever
+        self.router.record(action, primary, elapsed, ok=False)
+        if record is not None:
+            record.latency_saved = expected - elapsed if expected is not None else 0.0
+        logger.info("%s hedge won over %s/%s after %.2fs",
+                    action, primary.provider, primary.model, elapsed)
+
+    def _get_hedge_executor(self) -> ThreadPoolExecutor:
+        """Get the threads running hedged request legs"""
+        with self._providers_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=2 * self.config['max_concurrent_requests'],
+                    thread_name_prefix='VocabMaster-hedge'
+                )
+            return self._hedge_executor
 
-    def _make_chatglm_request(self, action: str, params: Dict) -> str:
-        """Make request to ChatGLM API"""
+    def _failover(self, action: str, params: Dict,
+                  priority: Optional[Priority] = None,
+                  cancel_token: Optional[CancelToken] = None,
+                  routes: Optional[List[Route]] = None) -> Failover:
+        """Create the route schedule of one request"""
+        return Failover(
+            routes or self.router.routes_for(action),
+            lambda route: self._retry_scheduler(action, params, priority, cancel_token,
+                                                route.provider)
+        )
+
+    def _schedule_retry(self, action: str, failover: Failover, route: Route,
+                        scheduler: RetryScheduler, error: Exception) -> None:
+        """Plan the next attempt after route failed, raising if no route is left"""
         try:
-            api_key = self.config['chatglm_api_key']
-            print(f"[DEBUG] Using API Key: {api_key[:10]}...")
-            
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {api_key}"
-            }
-            
-            messages = self._prepare_messages(action, params)
-            data = {
-                "model": "chatglm_std",
-                "messages": messages,  # Send all messages
-                "temperature": self.config['temperature'],
-                "stream": False,  # Explicitly set stream to false
-                "request_id": str(uuid.uuid4())
-            }
-            print(f"[DEBUG] Request Data: {data}")
-            
-            endpoint = "https://open.bigmodel.cn/api/paas/v4/chat/completions"  # Use v4 chat completions endpoint
-            print(f"[DEBUG] Using endpoint: {endpoint}")
-            
-            response = requests.post(
-                endpoint,
-                headers=headers,
-                json=data,
-                timeout=self.config['timeout']
-            )
-            
-            print(f"[DEBUG] Response Status: {response.status_code}")
-            print(f"[DEBUG] Response Content: {response.text}")
-            
-            if response.status_code == 429:
-                retry_after = int(response.headers.get('Retry-After', 60))
-                raise RateLimitError("ChatGLM rate limit exceeded", retry_after=retry_after)
-            elif response.status_code != 200:
-                print(f"[DEBUG] Response Headers: {dict(response.headers)}")
-                raise APIError(f"ChatGLM API error: HTTP {response.status_code}\n{response.text}")
-            
-            try:
-                response_data = response.json()
-                if not response_data.get('choices'):
-                    raise APIError(f"Invalid response format from ChatGLM API: {response_data}")
-                    
-                return response_data['choices'][0]['message']['content'].strip()
-                
-            except json.JSONDecodeError as e:
-                raise APIError(f"Failed to parse ChatGLM API response: {e}")
-                
-        except requests.exceptions.RequestException as e:
-            raise APIError(f"ChatGLM API error: {e}")
+            delay = self._next_retry_delay(scheduler, error)
+        except (APIError, RateLimitError):
+            if not failover.drop(route):
+                raise
+            logger.warning("%s failed on %s/%s, failing over: %s",
+                           action, route.provider, route.model, error)
+            return
+        failover.retry_later(route, delay)
+
+    def _request_scheduler(self, provider: Optional[str] = None):
+        """Get the shared request scheduler of a provider, by default the configured one"""
+        return get_request_scheduler(
+            provider or self.config['api_provider'],
+            self.config['rate_limit_rpm'],
+            self.config['rate_limit_tpm']
+        )
+
+    def _retry_scheduler(self, action: str, params: Dict,
+                         priority: Optional[Priority] = None,
+                         cancel_token: Optional[CancelToken] = None,
+                         provider: Optional[str] = None) -> RetryScheduler:
+        """Create the retry schedule of one request on one provider"""
+        if priority is None:
+            priority = DEFAULT_PRIORITIES.get(action, Priority.NORMAL)
+        return RetryScheduler(
+            self._request_scheduler(provider),
+            max_attempts=self.config['max_retries'],
+            base_delay=self.config['retry_delay'],
+            max_delay=self.config['max_retry_delay'],
+            max_rate_limit_wait=self.config['max_rate_limit_wait'],
+            priority=priority,
+            tokens=estimate_tokens(action, self._prepare_messages(action, params)),
+            cancel_token=cancel_token
+        )
+
+    def scheduler_stats(self) -> Dict[str, float]:
+        """Get queue depth and wait time metrics of the current provider"""
+        return self._request_scheduler().stats()
+
+    @staticmethod
+    def _next_retry_delay(scheduler: RetryScheduler, error: Exception) -> float:
+        """Get the delay before retrying after error, raising if it should not be retried"""
+        if isinstance(error, RateLimitError) and error.retry_after is not None:
+            delay = scheduler.on_error(error, retry_after=error.retry_after)
+            if delay is None:
+                raise error
+            return delay
+        delay = scheduler.on_error(error)
+        if delay is None:
+            raise APIError(f"API request failed after {scheduler.attempts} attempts: {error}")
+        return delay
 
     def _prepare_messages(self, action: str, params: Dict) -> List[Dict[str, str]]:
         """Prepare messages for API request based on action"""
@@ -259,31 +495,97 @@ class APIHandler:
         """Test API connection by making a simple request"""
         try:
             test_message = "Hello! This is a test message to verify the API connection."
-            messages = [{"role": "user", "content": test_message}]
+            messages = self._prepare_messages("test", {"message": test_message})
             
-            if self.config['api_provider'] == 'ChatGLM':
-                return self._make_chatglm_request("test", {"message": test_message}) is not None
-            elif self.config['api_provider'] == 'OpenAI':
-                return self._make_openai_request("test", {"message": test_message}) is not None
-            else:
-                raise APIError(f"Unsupported API provider: {self.config['api_provider']}")
+            with self._track_request("test") as record:
+                route = self.router.primary("test")
+                return self.get_provider(route.provider).complete(
+                    messages, record=record, model=route.model) is not None
         except Exception as e:
             raise APIError(f"Connection test failed: {str(e)}")
 
-    def generate_article(self, words: List[str]) -> str:
+    def generate_article(self, words: List[str],
+                         on_chunk: Optional[Callable[[str], None]] = None,
+                         priority: Optional[Priority] = None,
+                         cancel_token: Optional[CancelToken] = None) -> str:
         """Generate an article using given words"""
-        return self._make_api_request("generate_article", {"words": words})
+        return self._make_api_request("generate_article", {"words": words},
+                                      on_chunk, priority=priority, cancel_token=cancel_token)
 
-    def evaluate_sentence(self, sentence: str, target_word: str) -> str:
+    def evaluate_sentence(self, sentence: str, target_word: str,
+                          on_chunk: Optional[Callable[[str], None]] = None,
+                          force_refresh: bool = False,
+                          priority: Optional[Priority] = None,
+                          cancel_token: Optional[CancelToken] = None) -> str:
         """Evaluate a sentence using target word"""
         return self._make_api_request("evaluate_sentence", {
             "sentence": sentence,
             "target_word": target_word
-        })
+        }, on_chunk, force_refresh, priority, cancel_token)
 
-    def generate_examples(self, word: str, count: int = 3) -> str:
+    def generate_examples(self, word: str, count: int = 3,
+                          on_chunk: Optional[Callable[[str], None]] = None,
+                          force_refresh: bool = False,
+                          priority: Optional[Priority] = None,
+                          cancel_token: Optional[CancelToken] = None) -> str:
         """Generate example sentences using word"""
         return self._make_api_request("generate_examples", {
             "word": word,
             "count": count
-        })
+        }, on_chunk, force_refresh, priority, cancel_token)
+
+
+
+_handlers: Dict[str, Tuple[APIHandler, Optional[Tuple[int, int]], Optional[str]]] = {}
+_handlers_lock = threading.Lock()
+
+
+def _config_fingerprint(config_path: str) -> Tuple[Optional[Tuple[int, int]], Optional[str]]:
+    """Get (mtime, size) stamp and content hash of a config file"""
+    try:
+        stat = os.stat(config_path)
+    except FileNotFoundError:
+        return None, None
+    with open(config_path, 'rb') as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    return (stat.st_mtime_ns, stat.st_size), digest
+
+
+def get_api_handler(config_path: str) -> APIHandler:
+    """Get the shared APIHandler for a config file.
+
+    The handler is created once per config path and reloaded only when the
+    file's mtime/size stamp and content hash change, so callers share one
+    client and its warm connection pools.
+    """
+    key = os.path.abspath(config_path)
+    with _handlers_lock:
+        entry = _handlers.get(key)
+        if entry is None:
+            stamp, digest = _config_fingerprint(key)
+            handler = APIHandler(config_path)
+            _handlers[key] = (handler, stamp, digest)
+            return handler
+
+        handler, stamp, digest = entry
+        try:
+            stat = os.stat(key)
+            current_stamp = (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            current_stamp = None
+        if current_stamp == stamp:
+            return handler
+
+        current_stamp, current_digest = _config_fingerprint(key)
+        if current_digest != digest:
+            handler.reload_config()
+        _handlers[key] = (handler, current_stamp, current_digest)
+        return handler
+
+
+def clear_api_handlers() -> None:
+    """Close and forget all shared handlers"""
+    with _handlers_lock:
+        for handler, _, _ in _handlers.values():
+            handler.close()
+        _handlers.clear()
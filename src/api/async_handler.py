@@ -0,0 +1,296 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .api_handler import APIHandler, get_api_handler
+from .cancel import CancelToken, RequestCancelled
+from .errors import APIError
+from .metrics import RequestRecord
+from .batch import chunk_words, format_examples, parse_batch_examples
+from .scheduler import Priority
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class AsyncAPIHandler:
+    """Asyncio counterpart of APIHandler with bounded request concurrency.
+
+    Configuration, prompts and the response cache are read from the wrapped
+    sync handler, so both engines follow the same config reloads.
+    """
+
+    def __init__(self, api_handler: APIHandler):
+        self.api_handler = api_handler
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_size: Optional[int] = None
+
+    @property
+    def config(self) -> Dict:
+        return self.api_handler.config
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore bounding in-flight requests"""
+        size = self.config['max_concurrent_requests']
+        if self._semaphore is None or self._semaphore_size != size:
+            self._semaphore = asyncio.Semaphore(size)
+            self._semaphore_size = size
+        return self._semaphore
+
+    async def _make_api_request(self, action: str, params: Dict,
+                                on_chunk: Optional[Callable[[str], None]] = None,
+                                force_refresh: bool = False,
+                                priority: Optional[Priority] = None,
+                                cancel_token: Optional[CancelToken] = None) -> str:
+        """Make API request with response caching, retries and bounded concurrency.
+
+        Cancelling the asyncio task or cancel_token stops a request still
+        waiting for admission.
+        """
+        if not self.config['stream_responses']:
+            on_chunk = None
+
+        with self.api_handler._track_request(action) as record:
+            cache_key = self.api_handler._cache_key(action, params)
+            if cache_key is not None and not force_refresh:
+                cached = self.api_handler.cache.get(cache_key)
+                if cached is not None:
+                    record.cache_hit = True
+                    if on_chunk is not None:
+                        on_chunk(cached)
+                    return cached
+
+            async with self._get_semaphore():
+                result = await self._request_with_retries(action, params, on_chunk,
+                                                          priority, record, cancel_token)
+            if cache_key is not None and result:
+                self.api_handler.cache.put(cache_key, result)
+            return result
+
+    async def _request_with_retries(self, action: str, params: Dict,
+                                    on_chunk: Optional[Callable[[str], None]] = None,
+                                    priority: Optional[Priority] = None,
+                                    record: Optional[RequestRecord] = None,
+                                    cancel_token: Optional[CancelToken] = None) -> str:
+        """Send the request along the action's routes, retrying and failing over on failure"""
+        first_chunk = None
+
+        def deliver(chunk: str) -> None:
+            nonlocal first_chunk
+            if first_chunk is None:
+                first_chunk = time.monotonic()
+            on_chunk(chunk)
+
+        handler = self.api_handler
+        messages = handler._prepare_messages(action, params)
+        failover = handler._failover(action, params, priority, cancel_token)
+        while True:
+            route, scheduler, wait = failover.current()
+            await asyncio.sleep(wait)
+            await scheduler.before_attempt_async()
+            if record is not None:
+                record.provider, record.model = route
+            start = time.monotonic()
+            try:
+                callback = deliver if on_chunk is not None else None
+                result = await handler.get_provider(route.provider).acomplete(
+                    messages, callback, record, route.model)
+                handler.router.record(action, route, time.monotonic() - start,
+                                      first_token=first_chunk - start if first_chunk else None)
+                return result
+            except Exception as e:
+                handler.router.record(action, route, time.monotonic() - start, ok=False)
+                if first_chunk is not None:
+                    # Retrying would repeat text the caller has already shown
+                    raise APIError(f"API stream interrupted: {e}")
+                # Raises when no attempt is left, so only real retries are counted
+                handler._schedule_retry(action, failover, route, scheduler, e)
+                if record is not None:
+                    record.retries += 1
+
+    async def generate_article(self, words: List[str],
+                               on_chunk: Optional[Callable[[str], None]] = None,
+                               priority: Optional[Priority] = None,
+                               cancel_token: Optional[CancelToken] = None) -> str:
+        """Generate an article using given words"""
+        return await self._make_api_request("generate_article", {"words": words},
+                                            on_chunk, priority=priority,
+                                            cancel_token=cancel_token)
+
+    async def evaluate_sentence(self, sentence: str, target_word: str,
+                                on_chunk: Optional[Callable[[str], None]] = None,
+                                force_refresh: bool = False,
+                                priority: Optional[Priority] = None,
+                                cancel_token: Optional[CancelToken] = None) -> str:
+        """Evaluate a sentence using target word"""
+        return await self._make_api_request("evaluate_sentence", {
+            "sentence": sentence,
+            "target_word": target_word
+        }, on_chunk, force_refresh, priority, cancel_token)
+
+    async def generate_examples(self, word: str, count: int = 3,
+                                on_chunk: Optional[Callable[[str], None]] = None,
+                                force_refresh: bool = False,
+                                priority: Optional[Priority] = None,
+                                cancel_token: Optional[CancelToken] = None) -> str:
+        """Generate example sentences using word"""
+        return await self._make_api_request("generate_examples", {
+            "word": word,
+            "count": count
+        }, on_chunk, force_refresh, priority, cancel_token)
+
+    async def generate_examples_batch(self, words: List[str], count: int = 3,
+                                      on_progress: Optional[Callable[[str, int, int], None]] = None,
+                                      force_refresh: bool = False,
+                                      cancel_token: Optional[CancelToken] = None) -> Dict[str, str]:
+        """Generate example sentences for many words in as few requests as possible.
+
+        Words are packed into prompts sized by batch_max_tokens/batch_max_words
+        and the batches run concurrently. Each word's result is stored in the
+        response cache under its single-word generate_examples key, and
+        on_progress(word, done, total) is called as soon as it is ready. Words
+        the model leaves out of a batch, or whose batch failed, are retried
+        with single requests. Words that still fail are left out of the
+        result; only if no word succeeded is the first error raised.
+        """
+        words = list(dict.fromkeys(words))
+        total = len(words)
+        results: Dict[str, str] = {}
+
+        def report(word: str, text: str) -> None:
+            results[word] = text
+            if on_progress is not None:
+                on_progress(word, len(results), total)
+
+        pending = []
+        for word in words:
+            cached = None
+            if not force_refresh:
+                key = self._examples_cache_key(word, count)
+                cached = self.api_handler.cache.get(key) if key is not None else None
+            if cached is not None:
+                report(word, cached)
+            else:
+                pending.append(word)
+
+        failures: List[Exception] = []
+
+        async def run_single(word: str) -> None:
+            try:
+                report(word, await self.generate_examples(
+                    word, count, force_refresh=True, priority=Priority.BACKGROUND,
+                    cancel_token=cancel_token))
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                # Leave the word out, the other results are still returned
+                logger.warning("Examples for '%s' failed: %s", word, e)
+                failures.append(e)
+
+        async def run_batch(batch: List[str]) -> None:
+            try:
+                text = await self._make_api_request("generate_examples_batch", {
+                    "words": batch,
+                    "count": count
+                }, cancel_token=cancel_token)
+            except RequestCancelled:
+                raise
+            except Exception as e:
+                logger.warning("Example batch of %d words failed, requesting them singly: %s",
+                               len(batch), e)
+                text = ''
+            parsed = parse_batch_examples(text, batch)
+            missing = []
+            for word in batch:
+                if word not in parsed:
+                    missing.append(word)
+                    continue
+                examples = format_examples(parsed[word])
+                key = self._examples_cache_key(word, count)
+                if key is not None:
+                    self.api_handler.cache.put(key, examples)
+                report(word, examples)
+
+            await asyncio.gather(*(run_single(word) for word in missing))
+
+        batches = chunk_words(
+            pending, count,
+            self.config['batch_max_tokens'],
+            self.config['batch_max_words']
+        )
+        await asyncio.gather(*(run_batch(batch) for batch in batches))
+        if failures and not results:
+            # Nothing could be prepared, report why
+            raise failures[0]
+        return {word: results[word] for word in words if word in results}
+
+    def _examples_cache_key(self, word: str, count: int) -> Optional[str]:
+        """Get the cache key a single generate_examples request for word would use"""
+        return self.api_handler._cache_key("generate_examples", {"word": word, "count": count})
+
+    async def aclose(self) -> None:
+        """Close pooled connections"""
+        for provider in list(self.api_handler.providers.values()):
+            await provider.aclose()
+
+
+class AsyncEngine:
+    """Background thread running one event loop that serves all async requests"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever,
+                    name='VocabMaster-asyncio',
+                    daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine on the engine loop from any thread"""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    def stop(self) -> None:
+        """Stop the event loop and wait for its thread to exit"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+_engine = AsyncEngine()
+_async_handlers: Dict[str, AsyncAPIHandler] = {}
+_async_handlers_lock = threading.Lock()
+
+
+def get_async_engine() -> AsyncEngine:
+    """Get the process-wide async engine"""
+    return _engine
+
+
+def get_async_handler(config_path: str) -> AsyncAPIHandler:
+    """Get the shared AsyncAPIHandler wrapping get_api_handler(config_path)"""
+    handler = get_api_handler(config_path)
+    key = os.path.abspath(config_path)
+    with _async_handlers_lock:
+        async_handler = _async_handlers.get(key)
+        if async_handler is None or async_handler.api_handler is not handler:
+            async_handler = AsyncAPIHandler(handler)
+            _async_handlers[key] = async_handler
+        return async_handler
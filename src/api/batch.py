@@ -0,0 +1,69 @@
+import json
+import re
+from typing import Dict, List
+
+# Rough size estimates used to pack words into prompts
+CHARS_PER_TOKEN = 4
+TOKENS_PER_SENTENCE = 30
+PROMPT_OVERHEAD_TOKENS = 120
+
+
+def estimate_word_tokens(word: str, count: int) -> int:
+    """Estimate prompt plus completion tokens one word adds to a batch"""
+    return len(word) // CHARS_PER_TOKEN + 4 + count * TOKENS_PER_SENTENCE
+
+
+def chunk_words(words: List[str], count: int, max_tokens: int, max_words: int) -> List[List[str]]:
+    """Pack words into as few batches as fit the token and word limits"""
+    chunks = []
+    current: List[str] = []
+    used = PROMPT_OVERHEAD_TOKENS
+    for word in words:
+        cost = estimate_word_tokens(word, count)
+        if current and (used + cost > max_tokens or len(current) >= max_words):
+            chunks.append(current)
+            current = []
+            used = PROMPT_OVERHEAD_TOKENS
+        current.append(word)
+        used += cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def parse_batch_examples(text: str, words: List[str]) -> Dict[str, List[str]]:
+    """Parse a JSON object mapping words to example sentences.
+
+    Code fences and text around the object are ignored and keys are matched
+    to the requested words case-insensitively. Words missing from the
+    response are left out of the result.
+    """
+    match = re.search(r'\{.*\}', text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+
+    by_key = {word.strip().lower(): word for word in words}
+    results = {}
+    for key, sentences in data.items():
+        word = by_key.get(str(key).strip().lower())
+        if word is None:
+            continue
+        if isinstance(sentences, str):
+            sentences = [sentences]
+        if not isinstance(sentences, list):
+            continue
+        sentences = [str(s).strip() for s in sentences if str(s).strip()]
+        if sentences:
+            results[word] = sentences
+    return results
+
+
+def format_examples(sentences: List[str]) -> str:
+    """Format example sentences like a single generate_examples response"""
+    return '\n'.join(f"{i}. {sentence}" for i, sentence in enumerate(sentences, 1))
@@ -0,0 +1,132 @@
+import threading
+from typing import Callable, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+
+class RequestCancelled(Exception):
+    """Raised inside a request whose CancelToken was cancelled"""
+    pass
+
+
+class CancelToken:
+    """Cancellation flag shared between a request and the code that started it.
+
+    The request registers callbacks that abort what it is blocked on, such
+    as closing a streamed response, and sleeps through the token so that
+    retry delays end as soon as it is cancelled.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._callbacks: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        """Cancel the request and run the registered abort callbacks"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                # Aborting is best effort, the request still sees the flag
+                pass
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Run callback on cancellation and return a function that unregisters it.
+
+        The callback runs at once if the token is already cancelled.
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove(callback)
+        callback()
+        return lambda: None
+
+    def _remove(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self) -> None:
+        """Raise RequestCancelled if the token was cancelled"""
+        if self._event.is_set():
+            raise RequestCancelled("Request cancelled")
+
+    def sleep(self, seconds: float) -> None:
+        """Sleep for the given time, raising RequestCancelled as soon as the token is cancelled"""
+        if self._event.wait(seconds):
+            raise RequestCancelled("Request cancelled")
+
+
+class _CancellableCall:
+    """A blocking call running on its own thread that its caller can walk away from"""
+
+    def __init__(self, call: Callable[[], T], discard: Optional[Callable[[T], None]]):
+        self._call = call
+        self._discard = discard
+        self._finished = threading.Event()
+        self._lock = threading.Lock()
+        self._abandoned = False
+        self._result = None
+        self._error: Optional[BaseException] = None
+
+    def run(self) -> None:
+        try:
+            result, error = self._call(), None
+        except BaseException as e:
+            result, error = None, e
+        with self._lock:
+            abandoned = self._abandoned
+            self._result, self._error = result, error
+            self._finished.set()
+        if abandoned and error is None and self._discard is not None:
+            try:
+                self._discard(result)
+            except Exception:
+                pass
+
+    def abandon(self) -> None:
+        with self._lock:
+            if not self._finished.is_set():
+                self._abandoned = True
+                self._finished.set()
+
+    def wait(self) -> T:
+        self._finished.wait()
+        with self._lock:
+            if self._abandoned:
+                raise RequestCancelled("Request cancelled")
+        if self._error is not None:
+            raise self._error
+        return self._result
+
+
+def run_cancellable(call: Callable[[], T], cancel_token: Optional[CancelToken],
+                    discard: Optional[Callable[[T], None]] = None) -> T:
+    """Run a blocking call, raising RequestCancelled as soon as cancel_token is cancelled.
+
+    A thread blocked connecting or waiting for response headers cannot be
+    woken from another thread, so the call runs on its own daemon thread
+    while the caller waits on the token. A result that arrives after the
+    cancellation is passed to discard, for example to close a late stream.
+    """
+    if cancel_token is None:
+        return call()
+    cancel_token.raise_if_cancelled()
+    pending = _CancellableCall(call, discard)
+    remove = cancel_token.on_cancel(pending.abandon)
+    try:
+        threading.Thread(target=pending.run, name='VocabMaster-request', daemon=True).start()
+        return pending.wait()
+    finally:
+        remove()
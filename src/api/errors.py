@@ -0,0 +1,18 @@
+from typing import Optional
+
+class RateLimitError(Exception):
+    """Exception raised when API rate limit is exceeded.
+
+    retry_after is None when the server gave no usable wait time.
+    """
+    def __init__(self, message: str, retry_after: Optional[int] = 60):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class APIError(Exception):
+    """Base exception for API related errors"""
+    pass
+
+class ConfigError(Exception):
+    """Exception raised for configuration related errors"""
+    pass
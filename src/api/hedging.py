@@ -0,0 +1,131 @@
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Callable, List, Optional
+
+from .cancel import CancelToken, RequestCancelled
+
+# run_leg(index, on_chunk, cancel_token) sends one leg and returns its text
+LegRunner = Callable[[int, Optional[Callable[[str], None]], CancelToken], str]
+
+
+class HedgeLeg:
+    """One of the racing copies of a hedged request"""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.cancel_token = CancelToken()
+        self.started = time.monotonic()
+        self.done = False
+        self.result: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class HedgedRequest:
+    """Races a backup copy of a request against a slow primary.
+
+    The primary leg starts at once. If it has produced no text after the
+    hedge delay, a backup leg starts too. The first leg to produce text,
+    or a full answer when not streaming, wins: only its chunks reach
+    on_chunk and the other leg is cancelled. Both legs run on the
+    executor so a blocked loser never holds up the caller.
+    """
+
+    def __init__(self, executor: Executor, run_leg: LegRunner,
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 cancel_token: Optional[CancelToken] = None):
+        self._executor = executor
+        self._run_leg = run_leg
+        self._on_chunk = on_chunk
+        self._cancel_token = cancel_token or CancelToken()
+        self._changed = threading.Condition()
+        self.legs: List[HedgeLeg] = []
+        self.winner: Optional[HedgeLeg] = None
+        self.won_at: Optional[float] = None
+
+    @property
+    def hedged(self) -> bool:
+        """Whether the backup leg was started"""
+        return len(self.legs) > 1
+
+    def _claim(self, leg: HedgeLeg) -> bool:
+        """Make leg the winner unless another leg already is"""
+        with self._changed:
+            if self.winner is not None:
+                return self.winner is leg
+            self.winner = leg
+            self.won_at = time.monotonic()
+            losers = [other for other in self.legs if other is not leg]
+            self._changed.notify_all()
+        for other in losers:
+            other.cancel_token.cancel()
+        return True
+
+    def _start(self) -> Optional[HedgeLeg]:
+        """Start the next leg, or return None if a leg has already won"""
+        with self._changed:
+            if self.winner is not None:
+                # The losers to cancel were taken when the winner claimed
+                return None
+            leg = HedgeLeg(len(self.legs))
+            self.legs.append(leg)
+        remove = self._cancel_token.on_cancel(leg.cancel_token.cancel)
+
+        def deliver(chunk: str) -> None:
+            if self._claim(leg):
+                self._on_chunk(chunk)
+
+        def run() -> None:
+            try:
+                result = self._run_leg(leg.index, deliver if self._on_chunk else None,
+                                       leg.cancel_token)
+                self._claim(leg)
+                leg.result = result
+            except BaseException as e:
+                leg.error = e
+            finally:
+                remove()
+                with self._changed:
+                    leg.done = True
+                    self._changed.notify_all()
+
+        self._executor.submit(run)
+        return leg
+
+    def _wake(self) -> None:
+        with self._changed:
+            self._changed.notify_all()
+
+    def _settled(self) -> bool:
+        """Whether the winner finished, every leg failed or the request was cancelled"""
+        if self._cancel_token.cancelled:
+            return True
+        if self.winner is not None:
+            return self.winner.done
+        return all(leg.done for leg in self.legs)
+
+    def run(self, hedge_delay: float) -> str:
+        """Send the request, hedging after hedge_delay seconds without text"""
+        # Cancelling returns at once, even while a leg waits for a response
+        remove = self._cancel_token.on_cancel(self._wake)
+        try:
+            primary = self._start()
+            with self._changed:
+                self._changed.wait_for(
+                    lambda: self.winner is not None or primary.done or self._cancel_token.cancelled,
+                    timeout=hedge_delay
+                )
+                hedge = self.winner is None and not primary.done
+            if hedge and not self._cancel_token.cancelled:
+                self._start()
+
+            with self._changed:
+                self._changed.wait_for(self._settled)
+        finally:
+            remove()
+        if self._cancel_token.cancelled:
+            raise RequestCancelled("Request cancelled")
+        leg = self.winner if self.winner is not None else primary
+        if leg.error is not None:
+            raise leg.error
+        return leg.result
@@ -0,0 +1,162 @@
+import socket
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class PooledSession:
+    """Long-lived keep-alive HTTP session shared by all requests of a handler"""
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 8,
+                 idle_timeout: float = 60.0):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+        self._last_used = 0.0
+        # Requests sent whose response is not done with its connection yet
+        self._in_flight = 0
+        # Counters carried over from sessions that were already closed
+        self._closed_connections = 0
+        self._closed_requests = 0
+        self._evictions = 0
+
+    def _create_session(self) -> requests.Session:
+        """Create a session with a sized connection pool and no transport retries"""
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=0  # Retries are handled by APIHandler
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _acquire(self) -> requests.Session:
+        """Return the live session, evicting it first if it sat idle too long.
+
+        A session is never evicted while a request, such as a long stream,
+        is still using one of its connections.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if (self._session is not None and self._in_flight == 0
+                    and now - self._last_used > self.idle_timeout):
+                # The server has most likely dropped the keep-alive sockets by now
+                self._close_locked()
+                self._evictions += 1
+            if self._session is None:
+                self._session = self._create_session()
+            self._in_flight += 1
+            self._last_used = now
+            return self._session
+
+    def _release(self) -> None:
+        """Mark a request as done with its connection"""
+        with self._lock:
+            self._in_flight -= 1
+            self._last_used = time.monotonic()
+
+    def _release_on_close(self, response: requests.Response) -> None:
+        """Release a streamed request once its response is closed"""
+        close = response.close
+        released = threading.Event()
+
+        def close_and_release() -> None:
+            try:
+                close()
+            finally:
+                if not released.is_set():
+                    released.set()
+                    self._release()
+
+        response.close = close_and_release
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request over a pooled connection"""
+        return self.request('POST', url, **kwargs)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """Send a request over a pooled connection.
+
+        A streamed response keeps its connection until it is closed.
+        """
+        session = self._acquire()
+        try:
+            response = session.request(method, url, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        if kwargs.get('stream'):
+            self._release_on_close(response)
+        else:
+            self._release()
+        return response
+
+    def _pool_counters(self) -> Dict[str, int]:
+        """Sum connection/request counters over the live urllib3 pools"""
+        connections = requests_sent = 0
+        if self._session is None:
+            return {'connections': 0, 'requests': 0}
+        # The same adapter is mounted for both schemes; count it once
+        adapters = {id(adapter): adapter for adapter in self._session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections += pool.num_connections
+                requests_sent += pool.num_requests
+        return {'connections': connections, 'requests': requests_sent}
+
+    def _close_locked(self) -> None:
+        if self._session is None:
+            return
+        counters = self._pool_counters()
+        self._closed_connections += counters['connections']
+        self._closed_requests += counters['requests']
+        self._session.close()
+        self._session = None
+
+    def close(self) -> None:
+        """Close all pooled connections"""
+        with self._lock:
+            self._close_locked()
+
+    def stats(self) -> Dict[str, int]:
+        """Get connection reuse counters"""
+        with self._lock:
+            counters = self._pool_counters()
+            connections = self._closed_connections + counters['connections']
+            requests_sent = self._closed_requests + counters['requests']
+            return {
+                'requests': requests_sent,
+                'connections_opened': connections,
+                'connections_reused': max(requests_sent - connections, 0),
+                'idle_evictions': self._evictions
+            }
+
+
+def shutdown_socket(sock: Optional[socket.socket]) -> None:
+    """Shut a socket down so that a thread blocked reading it wakes at once.
+
+    Closing a socket leaves a blocked read waiting until its timeout.
+    """
+    if sock is None:
+        return
+    try:
+        sock.shutdown(socket.SHUT_RDWR)
+    except OSError:
+        pass
+
+
+def abort_response(response: requests.Response) -> None:
+    """Close a streamed response, waking a thread blocked reading it"""
+    shutdown_socket(getattr(getattr(response.raw, 'connection', None), 'sock', None))
+    response.close()
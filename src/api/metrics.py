@@ -0,0 +1,159 @@
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class RequestRecord:
+    """Measurements of one API request, filled in while it runs"""
+    action: str
+    provider: str
+    model: str
+    started: float = field(default_factory=time.monotonic)
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    retries: int = 0
+    cache_hit: bool = False
+    # Whether a hedge request was sent, and the estimated seconds saved when it won
+    hedged: bool = False
+    latency_saved: Optional[float] = None
+
+    def set_usage(self, usage: Any) -> None:
+        """Store token counts from a response's usage block, a dict or SDK object"""
+        if not usage:
+            return
+        if isinstance(usage, dict):
+            prompt, completion = usage.get('prompt_tokens'), usage.get('completion_tokens')
+        else:
+            prompt = getattr(usage, 'prompt_tokens', None)
+            completion = getattr(usage, 'completion_tokens', None)
+        if prompt is not None:
+            self.prompt_tokens = int(prompt)
+        if completion is not None:
+            self.completion_tokens = int(completion)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Get the pct-th percentile of sorted values with linear interpolation"""
+    if not values:
+        return 0.0
+    rank = (len(values) - 1) * pct / 100.0
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+class MetricsStore:
+    """Rolling SQLite log of API request metrics.
+
+    Only the newest max_entries requests are kept. The database is opened
+    with check_same_thread=False and guarded by a lock, because requests
+    finish on worker threads.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 5000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS requests ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "created_at REAL NOT NULL, "
+                "action TEXT NOT NULL, "
+                "provider TEXT NOT NULL, "
+                "model TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "latency REAL NOT NULL, "
+                "prompt_tokens INTEGER, "
+                "completion_tokens INTEGER, "
+                "retries INTEGER NOT NULL, "
+                "cache_hit INTEGER NOT NULL, "
+                "hedged INTEGER NOT NULL DEFAULT 0, "
+                "latency_saved REAL)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(requests)")}
+            # Logs written before hedging was added lack its columns
+            if 'hedged' not in columns:
+                self._conn.execute(
+                    "ALTER TABLE requests ADD COLUMN hedged INTEGER NOT NULL DEFAULT 0")
+            if 'latency_saved' not in columns:
+                self._conn.execute("ALTER TABLE requests ADD COLUMN latency_saved REAL")
+
+    def record(self, record: RequestRecord, status: str) -> None:
+        """Store a finished request; status is 'ok', 'error' or 'cancelled'"""
+        latency = time.monotonic() - record.started
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO requests (created_at, action, provider, model, status, latency, "
+                "prompt_tokens, completion_tokens, retries, cache_hit, hedged, latency_saved) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (time.time(), record.action, record.provider, record.model, status, latency,
+                 record.prompt_tokens, record.completion_tokens, record.retries,
+                 int(record.cache_hit), int(record.hedged), record.latency_saved)
+            )
+            self._conn.execute("DELETE FROM requests WHERE id <= ?",
+                               (cursor.lastrowid - self.max_entries,))
+
+    def summary(self, since: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        """Get per-action statistics, optionally only of requests after a Unix time.
+
+        Latency percentiles cover successful requests answered by the
+        provider; cache hits only count towards the hit ratio. The hedge
+        rate is the share of sent requests that fired a hedge, and the
+        latency saved is averaged over hedges that won.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT action, status, latency, prompt_tokens, completion_tokens, "
+                "retries, cache_hit, hedged, latency_saved FROM requests WHERE created_at >= ?",
+                (since or 0,)
+            ).fetchall()
+
+        grouped: Dict[str, list] = {}
+        for row in rows:
+            grouped.setdefault(row[0], []).append(row)
+
+        summary = {}
+        for action, action_rows in sorted(grouped.items()):
+            hits = sum(1 for row in action_rows if row[6])
+            sent = [row for row in action_rows if not row[6]]
+            ok = [row for row in sent if row[1] == 'ok']
+            latencies = sorted(row[2] for row in ok)
+            prompt = [row[3] for row in ok if row[3] is not None]
+            completion = [row[4] for row in ok if row[4] is not None]
+            hedged = sum(1 for row in sent if row[7])
+            saved = [row[8] for row in sent if row[8] is not None]
+            stats = {
+                'requests': len(action_rows),
+                'cache_hits': hits,
+                'cache_hit_ratio': hits / len(action_rows),
+                'errors': sum(1 for row in sent if row[1] == 'error'),
+                'cancelled': sum(1 for row in sent if row[1] == 'cancelled'),
+                'retries': sum(row[5] for row in sent),
+                'avg_prompt_tokens': sum(prompt) / len(prompt) if prompt else 0.0,
+                'avg_completion_tokens': sum(completion) / len(completion) if completion else 0.0,
+                'total_tokens': sum(prompt) + sum(completion),
+                'hedged': hedged,
+                'hedge_rate': hedged / len(sent) if sent else 0.0,
+                'hedge_wins': len(saved),
+                'avg_latency_saved': sum(saved) / len(saved) if saved else 0.0,
+            }
+            for pct in PERCENTILES:
+                stats[f'p{pct}_latency'] = percentile(latencies, pct)
+            summary[action] = stats
+        return summary
+
+    def clear(self) -> None:
+        """Delete all recorded requests"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM requests")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
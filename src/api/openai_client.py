@@ -0,0 +1,81 @@
+import threading
+from typing import Dict, Optional, Tuple
+
+from .http_session import shutdown_socket
+
+# (api key, base URL, timeout, max connections, keep-alive expiry)
+ClientSettings = Tuple[str, Optional[str], float, int, float]
+
+_clients: Dict[ClientSettings, object] = {}
+_clients_lock = threading.Lock()
+
+
+def client_settings(config: Dict, api_key: str, base_url: Optional[str] = None) -> ClientSettings:
+    """Get the settings that identify an OpenAI client for a key and base URL"""
+    return (
+        api_key,
+        base_url or None,
+        config['timeout'],
+        config['pool_maxsize'],
+        config['pool_idle_timeout']
+    )
+
+
+def _create_client(settings: ClientSettings, is_async: bool):
+    import httpx
+    import openai
+    api_key, base_url, timeout, max_connections, keepalive_expiry = settings
+    # The SDK default allows 1000 connections with a 5 second keep-alive, size
+    # the pool like the ChatGLM session instead and keep connections warm
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=keepalive_expiry
+    )
+    if is_async:
+        client_class, http_client = openai.AsyncOpenAI, openai.DefaultAsyncHttpxClient(limits=limits)
+    else:
+        client_class, http_client = openai.OpenAI, openai.DefaultHttpxClient(limits=limits)
+    return client_class(
+        api_key=api_key,
+        base_url=base_url,
+        timeout=timeout,
+        # The add-on's retry loop and request scheduler handle retries
+        max_retries=0,
+        http_client=http_client
+    )
+
+
+def get_openai_client(settings: ClientSettings):
+    """Get the shared openai.OpenAI client for the given settings"""
+    with _clients_lock:
+        client = _clients.get(settings)
+        if client is None:
+            client = _create_client(settings, is_async=False)
+            _clients[settings] = client
+        return client
+
+
+def release_openai_client(settings: ClientSettings) -> None:
+    """Close the shared client for the given settings and forget it"""
+    with _clients_lock:
+        client = _clients.pop(settings, None)
+    if client is not None:
+        client.close()
+
+
+def create_async_openai_client(settings: ClientSettings):
+    """Create an openai.AsyncOpenAI client with the given settings.
+
+    Async clients are bound to the event loop they are used on, so they
+    are owned by the provider using them instead of being shared here.
+    """
+    return _create_client(settings, is_async=True)
+
+
+def abort_stream(stream) -> None:
+    """Close an openai Stream, waking a thread blocked reading it"""
+    network_stream = stream.response.extensions.get('network_stream')
+    if network_stream is not None:
+        shutdown_socket(network_stream.get_extra_info('socket'))
+    stream.close()
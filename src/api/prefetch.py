@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, NamedTuple
+
+from .async_handler import get_async_engine, get_async_handler
+from .cancel import CancelToken
+from .scheduler import Priority, estimate_tokens
+
+# Prefetched tokens count against prefetch_token_budget for this long
+BUDGET_WINDOW = 60.0
+
+
+class PendingPrefetch(NamedTuple):
+    """A prefetch request and the tokens it was charged"""
+    future: Future
+    cancel_token: CancelToken
+    tokens: int
+    charged_at: float
+
+
+class ExamplePrefetcher:
+    """Speculatively fills the response cache with examples for likely next words.
+
+    Requests run on the async engine at background priority, so the request
+    scheduler admits them only after any interactive request. Cancellation
+    policy: a pending prefetch is cancelled as soon as its word leaves the
+    prefetch window, and all of them when the prefetcher is closed; a
+    cancelled prefetch also stops waiting for admission and is refunded.
+    Words already cached cost nothing; the rest are charged their estimated
+    tokens, and nothing more is prefetched while the charges of the last
+    BUDGET_WINDOW seconds reach prefetch_token_budget.
+    """
+
+    def __init__(self, config_path: str):
+        self.config_path = config_path
+        self._pending: Dict[str, PendingPrefetch] = {}
+        self._charges: List[PendingPrefetch] = []
+        # Done callbacks may run inside cancel() or add_done_callback() while it is held
+        self._lock = threading.RLock()
+
+    @property
+    def config(self) -> Dict:
+        return get_async_handler(self.config_path).config
+
+    @property
+    def enabled(self) -> bool:
+        return self.config['prefetch_examples']
+
+    @property
+    def tokens_used(self) -> int:
+        """Get the tokens charged within the budget window"""
+        with self._lock:
+            cutoff = time.monotonic() - BUDGET_WINDOW
+            self._charges = [charge for charge in self._charges if charge.charged_at > cutoff]
+            return sum(charge.tokens for charge in self._charges)
+
+    def prefetch(self, words: List[str], count: int = 3) -> None:
+        """Prefetch examples for words, cancelling prefetches of any other word"""
+        handler = get_async_handler(self.config_path)
+        api_handler = handler.api_handler
+        words = list(dict.fromkeys(words))
+        with self._lock:
+            for word in list(self._pending):
+                if word not in words:
+                    self._pending.pop(word).future.cancel()
+
+            if not self.enabled:
+                return
+            budget = self.config['prefetch_token_budget']
+            for word in words:
+                if word in self._pending:
+                    continue
+                params = {"word": word, "count": count}
+                key = api_handler._cache_key("generate_examples", params)
+                if key is None:
+                    # Without a cache there is nowhere to keep the result
+                    return
+                if api_handler.cache.get(key) is not None:
+                    continue
+                tokens = estimate_tokens(
+                    "generate_examples",
+                    api_handler._prepare_messages("generate_examples", params)
+                )
+                if self.tokens_used + tokens > budget:
+                    return
+                cancel_token = CancelToken()
+                future = get_async_engine().submit(handler.generate_examples(
+                    word, count, priority=Priority.BACKGROUND, cancel_token=cancel_token))
+                pending = PendingPrefetch(future, cancel_token, tokens, time.monotonic())
+                self._pending[word] = pending
+                self._charges.append(pending)
+                future.add_done_callback(lambda f, w=word, p=pending: self._on_done(w, p))
+
+    def _on_done(self, word: str, pending: PendingPrefetch) -> None:
+        with self._lock:
+            if self._pending.get(word) is pending:
+                del self._pending[word]
+            if pending.future.cancelled() and pending in self._charges:
+                # Nothing was sent for it, or it was aborted, give its tokens back
+                self._charges.remove(pending)
+        if pending.future.cancelled():
+            # The task only stops on the loop; this releases a thread still
+            # waiting in the request scheduler
+            pending.cancel_token.cancel()
+        else:
+            # Failures only mean the example is not cached, "Show Examples" retries it
+            pending.future.exception()
+
+    def pending_words(self) -> List[str]:
+        """Get the words whose examples are being prefetched"""
+        with self._lock:
+            return list(self._pending)
+
+    def cancel(self) -> None:
+        """Cancel all pending prefetches"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for entry in pending.values():
+            entry.future.cancel()
@@ -0,0 +1,109 @@
+import os
+import re
+import string
+import threading
+from typing import Dict, List, Optional, Tuple
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'prompts')
+
+_HEADER_RE = re.compile(r'^#\s*(\w+)\s*:\s*(.*?)\s*$')
+
+# A compiled template is a list of literal strings and field names to fill in
+Segment = Tuple[bool, str]  # (is_field, literal text or field name)
+
+
+class PromptTemplate:
+    """A versioned prompt compiled once into literal text and fields.
+
+    Templates use str.format field syntax without conversions or format
+    specs. bind() fills in some fields ahead of time, e.g. configured
+    languages, so render() only joins the remaining per-request values.
+    Values are inserted verbatim, so braces in user text are harmless.
+    """
+
+    def __init__(self, name: str, version: str, segments: List[Segment]):
+        self.name = name
+        self.version = version
+        self.segments = segments
+        self.fields = frozenset(value for is_field, value in segments if is_field)
+
+    @classmethod
+    def compile(cls, name: str, text: str, version: str = '1') -> 'PromptTemplate':
+        """Parse template text into segments"""
+        segments: List[Segment] = []
+        for literal, field, format_spec, conversion in string.Formatter().parse(text):
+            if literal:
+                segments.append((False, literal))
+            if field is None:
+                continue
+            if not field.isidentifier() or format_spec or conversion:
+                raise ValueError(f"Unsupported field '{{{field}}}' in prompt template '{name}'")
+            segments.append((True, field))
+        return cls(name, version, cls._merge(segments))
+
+    @staticmethod
+    def _merge(segments: List[Segment]) -> List[Segment]:
+        """Join neighbouring literals"""
+        merged: List[Segment] = []
+        for is_field, value in segments:
+            if not is_field and merged and not merged[-1][0]:
+                merged[-1] = (False, merged[-1][1] + value)
+            else:
+                merged.append((is_field, value))
+        return merged
+
+    def bind(self, **values) -> 'PromptTemplate':
+        """Get a template with the given fields filled in"""
+        segments = [
+            (False, str(values[value])) if is_field and value in values else (is_field, value)
+            for is_field, value in self.segments
+        ]
+        return PromptTemplate(self.name, self.version, self._merge(segments))
+
+    def render(self, **values) -> str:
+        """Fill in the remaining fields"""
+        try:
+            return ''.join(str(values[value]) if is_field else value
+                           for is_field, value in self.segments)
+        except KeyError as e:
+            raise ValueError(f"Missing value {e} for prompt template '{self.name}'")
+
+
+def load_template(path: str) -> PromptTemplate:
+    """Load a template file.
+
+    Leading '# key: value' lines are metadata; 'version' versions the prompt.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        lines = f.read().splitlines()
+
+    metadata = {}
+    while lines:
+        match = _HEADER_RE.match(lines[0])
+        if not match:
+            break
+        metadata[match.group(1)] = match.group(2)
+        lines.pop(0)
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    return PromptTemplate.compile(name, '\n'.join(lines).strip(), metadata.get('version', '1'))
+
+
+_templates: Optional[Dict[str, PromptTemplate]] = None
+_templates_lock = threading.Lock()
+
+
+def get_templates() -> Dict[str, PromptTemplate]:
+    """Get all templates in the prompts directory, loaded on first use"""
+    global _templates
+    with _templates_lock:
+        if _templates is None:
+            _templates = {
+                template.name: template
+                for template in (
+                    load_template(os.path.join(PROMPTS_DIR, filename))
+                    for filename in sorted(os.listdir(PROMPTS_DIR))
+                    if filename.endswith('.txt')
+                )
+            }
+        return _templates
@@ -0,0 +1,37 @@
+from typing import Dict, List, Type
+
+from ..errors import APIError
+from .base import Messages, Provider
+from .chatglm_provider import ChatGLMProvider
+from .local_provider import LocalProvider
+from .openai_provider import OpenAIProvider
+
+_registry: Dict[str, Type[Provider]] = {}
+
+
+def register_provider(provider_class: Type[Provider]) -> Type[Provider]:
+    """Make a provider selectable by its name, usable as a class decorator"""
+    _registry[provider_class.name] = provider_class
+    return provider_class
+
+
+def provider_names() -> List[str]:
+    """Get the names of all registered providers in registration order"""
+    return list(_registry)
+
+
+def get_provider_class(name: str) -> Type[Provider]:
+    """Get the registered provider class with the given name"""
+    try:
+        return _registry[name]
+    except KeyError:
+        raise APIError(f"Unsupported API provider: {name}")
+
+
+def create_provider(name: str, config: Dict) -> Provider:
+    """Create a provider instance from the add-on config"""
+    return get_provider_class(name)(config)
+
+
+for _provider_class in (OpenAIProvider, ChatGLMProvider, LocalProvider):
+    register_provider(_provider_class)
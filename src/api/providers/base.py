@@ -0,0 +1,69 @@
+from typing import Callable, Dict, List, Optional
+
+from ..cancel import CancelToken
+from ..metrics import RequestRecord
+
+Messages = List[Dict[str, str]]
+
+
+class Provider:
+    """A chat completion backend with its own pooled connections.
+
+    complete() runs on the calling thread and acomplete() on the async
+    engine loop. Both stream text deltas to on_chunk when it is given and
+    return the full text. Retries, rate limiting and caching are done by
+    the handlers, so a provider makes exactly one attempt per call.
+    model overrides the configured model for one call.
+    """
+
+    # Name used for api_provider in the config and shown in the settings
+    name = ''
+    # Config keys of the model and of the API key, if one is needed
+    model_field = ''
+    api_key_field: Optional[str] = None
+    # Models offered in the settings dialog, the first is the default
+    models: List[str] = []
+
+    def __init__(self, config: Dict):
+        self.config = config
+
+    @classmethod
+    def config_error(cls, config: Dict) -> Optional[str]:
+        """Get what is missing in config to use this provider, or None"""
+        if cls.api_key_field is not None and not config.get(cls.api_key_field):
+            return f"{cls.name} API key is required when using {cls.name} provider"
+        return None
+
+    def configure(self, config: Dict) -> None:
+        """Apply a reloaded config, rebuilding transports whose settings changed"""
+        self.config = config
+
+    @property
+    def model(self) -> str:
+        """Get the configured model"""
+        return self.config[self.model_field]
+
+    def complete(self, messages: Messages,
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 cancel_token: Optional[CancelToken] = None,
+                 record: Optional[RequestRecord] = None,
+                 model: Optional[str] = None) -> str:
+        """Send one chat completion request and wait for the answer"""
+        raise NotImplementedError
+
+    async def acomplete(self, messages: Messages,
+                        on_chunk: Optional[Callable[[str], None]] = None,
+                        record: Optional[RequestRecord] = None,
+                        model: Optional[str] = None) -> str:
+        """Send one chat completion request from the async engine loop"""
+        raise NotImplementedError
+
+    def stats(self) -> Dict[str, int]:
+        """Get connection reuse counters of the sync transport"""
+        return {}
+
+    def close(self) -> None:
+        """Release the sync transport"""
+
+    async def aclose(self) -> None:
+        """Release the async transport"""
@@ -0,0 +1,61 @@
+import threading
+import time
+from typing import Optional, Tuple
+
+import jwt
+
+# A token is replaced this many seconds before it expires
+REFRESH_MARGIN = 30
+
+
+def split_api_key(api_key: str) -> Tuple[str, str]:
+    """Split a ZhipuAI API key into its id and secret"""
+    key_id, sep, secret = api_key.partition('.')
+    if not sep or not key_id or not secret:
+        raise ValueError("ChatGLM API key must have the form id.secret")
+    return key_id, secret
+
+
+class ChatGLMTokenProvider:
+    """Signs short-lived JWTs from an id.secret ZhipuAI API key.
+
+    A token is signed once and reused by all threads until shortly before
+    it expires, so requests only pay for a lock and a clock read. ZhipuAI
+    expects exp and timestamp in milliseconds.
+    """
+
+    def __init__(self, api_key: str, ttl: float = 3600):
+        self.api_key = api_key
+        self.key_id, self._secret = split_api_key(api_key)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._token: Optional[str] = None
+        self._refresh_at = 0.0
+
+    def _sign(self, now: float) -> str:
+        now_ms = int(now * 1000)
+        payload = {
+            "api_key": self.key_id,
+            "exp": now_ms + int(self.ttl * 1000),
+            "timestamp": now_ms,
+        }
+        return jwt.encode(
+            payload,
+            self._secret,
+            algorithm="HS256",
+            headers={"alg": "HS256", "sign_type": "SIGN"}
+        )
+
+    def token(self) -> str:
+        """Get a valid token, signing a new one only when the cached one is about to expire"""
+        with self._lock:
+            now = time.time()
+            if self._token is None or now >= self._refresh_at:
+                self._token = self._sign(now)
+                self._refresh_at = now + max(self.ttl - REFRESH_MARGIN, self.ttl / 2)
+            return self._token
+
+    def invalidate(self) -> None:
+        """Drop the cached token, e.g. after the server rejected it"""
+        with self._lock:
+            self._token = None
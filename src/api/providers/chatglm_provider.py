@@ -0,0 +1,272 @@
+import asyncio
+import json
+import time
+import uuid
+from typing import Callable, Dict, Optional, Tuple
+
+import requests
+
+from ..cancel import CancelToken, RequestCancelled, run_cancellable
+from ..errors import APIError, RateLimitError
+from ..http_session import PooledSession, abort_response
+from ..metrics import RequestRecord
+from ..retry import parse_retry_after
+from ..sse import SSEDecoder, iter_sse_data
+from ...utils.logger import get_logger
+from .base import Messages, Provider
+from .chatglm_auth import ChatGLMTokenProvider, split_api_key
+
+logger = get_logger(__name__)
+
+
+class ChatGLMProvider(Provider):
+    """ZhipuAI ChatGLM over a pooled requests session and an httpx client"""
+
+    name = 'ChatGLM'
+    model_field = 'chatglm_model'
+    api_key_field = 'chatglm_api_key'
+    models = ['glm-3', 'glm-4']
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        self.session: Optional[PooledSession] = None
+        self.auth: Optional[ChatGLMTokenProvider] = None
+        self._async_client = None
+        self._async_settings = None
+        self.configure(config)
+
+    @classmethod
+    def config_error(cls, config: Dict) -> Optional[str]:
+        error = super().config_error(config)
+        if error:
+            return error
+        try:
+            split_api_key(config[cls.api_key_field])
+        except ValueError as e:
+            return str(e)
+        return None
+
+    def configure(self, config: Dict) -> None:
+        """Apply a reloaded config, rebuilding the session if pool settings changed"""
+        self.config = config
+        api_key, ttl = config['chatglm_api_key'], config['chatglm_token_ttl']
+        if self.auth is None or (self.auth.api_key, self.auth.ttl) != (api_key, ttl):
+            # Only configs that passed validation reach requests
+            self.auth = ChatGLMTokenProvider(api_key, ttl) if self.config_error(config) is None else None
+        pool_settings = (
+            config['pool_connections'],
+            config['pool_maxsize'],
+            config['pool_idle_timeout']
+        )
+        if self.session is not None:
+            current = (
+                self.session.pool_connections,
+                self.session.pool_maxsize,
+                self.session.idle_timeout
+            )
+            if current == pool_settings:
+                return
+            self.session.close()
+        self.session = PooledSession(*pool_settings)
+
+    def _get_async_client(self):
+        """Get the pooled async HTTP client"""
+        import httpx
+        settings = (
+            self.config['pool_maxsize'],
+            self.config['pool_idle_timeout']
+        )
+        if self._async_client is None or self._async_settings != settings:
+            if self._async_client is not None:
+                # Pool settings changed, drop the old connections
+                asyncio.ensure_future(self._async_client.aclose())
+            self._async_client = httpx.AsyncClient(limits=httpx.Limits(
+                max_connections=settings[0],
+                max_keepalive_connections=settings[0],
+                keepalive_expiry=settings[1]
+            ))
+            self._async_settings = settings
+        return self._async_client
+
+    def complete(self, messages: Messages,
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 cancel_token: Optional[CancelToken] = None,
+                 record: Optional[RequestRecord] = None,
+                 model: Optional[str] = None) -> str:
+        try:
+            stream = on_chunk is not None
+            endpoint, headers, data = self.build_request(messages, stream, model)
+            logger.debug(
+                "chatglm request endpoint=%s model=%s stream=%s messages=%d prompt_chars=%d",
+                endpoint, data['model'], stream, len(data['messages']),
+                sum(len(message['content']) for message in data['messages'])
+            )
+
+            start = time.monotonic()
+            # Cancelling returns at once even before the response headers arrive
+            response = run_cancellable(
+                lambda: self.session.post(
+                    endpoint,
+                    headers=headers,
+                    json=data,
+                    timeout=self.config['timeout'],
+                    stream=stream
+                ),
+                cancel_token,
+                discard=abort_response
+            )
+            logger.debug("chatglm response status=%d elapsed=%.3fs",
+                         response.status_code, time.monotonic() - start)
+
+            if response.status_code != 200:
+                with response:
+                    logger.warning("chatglm error status=%d body=%.500s",
+                                   response.status_code, response.text)
+                    self.raise_for_status(response.status_code, response.headers, response.text)
+
+            if stream:
+                # Aborting the response makes the blocked read fail at once
+                remove = cancel_token.on_cancel(lambda: abort_response(response)) if cancel_token else None
+                try:
+                    return self._read_stream(response, on_chunk, record)
+                finally:
+                    if remove is not None:
+                        remove()
+
+            try:
+                return self._parse_response(response.json(), record)
+            except json.JSONDecodeError as e:
+                raise APIError(f"Failed to parse ChatGLM API response: {e}")
+
+        except requests.exceptions.RequestException as e:
+            if cancel_token is not None and cancel_token.cancelled:
+                # The error is the aborted connection
+                raise RequestCancelled("Request cancelled") from e
+            raise APIError(f"ChatGLM API error: {e}")
+
+    async def acomplete(self, messages: Messages,
+                        on_chunk: Optional[Callable[[str], None]] = None,
+                        record: Optional[RequestRecord] = None,
+                        model: Optional[str] = None) -> str:
+        import httpx
+        stream = on_chunk is not None
+        endpoint, headers, data = self.build_request(messages, stream, model)
+        client = self._get_async_client()
+        try:
+            if not stream:
+                response = await client.post(
+                    endpoint,
+                    headers=headers,
+                    json=data,
+                    timeout=self.config['timeout']
+                )
+                if response.status_code != 200:
+                    self.raise_for_status(response.status_code, response.headers, response.text)
+                try:
+                    return self._parse_response(response.json(), record)
+                except json.JSONDecodeError as e:
+                    raise APIError(f"Failed to parse ChatGLM API response: {e}")
+
+            parts = []
+            async with client.stream('POST', endpoint, headers=headers, json=data,
+                                     timeout=self.config['timeout']) as response:
+                if response.status_code != 200:
+                    await response.aread()
+                    self.raise_for_status(response.status_code, response.headers, response.text)
+                decoder = SSEDecoder()
+                async for line in response.aiter_lines():
+                    payload = decoder.feed(line)
+                    if payload is not None:
+                        content = self.parse_delta(payload, record)
+                        if content:
+                            parts.append(content)
+                            on_chunk(content)
+                    if decoder.done:
+                        break
+            return ''.join(parts).strip()
+        except httpx.HTTPError as e:
+            raise APIError(f"ChatGLM API error: {e}")
+
+    def build_request(self, messages: Messages, stream: bool,
+                      model: Optional[str] = None) -> Tuple[str, Dict[str, str], Dict]:
+        """Build endpoint, headers and body of a ChatGLM chat completion request"""
+        headers = {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self._token()}"
+        }
+        data = {
+            "model": model or self.model,
+            "messages": messages,  # Send all messages
+            "temperature": self.config['temperature'],
+            "stream": stream,
+            "request_id": str(uuid.uuid4())
+        }
+        return self.config['chatglm_endpoint'], headers, data
+
+    def _token(self) -> str:
+        """Get the signed auth token, the raw API key is never sent"""
+        if self.auth is None:
+            raise APIError(self.config_error(self.config) or "ChatGLM API key is not configured")
+        return self.auth.token()
+
+    def raise_for_status(self, status_code: int, headers, text: str) -> None:
+        """Raise the error matching a non-200 ChatGLM response"""
+        if status_code == 401 and self.auth is not None:
+            # Sign a fresh token for the retry
+            self.auth.invalidate()
+        if status_code == 429:
+            retry_after = parse_retry_after(headers.get('Retry-After'))
+            raise RateLimitError("ChatGLM rate limit exceeded", retry_after=retry_after)
+        raise APIError(f"ChatGLM API error: HTTP {status_code}\n{text}")
+
+    @staticmethod
+    def _parse_response(response_data: Dict, record: Optional[RequestRecord] = None) -> str:
+        """Get the text of a non-streamed ChatGLM response"""
+        if not response_data.get('choices'):
+            raise APIError(f"Invalid response format from ChatGLM API: {response_data}")
+        if record is not None:
+            record.set_usage(response_data.get('usage'))
+        return response_data['choices'][0]['message']['content'].strip()
+
+    @staticmethod
+    def parse_delta(payload: str, record: Optional[RequestRecord] = None) -> Optional[str]:
+        """Get the text delta of a ChatGLM stream event.
+
+        Token usage, sent with the last event, is stored on record.
+        """
+        try:
+            event = json.loads(payload)
+        except json.JSONDecodeError as e:
+            raise APIError(f"Failed to parse ChatGLM stream event: {e}")
+        if record is not None:
+            record.set_usage(event.get('usage'))
+        choices = event.get('choices')
+        if not choices:
+            return None
+        return choices[0].get('delta', {}).get('content')
+
+    def _read_stream(self, response: requests.Response,
+                     on_chunk: Callable[[str], None],
+                     record: Optional[RequestRecord] = None) -> str:
+        """Read an SSE response, passing each text delta to on_chunk"""
+        parts = []
+        with response:
+            # chunk_size=None yields data as it arrives instead of buffering 512 bytes
+            for payload in iter_sse_data(response.iter_lines(chunk_size=None)):
+                content = self.parse_delta(payload, record)
+                if content:
+                    parts.append(content)
+                    on_chunk(content)
+        return ''.join(parts).strip()
+
+    def stats(self) -> Dict[str, int]:
+        return self.session.stats()
+
+    def close(self) -> None:
+        if self.session is not None:
+            self.session.close()
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
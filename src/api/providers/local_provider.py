@@ -0,0 +1,28 @@
+from typing import Dict, Optional
+
+from ..openai_client import ClientSettings, client_settings
+from .openai_provider import OpenAIProvider
+
+
+class LocalProvider(OpenAIProvider):
+    """A local OpenAI-compatible server such as llama.cpp or Ollama"""
+
+    name = 'Local'
+    model_field = 'local_model'
+    api_key_field = None
+    base_url_field = 'local_base_url'
+    models = ['llama3.2', 'qwen2.5']
+
+    @classmethod
+    def config_error(cls, config: Dict) -> Optional[str]:
+        if not config.get(cls.base_url_field):
+            return "Server URL is required when using Local provider"
+        return None
+
+    def _client_settings(self) -> ClientSettings:
+        # Local servers ignore the key, but the SDK refuses to send no key at all
+        return client_settings(
+            self.config,
+            self.config.get('local_api_key') or 'local',
+            self.config[self.base_url_field]
+        )
@@ -0,0 +1,162 @@
+import asyncio
+from typing import Callable, Dict, Optional
+
+from ..cancel import CancelToken, RequestCancelled, run_cancellable
+from ..errors import APIError, RateLimitError
+from ..metrics import RequestRecord
+from ..openai_client import (
+    ClientSettings, abort_stream, client_settings, create_async_openai_client,
+    get_openai_client, release_openai_client
+)
+from ..retry import parse_retry_after
+from .base import Messages, Provider
+
+
+class OpenAIProvider(Provider):
+    """OpenAI chat completions through the vendored openai SDK"""
+
+    name = 'OpenAI'
+    model_field = 'openai_model'
+    api_key_field = 'openai_api_key'
+    base_url_field = 'openai_base_url'
+    models = ['gpt-3.5-turbo', 'gpt-4']
+
+    def __init__(self, config: Dict):
+        super().__init__(config)
+        # Settings of the shared sync client this provider last used
+        self._settings: Optional[ClientSettings] = None
+        self._async_client = None
+        self._async_settings: Optional[ClientSettings] = None
+
+    def configure(self, config: Dict) -> None:
+        super().configure(config)
+        if self._settings is not None and self._settings != self._client_settings():
+            # Key, URL or pool settings changed, drop the client built for the old ones
+            release_openai_client(self._settings)
+            self._settings = None
+
+    def _client_settings(self) -> ClientSettings:
+        return client_settings(
+            self.config,
+            self.config[self.api_key_field],
+            self.config.get(self.base_url_field)
+        )
+
+    def _get_client(self):
+        """Get the shared sync client for the current settings"""
+        self._settings = self._client_settings()
+        return get_openai_client(self._settings)
+
+    def _get_async_client(self):
+        """Get the async client, replacing it if its settings changed"""
+        settings = self._client_settings()
+        if self._async_client is None or self._async_settings != settings:
+            if self._async_client is not None:
+                asyncio.ensure_future(self._async_client.close())
+            self._async_client = create_async_openai_client(settings)
+            self._async_settings = settings
+        return self._async_client
+
+    def _request_kwargs(self, messages: Messages, stream: bool,
+                        model: Optional[str] = None) -> Dict:
+        kwargs = {
+            'model': model or self.model,
+            'messages': messages,
+            'temperature': self.config['temperature'],
+            'stream': stream
+        }
+        if stream:
+            # The last chunk then carries the usage block
+            kwargs['stream_options'] = {"include_usage": True}
+        return kwargs
+
+    def _error(self, error: Exception) -> Exception:
+        """Map an SDK exception to the add-on's error types"""
+        import openai
+        if isinstance(error, openai.RateLimitError):
+            retry_after = parse_retry_after(error.response.headers.get('retry-after'))
+            return RateLimitError(str(error), retry_after=retry_after)
+        return APIError(f"{self.name} API error: {error}")
+
+    def complete(self, messages: Messages,
+                 on_chunk: Optional[Callable[[str], None]] = None,
+                 cancel_token: Optional[CancelToken] = None,
+                 record: Optional[RequestRecord] = None,
+                 model: Optional[str] = None) -> str:
+        try:
+            client = self._get_client()
+            kwargs = self._request_kwargs(messages, on_chunk is not None, model)
+            # Cancelling returns at once even before the response headers arrive
+            response = run_cancellable(
+                lambda: client.chat.completions.create(**kwargs),
+                cancel_token,
+                discard=abort_stream if on_chunk is not None else None
+            )
+            if on_chunk is None:
+                if record is not None:
+                    record.set_usage(response.usage)
+                return response.choices[0].message.content.strip()
+
+            # Aborting the stream makes the blocked read fail at once
+            remove = cancel_token.on_cancel(lambda: abort_stream(response)) if cancel_token else None
+            try:
+                parts = []
+                with response:
+                    for chunk in response:
+                        content = self._chunk_content(chunk, record)
+                        if content:
+                            parts.append(content)
+                            on_chunk(content)
+                return ''.join(parts).strip()
+            finally:
+                if remove is not None:
+                    remove()
+        except RequestCancelled:
+            raise
+        except Exception as e:
+            if cancel_token is not None and cancel_token.cancelled:
+                # The error is the aborted connection
+                raise RequestCancelled("Request cancelled") from e
+            raise self._error(e)
+
+    async def acomplete(self, messages: Messages,
+                        on_chunk: Optional[Callable[[str], None]] = None,
+                        record: Optional[RequestRecord] = None,
+                        model: Optional[str] = None) -> str:
+        try:
+            client = self._get_async_client()
+            response = await client.chat.completions.create(
+                **self._request_kwargs(messages, on_chunk is not None, model))
+            if on_chunk is None:
+                if record is not None:
+                    record.set_usage(response.usage)
+                return response.choices[0].message.content.strip()
+
+            parts = []
+            async for chunk in response:
+                content = self._chunk_content(chunk, record)
+                if content:
+                    parts.append(content)
+                    on_chunk(content)
+            return ''.join(parts).strip()
+        except Exception as e:
+            raise self._error(e)
+
+    @staticmethod
+    def _chunk_content(chunk, record: Optional[RequestRecord] = None) -> Optional[str]:
+        """Get the text delta of a stream chunk, storing usage on record"""
+        if record is not None:
+            record.set_usage(chunk.usage)
+        if not chunk.choices:
+            return None
+        return chunk.choices[0].delta.content
+
+    def close(self) -> None:
+        if self._settings is not None:
+            release_openai_client(self._settings)
+            self._settings = None
+
+    async def aclose(self) -> None:
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
@@ -0,0 +1,132 @@
+import math
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+def parse_retry_after(value: Optional[str], default: int = 60) -> Optional[int]:
+    """Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Non-finite values such as inf or nan give None, so the request backs
+    off as after an ordinary error instead of waiting on the header.
+    """
+    if value is None:
+        return default
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        if not math.isfinite(seconds):
+            return None
+        return max(0, int(math.ceil(seconds)))
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    return max(0, int(math.ceil(retry_at.timestamp() - time.time())))
+
+
+class TokenBucket:
+    """Token bucket refilled at a fixed rate up to a burst capacity"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Get the seconds until the given tokens are available"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Tokens only accrue after _updated, which lies ahead while paused
+            wait = max(0.0, self._updated - now)
+            if self._tokens < tokens:
+                wait += (tokens - self._tokens) / self.rate
+            return wait
+
+    def consume(self, tokens: float = 1.0) -> None:
+        """Take tokens from the bucket"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= tokens
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for the given time, e.g. from a Retry-After header"""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            # Only one request may go as soon as the pause ends
+            self._tokens = min(self._tokens, 1.0)
+            self._updated = max(self._updated, now + seconds)
+
+    def configure(self, rate: float, capacity: float) -> None:
+        """Update the refill rate and burst size"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = rate
+            self.capacity = capacity
+            self._tokens = min(self._tokens, capacity)
+
+
+class RetryScheduler:
+    """Decides when a request is sent and whether a failure is retried.
+
+    Each attempt is admitted by the provider's RequestScheduler. Ordinary
+    failures back off exponentially with full jitter. Rate limit errors
+    pause the provider for Retry-After seconds and are retried once it
+    admits requests again, unless the wait is too long.
+    """
+
+    def __init__(self, limiter, max_attempts: int, base_delay: float,
+                 max_delay: float, max_rate_limit_wait: float,
+                 priority: int = 1, tokens: int = 0, cancel_token=None):
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.priority = priority
+        self.tokens = tokens
+        self.cancel_token = cancel_token
+        self.attempts = 0
+
+    def before_attempt(self) -> float:
+        """Block until the next attempt may be sent and return the seconds waited"""
+        return self.limiter.acquire(self.priority, self.tokens, self.cancel_token)
+
+    async def before_attempt_async(self) -> float:
+        """Wait on the event loop until the next attempt may be sent"""
+        return await self.limiter.acquire_async(self.priority, self.tokens, self.cancel_token)
+
+    def backoff(self) -> float:
+        """Get a full-jitter exponential backoff delay for the current attempt"""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** (self.attempts - 1))
+        return random.uniform(0, ceiling)
+
+    def on_error(self, error: Exception, retry_after: Optional[float] = None) -> Optional[float]:
+        """Record a failed attempt and get the delay before retrying, or None to give up.
+
+        retry_after marks the error as a rate limit with the given wait.
+        """
+        self.attempts += 1
+        if retry_after is not None:
+            self.limiter.pause(retry_after)
+            if self.attempts >= self.max_attempts or retry_after > self.max_rate_limit_wait:
+                return None
+            # before_attempt() waits out the pause
+            return 0.0
+        if self.attempts >= self.max_attempts:
+            return None
+        return self.backoff()
@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .metrics import percentile
+from .providers import get_provider_class, provider_names
+from .retry import RetryScheduler
+
+
+class Route(NamedTuple):
+    """A provider and the model to request from it"""
+    provider: str
+    model: str
+
+
+def parse_routes(entries: List) -> List[Tuple[str, Optional[str]]]:
+    """Parse a route list from the config.
+
+    Entries are a provider name, using its configured model, or a
+    [provider, model] pair.
+    """
+    routes = []
+    for entry in entries:
+        if isinstance(entry, str):
+            routes.append((entry, None))
+        elif (isinstance(entry, (list, tuple)) and len(entry) == 2
+              and isinstance(entry[0], str) and isinstance(entry[1], (str, type(None)))):
+            routes.append((entry[0], entry[1] or None))
+        else:
+            raise ValueError(f"Invalid route {entry!r}, expected a provider name or [provider, model]")
+    return routes
+
+
+class RouteStats:
+    """Rolling latency and error samples of one route for one action"""
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)  # (latency, first token latency, ok)
+        self.updated = 0.0
+
+    def add(self, latency: float, first_token: float, ok: bool) -> None:
+        self.samples.append((latency, first_token, ok))
+        self.updated = time.monotonic()
+
+    def first_token_latencies(self) -> List[float]:
+        """Get the sorted first token latencies of successful attempts"""
+        return sorted(first_token for _, first_token, ok in self.samples if ok)
+
+    def summary(self) -> Dict[str, float]:
+        """Get sample count, error rate and p50/p95 latency of successful attempts"""
+        latencies = sorted(latency for latency, _, ok in self.samples if ok)
+        first_tokens = self.first_token_latencies()
+        count = len(self.samples)
+        return {
+            'requests': count,
+            'error_rate': (count - len(latencies)) / count if count else 0.0,
+            'p50_latency': percentile(latencies, 50),
+            'p95_latency': percentile(latencies, 95),
+            'p50_first_token': percentile(first_tokens, 50),
+            'p95_first_token': percentile(first_tokens, 95),
+        }
+
+
+class Router:
+    """Maps each action to an ordered list of routes and tracks their health.
+
+    The routes config maps an action to its routes in order of preference.
+    Actions without an entry use the selected api_provider. A route whose
+    rolling error rate or p95 latency exceeds its limits is tried after
+    the healthy ones. It gets the first attempt again once it has not been
+    used for route_probe_interval seconds, so it can recover.
+    """
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self._stats: Dict[Tuple[str, Route], RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: Dict) -> None:
+        """Apply a reloaded config, keeping the collected samples"""
+        with self._lock:
+            self.config = config
+            for stats in self._stats.values():
+                if stats.samples.maxlen != config['route_window']:
+                    stats.samples = deque(stats.samples, maxlen=config['route_window'])
+
+    def configured_routes(self, action: str) -> List[Route]:
+        """Get the routes of an action in configured order"""
+        entries = self.config['routes'].get(action)
+        if not entries:
+            entries = [self.config['api_provider']]
+        return [
+            Route(provider, model or self.config[get_provider_class(provider).model_field])
+            for provider, model in parse_routes(entries)
+        ]
+
+    def primary(self, action: str) -> Route:
+        """Get the preferred route of an action"""
+        return self.configured_routes(action)[0]
+
+    def routes_for(self, action: str) -> List[Route]:
+        """Get the routes of an action with degraded ones moved to the end"""
+        routes = self.configured_routes(action)
+        healthy = [route for route in routes if not self.is_degraded(action, route)]
+        degraded = [route for route in routes if route not in healthy]
+        return healthy + degraded
+
+    def is_degraded(self, action: str, route: Route) -> bool:
+        """Check whether a route is too slow or failing too often for an action"""
+        with self._lock:
+            stats = self._stats.get((action, route))
+            if stats is None or len(stats.samples) < self.config['route_min_samples']:
+                return False
+            if time.monotonic() - stats.updated > self.config['route_probe_interval']:
+                return False
+            summary = stats.summary()
+        if summary['error_rate'] > self.config['route_max_error_rate']:
+            return True
+        budget = self.config['route_latency_budget'].get(action)
+        return budget is not None and summary['p95_latency'] > budget
+
+    def record(self, action: str, route: Route, latency: float, ok: bool = True,
+               first_token: Optional[float] = None) -> None:
+        """Add the outcome of one attempt.
+
+        first_token is when the first text arrived, for non-streamed
+        responses it is the full latency.
+        """
+        with self._lock:
+            stats = self._stats.get((action, route))
+            if stats is None:
+                stats = RouteStats(self.config['route_window'])
+                self._stats[(action, route)] = stats
+            stats.add(latency, latency if first_token is None else first_token, ok)
+
+    def first_token_percentile(self, action: str, route: Route, pct: float) -> Optional[float]:
+        """Get a percentile of the first token latency, or None without enough samples"""
+        with self._lock:
+            stats = self._stats.get((action, route))
+            if stats is None:
+                return None
+            first_tokens = stats.first_token_latencies()
+        if len(first_tokens) < self.config['route_min_samples']:
+            return None
+        return percentile(first_tokens, pct)
+
+    def expected_first_token(self, action: str, route: Route, elapsed: float) -> Optional[float]:
+        """Estimate when the first text arrives given none did within elapsed seconds.
+
+        This is the mean of the observed first token latencies above
+        elapsed, or None if none were that slow.
+        """
+        with self._lock:
+            stats = self._stats.get((action, route))
+            slower = [value for value in stats.first_token_latencies() if value > elapsed] if stats else []
+        if not slower:
+            return None
+        return sum(slower) / len(slower)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Get rolling statistics keyed by 'action provider/model'"""
+        with self._lock:
+            items = list(self._stats.items())
+            summaries = {
+                f"{action} {route.provider}/{route.model}": stats.summary()
+                for (action, route), stats in items
+            }
+        for (action, route), _ in items:
+            key = f"{action} {route.provider}/{route.model}"
+            summaries[key]['degraded'] = self.is_degraded(action, route)
+        return summaries
+
+
+class Failover:
+    """Picks the route of each attempt of one request.
+
+    A failed route is retried after its backoff delay, but while it waits
+    the next live route gets the attempt. A route that used up its retries
+    is dropped.
+    """
+
+    def __init__(self, routes: List[Route], make_scheduler: Callable[[Route], RetryScheduler]):
+        self.live = list(routes)
+        self._make_scheduler = make_scheduler
+        self._schedulers: Dict[Route, RetryScheduler] = {}
+        self._ready_at: Dict[Route, float] = {}
+        self._index = 0
+
+    def current(self) -> Tuple[Route, RetryScheduler, float]:
+        """Get the route of the next attempt, its retry schedule and the seconds to wait first"""
+        route = self.live[self._index % len(self.live)]
+        scheduler = self._schedulers.get(route)
+        if scheduler is None:
+            scheduler = self._make_scheduler(route)
+            self._schedulers[route] = scheduler
+        wait = max(0.0, self._ready_at.pop(route, 0.0) - time.monotonic())
+        return route, scheduler, wait
+
+    def retry_later(self, route: Route, delay: float) -> None:
+        """Retry route after delay and move on to the next live route meanwhile"""
+        self._ready_at[route] = time.monotonic() + delay
+        self._index += 1
+
+    def drop(self, route: Route) -> bool:
+        """Stop using a route, returning whether any route is left"""
+        position = self.live.index(route)
+        self.live.remove(route)
+        # The route after it moves into its place and gets the next attempt
+        self._index = position
+        return bool(self.live)
+
+
+def routes_config_error(config: Dict) -> Optional[str]:
+    """Get what is wrong with the routes config, or None"""
+    if not isinstance(config['routes'], dict):
+        return "routes must map actions to lists of routes"
+    for action, entries in config['routes'].items():
+        if not isinstance(entries, list):
+            return f"Routes of {action} must be a list"
+        try:
+            routes = parse_routes(entries)
+        except ValueError as e:
+            return str(e)
+        for provider, _ in routes:
+            if provider not in provider_names():
+                return f"Unknown provider '{provider}' in routes of {action}"
+            error = get_provider_class(provider).config_error(config)
+            if error:
+                return error
+    return None
@@ -0,0 +1,243 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from .cancel import CancelToken
+from .retry import TokenBucket
+
+CHARS_PER_TOKEN = 4
+
+# Rough completion sizes used to charge the tokens-per-minute budget up front
+EXPECTED_COMPLETION_TOKENS = {
+    "test": 20,
+    "generate_article": 400,
+    "evaluate_sentence": 300,
+    "generate_examples": 150,
+    "generate_examples_batch": 1500,
+}
+
+
+class Priority(IntEnum):
+    """Request priorities, lower values are admitted first"""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BACKGROUND = 2
+
+
+# Priority of each action when the caller does not choose one
+DEFAULT_PRIORITIES = {
+    "test": Priority.INTERACTIVE,
+    "evaluate_sentence": Priority.INTERACTIVE,
+    "generate_examples": Priority.NORMAL,
+    "generate_article": Priority.NORMAL,
+    "generate_examples_batch": Priority.BACKGROUND,
+}
+
+
+def estimate_tokens(action: str, messages: List[Dict[str, str]]) -> int:
+    """Estimate prompt plus completion tokens of a request"""
+    prompt_chars = sum(len(message['content']) for message in messages)
+    return prompt_chars // CHARS_PER_TOKEN + EXPECTED_COMPLETION_TOKENS.get(action, 300)
+
+
+class RequestScheduler:
+    """Admits requests to one provider in priority order within RPM and TPM budgets.
+
+    Waiting requests form a priority queue (FIFO within a priority). Only
+    the head of the queue may take from the budgets, so a queued background
+    request never gets ahead of an interactive one that arrives later.
+    A budget of 0 disables that limit.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+        # Disabled budgets still get a bucket in case they are enabled later
+        self._requests = TokenBucket(*self._bucket_settings(requests_per_minute or 60))
+        self._tokens = TokenBucket(*self._bucket_settings(tokens_per_minute or 60000))
+        self._paused_until = 0.0
+        self._condition = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        # (loop, future) of coroutines waiting in acquire_async()
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._admitted = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    @staticmethod
+    def _bucket_settings(per_minute: float) -> Tuple[float, float]:
+        rate = per_minute / 60.0
+        # Allow bursts of up to ten seconds' worth of budget
+        return rate, max(1.0, rate * 10)
+
+    def configure(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        """Update the per-minute budgets"""
+        if requests_per_minute != self._rpm and requests_per_minute > 0:
+            self._requests.configure(*self._bucket_settings(requests_per_minute))
+        if tokens_per_minute != self._tpm and tokens_per_minute > 0:
+            self._tokens.configure(*self._bucket_settings(tokens_per_minute))
+        self._rpm = requests_per_minute
+        self._tpm = tokens_per_minute
+
+    def _wait_time(self, tokens: int) -> float:
+        wait = max(0.0, self._paused_until - time.monotonic())
+        if self._rpm > 0:
+            wait = max(wait, self._requests.wait_time(1))
+        if self._tpm > 0:
+            # A request larger than the burst size must still go through eventually
+            wait = max(wait, self._tokens.wait_time(min(tokens, self._tokens.capacity)))
+        return wait
+
+    def _consume(self, tokens: int) -> None:
+        if self._rpm > 0:
+            self._requests.consume(1)
+        if self._tpm > 0:
+            self._tokens.consume(min(tokens, self._tokens.capacity))
+
+    def _try_admit(self, entry: Tuple[int, int], tokens: int,
+                   cancel_token: Optional[CancelToken]) -> Tuple[bool, Optional[float]]:
+        """Admit entry if it heads the queue and the budgets allow it.
+
+        Returns whether it was admitted and otherwise how long to wait
+        before trying again, None meaning until woken. Call with the
+        condition held.
+        """
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        if self._queue[0] != entry:
+            return False, None
+        wait = self._wait_time(tokens)
+        if wait > 0:
+            return False, wait
+        self._consume(tokens)
+        return True, None
+
+    def _leave(self, entry: Tuple[int, int]) -> None:
+        """Remove entry from the queue and wake the next request"""
+        with self._condition:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+            self._notify_all()
+
+    def _admitted_after(self, start: float) -> float:
+        """Record an admission and return the seconds it waited"""
+        with self._condition:
+            waited = time.monotonic() - start
+            self._admitted += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+            return waited
+
+    def acquire(self, priority: int = Priority.NORMAL, tokens: int = 0,
+                cancel_token: Optional[CancelToken] = None) -> float:
+        """Block until the request may be sent and return the seconds waited.
+
+        Raises RequestCancelled if cancel_token is cancelled while waiting.
+        """
+        start = time.monotonic()
+        entry = (int(priority), next(self._sequence))
+        remove = cancel_token.on_cancel(self._wake) if cancel_token else None
+        with self._condition:
+            heapq.heappush(self._queue, entry)
+        try:
+            with self._condition:
+                while True:
+                    admitted, wait = self._try_admit(entry, tokens, cancel_token)
+                    if admitted:
+                        break
+                    self._condition.wait(wait)
+        finally:
+            self._leave(entry)
+            if remove is not None:
+                remove()
+        return self._admitted_after(start)
+
+    async def acquire_async(self, priority: int = Priority.NORMAL, tokens: int = 0,
+                            cancel_token: Optional[CancelToken] = None) -> float:
+        """Wait on the running event loop until the request may be sent.
+
+        Same queue and budgets as acquire(), but a waiting coroutine holds
+        no thread. Returns the seconds waited and raises RequestCancelled
+        if cancel_token is cancelled while waiting.
+        """
+        loop = asyncio.get_running_loop()
+        start = time.monotonic()
+        entry = (int(priority), next(self._sequence))
+        remove = cancel_token.on_cancel(self._wake) if cancel_token else None
+        with self._condition:
+            heapq.heappush(self._queue, entry)
+        try:
+            while True:
+                with self._condition:
+                    admitted, wait = self._try_admit(entry, tokens, cancel_token)
+                    if admitted:
+                        break
+                    woken = loop.create_future()
+                    self._async_waiters.append((loop, woken))
+                await asyncio.wait([woken], timeout=wait)
+        finally:
+            self._leave(entry)
+            if remove is not None:
+                remove()
+        return self._admitted_after(start)
+
+    def _notify_all(self) -> None:
+        """Wake all waiting threads and coroutines. Call with the condition held."""
+        self._condition.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, woken in waiters:
+            try:
+                loop.call_soon_threadsafe(_set_woken, woken)
+            except RuntimeError:
+                # The waiter's loop was closed
+                pass
+
+    def _wake(self) -> None:
+        """Wake waiting requests so they notice a cancellation"""
+        with self._condition:
+            self._notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold all requests for the given time, e.g. from a Retry-After header"""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # Resume at the steady rate instead of with a full burst
+            self._requests.pause(seconds)
+            self._notify_all()
+
+    def stats(self) -> Dict[str, float]:
+        """Get queue depth and wait time metrics"""
+        with self._condition:
+            return {
+                'queue_depth': len(self._queue),
+                'admitted': self._admitted,
+                'avg_wait': self._total_wait / self._admitted if self._admitted else 0.0,
+                'max_wait': self._max_wait
+            }
+
+
+def _set_woken(woken: asyncio.Future) -> None:
+    if not woken.done():
+        woken.set_result(None)
+
+
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+
+def get_request_scheduler(provider: str, requests_per_minute: float,
+                          tokens_per_minute: float) -> RequestScheduler:
+    """Get the process-wide request scheduler of a provider"""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(provider)
+        if scheduler is None:
+            scheduler = RequestScheduler(requests_per_minute, tokens_per_minute)
+            _schedulers[provider] = scheduler
+        else:
+            scheduler.configure(requests_per_minute, tokens_per_minute)
+        return scheduler
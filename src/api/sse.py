@@ -0,0 +1,60 @@
+from typing import Iterable, Iterator, List, Optional, Union
+
+SSE_DONE = "[DONE]"
+
+
+class SSEDecoder:
+    """Incremental server-sent events decoder fed one line at a time.
+
+    Multi-line data fields are joined with newlines, comments and other
+    fields are skipped, and the stream ends at the OpenAI-style [DONE] marker.
+    """
+
+    def __init__(self):
+        self._data_lines: List[str] = []
+        self.done = False
+
+    def feed(self, line: Union[bytes, str]) -> Optional[str]:
+        """Feed one line, returning the payload of an event it completes"""
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        line = line.rstrip('\r')
+
+        if not line:
+            # A blank line dispatches the pending event
+            return self.flush()
+
+        if line.startswith(':'):
+            return None
+
+        field, _, value = line.partition(':')
+        if value.startswith(' '):
+            value = value[1:]
+        if field == 'data':
+            self._data_lines.append(value)
+        return None
+
+    def flush(self) -> Optional[str]:
+        """Dispatch the pending event, if any"""
+        if not self._data_lines:
+            return None
+        payload = '\n'.join(self._data_lines)
+        self._data_lines = []
+        if payload == SSE_DONE:
+            self.done = True
+            return None
+        return payload
+
+
+def iter_sse_data(lines: Iterable[Union[bytes, str]]) -> Iterator[str]:
+    """Decode a server-sent events stream into the payloads of its data fields"""
+    decoder = SSEDecoder()
+    for line in lines:
+        payload = decoder.feed(line)
+        if payload is not None:
+            yield payload
+        if decoder.done:
+            return
+    payload = decoder.flush()
+    if payload is not None:
+        yield payload
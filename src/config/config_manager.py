@@ -3,6 +3,10 @@ import json
 from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
+from ..api.providers import get_provider_class, provider_names
+from ..api.routing import routes_config_error
+from .defaults import CONFIG_TYPES, DEFAULT_CONFIG
+
 @dataclass
 class APIConfig:
     """API configuration settings"""
@@ -25,19 +29,7 @@ class LanguageConfig:
 class ConfigManager:
     """Manages configuration settings for the VocabMaster addon"""
     
-    DEFAULT_CONFIG = {
-        'api_provider': 'OpenAI',
-        'openai_api_key': '',
-        'chatglm_api_key': '',
-        'target_language': 'English',
-        'feedback_language': 'English',
-        'openai_model': 'gpt-3.5-turbo',
-        'chatglm_model': 'glm-4',
-        'temperature': 0.7,
-        'max_retries': 3,
-        'retry_delay': 1,
-        'timeout': 60
-    }
+    DEFAULT_CONFIG = DEFAULT_CONFIG
 
     def __init__(self, config_path: str, validate: bool = True):
         self.config_path = config_path
@@ -62,27 +54,18 @@ class ConfigManager:
 
     def _validate_config(self, config: Dict[str, Any]) -> None:
         """Validate configuration values"""
-        required_fields = {
-            'api_provider': str,
-            'temperature': (int, float),
-            'max_retries': int,
-            'retry_delay': (int, float),
-            'timeout': int
-        }
-
-        for field, expected_type in required_fields.items():
+        for field, expected_type in CONFIG_TYPES.items():
             if field not in config:
                 raise ValueError(f"Missing required field: {field}")
             if not isinstance(config[field], expected_type):
                 raise ValueError(f"Invalid type for {field}")
 
-        if config['api_provider'] not in ['OpenAI', 'ChatGLM']:
+        if config['api_provider'] not in provider_names():
             raise ValueError("Invalid API provider")
 
-        if config['api_provider'] == 'OpenAI' and not config['openai_api_key']:
-            raise ValueError("OpenAI API key is required")
-        elif config['api_provider'] == 'ChatGLM' and not config['chatglm_api_key']:
-            raise ValueError("ChatGLM API key is required")
+        error = get_provider_class(config['api_provider']).config_error(config) or routes_config_error(config)
+        if error:
+            raise ValueError(error)
 
     def save_config(self, updates: Dict[str, Any]) -> None:
         """Save updated configuration"""
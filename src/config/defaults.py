@@ -0,0 +1,93 @@
+# Defaults of config.json, shared by APIHandler and ConfigManager so that
+# both load and save the same keys
+DEFAULT_CONFIG = {
+    'api_provider': 'OpenAI',
+    'openai_api_key': '',
+    'chatglm_api_key': '',
+    'target_language': 'English',
+    'feedback_language': 'English',
+    'openai_model': 'gpt-3.5-turbo',
+    'chatglm_model': 'glm-4',
+    'temperature': 0.7,
+    'max_retries': 3,
+    'retry_delay': 1,
+    'timeout': 60,
+    'chatglm_endpoint': 'https://open.bigmodel.cn/api/paas/v4/chat/completions',
+    'chatglm_token_ttl': 3600,
+    'openai_base_url': '',
+    'local_base_url': 'http://localhost:11434/v1',
+    'local_model': 'llama3.2',
+    'local_api_key': '',
+    'pool_connections': 4,
+    'pool_maxsize': 8,
+    'pool_idle_timeout': 60,
+    'stream_responses': True,
+    'cache_enabled': True,
+    'cache_ttl': 7 * 24 * 3600,
+    'cache_max_entries': 500,
+    'max_concurrent_requests': 4,
+    'batch_max_words': 20,
+    'batch_max_tokens': 3000,
+    'max_retry_delay': 30,
+    'max_rate_limit_wait': 60,
+    'rate_limit_rpm': 60,
+    'rate_limit_tpm': 60000,
+    'prefetch_examples': False,
+    'prefetch_ahead': 3,
+    'prefetch_token_budget': 6000,
+    'max_worker_threads': 4,
+    'metrics_enabled': True,
+    'metrics_max_entries': 5000,
+    'routes': {},
+    'route_window': 50,
+    'route_min_samples': 5,
+    'route_max_error_rate': 0.5,
+    'route_latency_budget': {'evaluate_sentence': 15},
+    'route_probe_interval': 60,
+    'hedge_enabled': False,
+    'hedge_actions': ['evaluate_sentence'],
+    'hedge_percentile': 90,
+    'hedge_min_delay': 1.0,
+    'hedge_default_delay': 5.0
+}
+
+# Keys every loaded config must have, with the types their values must have
+CONFIG_TYPES = {
+    'api_provider': str,
+    'temperature': (int, float),
+    'max_retries': int,
+    'retry_delay': (int, float),
+    'timeout': int,
+    'chatglm_token_ttl': (int, float),
+    'pool_connections': int,
+    'pool_maxsize': int,
+    'pool_idle_timeout': (int, float),
+    'stream_responses': bool,
+    'cache_enabled': bool,
+    'cache_ttl': (int, float),
+    'cache_max_entries': int,
+    'max_concurrent_requests': int,
+    'batch_max_words': int,
+    'batch_max_tokens': int,
+    'max_retry_delay': (int, float),
+    'max_rate_limit_wait': (int, float),
+    'rate_limit_rpm': (int, float),
+    'rate_limit_tpm': (int, float),
+    'prefetch_examples': bool,
+    'prefetch_ahead': int,
+    'prefetch_token_budget': int,
+    'max_worker_threads': int,
+    'metrics_enabled': bool,
+    'metrics_max_entries': int,
+    'routes': dict,
+    'route_window': int,
+    'route_min_samples': int,
+    'route_max_error_rate': (int, float),
+    'route_latency_budget': dict,
+    'route_probe_interval': (int, float),
+    'hedge_enabled': bool,
+    'hedge_actions': list,
+    'hedge_percentile': (int, float),
+    'hedge_min_delay': (int, float),
+    'hedge_default_delay': (int, float)
+}
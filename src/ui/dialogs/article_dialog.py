@@ -4,12 +4,12 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt
 
-from ...api.api_handler import APIHandler
+from ...api.api_handler import get_api_handler
 from ...utils.worker import AIWorker
 from ..widgets.loading_overlay import LoadingOverlay
 from ..widgets.word_selector import WordSelector
 from ..styles.dark_mode import apply_dark_mode_style
-import markdown2
+from ...utils.markdown_renderer import IncrementalMarkdownRenderer
 
 class GeneratedArticleDialog(QDialog):
     """Dialog for displaying AI-generated articles"""
@@ -17,7 +17,8 @@ class GeneratedArticleDialog(QDialog):
     def __init__(self, words: list[str], config_path: str, parent=None):
         super().__init__(parent)
         self.words = words
-        self.api_handler = APIHandler(config_path)
+        self.api_handler = get_api_handler(config_path)
+        self.worker = None
         self.init_ui()
         
     def init_ui(self):
@@ -30,13 +31,14 @@ class GeneratedArticleDialog(QDialog):
         
         # Word selector
         self.word_selector = WordSelector(self.words)
-        self.word_selector.words_selected.connect(self.on_words_selected)
+        self.word_selector.selection_diff.connect(self.on_selection_changed)
         layout.addWidget(self.word_selector)
         
         # Article display
         self.article_text = QTextEdit()
         self.article_text.setReadOnly(True)
         self.article_text.setPlaceholderText("Article will appear here...")
+        self.article_renderer = IncrementalMarkdownRenderer(self.article_text)
         layout.addWidget(self.article_text)
         
         # Control buttons
@@ -60,7 +62,7 @@ class GeneratedArticleDialog(QDialog):
         if not selected_words:
             return
             
-        self.article_text.clear()
+        self.article_renderer.reset()
         # self.loading_overlay.show()
         self.generate_btn.setEnabled(False)
         
@@ -83,21 +85,29 @@ class GeneratedArticleDialog(QDialog):
         
     def on_chunk_received(self, chunk: str):
         """Handle receiving a chunk of generated text"""
-        ...
+        if not self.article_renderer.text:
+            # First token arrived, show the text as it grows
+            self.loading_overlay.hide()
+        self.article_renderer.append(chunk)
         
     def handle_result(self, result):
         """Handle completion of article generation"""
         self.loading_overlay.hide()
-        html = markdown2.markdown(result)
-        self.article_text.setHtml(f"<div style='font-family: Georgia, serif; font-size: 16px;'>{html}</div>")
+        self.article_renderer.finish(result)
         self.generate_btn.setEnabled(True)
         
+    def done(self, result):
+        """Cancel a running generation when the dialog closes"""
+        if self.worker is not None:
+            self.worker.stop()
+        super().done(result)
+        
     def handle_error(self, error_msg: str):
         """Handle generation error"""
         self.article_text.setPlainText(f"Error: {error_msg}")
         self.loading_overlay.hide()
         self.generate_btn.setEnabled(True)
         
-    def on_words_selected(self, words: list[str]):
+    def on_selection_changed(self, added: list[str], removed: list[str]):
         """Handle word selection change"""
-        self.generate_btn.setEnabled(bool(words))
+        self.generate_btn.setEnabled(self.word_selector.selected_count() > 0)
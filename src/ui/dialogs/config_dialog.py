@@ -1,11 +1,12 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton,
     QLabel, QLineEdit, QComboBox, QGroupBox, QFormLayout,
-    QDialogButtonBox, QMessageBox
+    QDialogButtonBox, QMessageBox, QCheckBox
 )
 from PyQt6.QtCore import Qt
 
-from ...api.api_handler import APIHandler
+from ...api.api_handler import get_api_handler
+from ...api.providers import get_provider_class, provider_names
 from ...config.config_manager import ConfigManager
 from ..styles.dark_mode import apply_dark_mode_style
 
@@ -64,7 +65,7 @@ class ConfigDialog(QDialog):
         layout = QFormLayout()
         
         self.provider_combo = QComboBox()
-        self.provider_combo.addItems(['OpenAI', 'ChatGLM'])
+        self.provider_combo.addItems(provider_names())
         self.provider_combo.currentTextChanged.connect(self.on_provider_changed)
         
         self.openai_key = QLineEdit()
@@ -75,11 +76,15 @@ class ConfigDialog(QDialog):
         self.chatglm_key.setEchoMode(QLineEdit.EchoMode.Password)
         self.chatglm_key.setPlaceholderText("Enter your ChatGLM API key")
         
+        self.local_url = QLineEdit()
+        self.local_url.setPlaceholderText("OpenAI-compatible server, e.g. http://localhost:11434/v1")
+        
         self.model_combo = QComboBox()
         
         layout.addRow("API Provider:", self.provider_combo)
         layout.addRow("OpenAI API Key:", self.openai_key)
         layout.addRow("ChatGLM API Key:", self.chatglm_key)
+        layout.addRow("Local Server URL:", self.local_url)
         layout.addRow("Model:", self.model_combo)
         
         group.setLayout(layout)
@@ -121,25 +126,38 @@ class ConfigDialog(QDialog):
         self.timeout = QLineEdit()
         self.timeout.setPlaceholderText("Timeout in seconds")
         
+        self.prefetch_examples = QCheckBox("Prepare examples for the next words in advance")
+        self.prefetch_examples.setToolTip(
+            "Uses extra tokens: examples for the selected word and the next few are "
+            "requested in the background, so Show Examples answers from the cache."
+        )
+        
+        self.hedge_enabled = QCheckBox("Send a backup request when feedback is slow")
+        self.hedge_enabled.setToolTip(
+            "Uses extra tokens: a second request is sent when the first one takes "
+            "longer than usual, and whichever answers first is shown."
+        )
+        
         layout.addRow("Temperature:", self.temperature)
         layout.addRow("Max Retries:", self.max_retries)
         layout.addRow("Retry Delay:", self.retry_delay)
         layout.addRow("Timeout:", self.timeout)
+        layout.addRow("Prefetching:", self.prefetch_examples)
+        layout.addRow("Hedging:", self.hedge_enabled)
         
         group.setLayout(layout)
         return group
 
     def on_provider_changed(self, provider: str):
         """Handle API provider change"""
+        provider_class = get_provider_class(provider)
         self.model_combo.clear()
-        if provider == 'OpenAI':
-            self.model_combo.addItems(['gpt-3.5-turbo', 'gpt-4'])
-            self.openai_key.setEnabled(True)
-            self.chatglm_key.setEnabled(False)
-        else:
-            self.model_combo.addItems(['glm-3', 'glm-4'])
-            self.openai_key.setEnabled(False)
-            self.chatglm_key.setEnabled(True)
+        self.model_combo.addItems(provider_class.models)
+        # Local servers serve whatever models the user has pulled
+        self.model_combo.setEditable(provider == 'Local')
+        self.openai_key.setEnabled(provider_class.api_key_field == 'openai_api_key')
+        self.chatglm_key.setEnabled(provider_class.api_key_field == 'chatglm_api_key')
+        self.local_url.setEnabled(provider == 'Local')
 
     def load_current_config(self):
         """Load current configuration into UI"""
@@ -149,11 +167,10 @@ class ConfigDialog(QDialog):
         self.provider_combo.setCurrentText(config.get('api_provider'))
         self.openai_key.setText(config.get('openai_api_key'))
         self.chatglm_key.setText(config.get('chatglm_api_key'))
+        self.local_url.setText(config.get('local_base_url'))
         
-        if config.get('api_provider') == 'OpenAI':
-            self.model_combo.setCurrentText(config.get('openai_model'))
-        else:
-            self.model_combo.setCurrentText(config.get('chatglm_model'))
+        model_field = get_provider_class(config.get('api_provider')).model_field
+        self.model_combo.setCurrentText(config.get(model_field))
         
         # Language Settings
         self.target_lang.setCurrentText(config.get('target_language'))
@@ -164,6 +181,8 @@ class ConfigDialog(QDialog):
         self.max_retries.setText(str(config.get('max_retries')))
         self.retry_delay.setText(str(config.get('retry_delay')))
         self.timeout.setText(str(config.get('timeout')))
+        self.prefetch_examples.setChecked(config.get('prefetch_examples'))
+        self.hedge_enabled.setChecked(config.get('hedge_enabled'))
 
     def get_config_updates(self) -> dict:
         """Get updated configuration values"""
@@ -171,18 +190,19 @@ class ConfigDialog(QDialog):
             'api_provider': self.provider_combo.currentText(),
             'openai_api_key': self.openai_key.text(),
             'chatglm_api_key': self.chatglm_key.text(),
+            'local_base_url': self.local_url.text(),
             'target_language': self.target_lang.currentText(),
             'feedback_language': self.feedback_lang.currentText(),
             'temperature': float(self.temperature.text() or 0.7),
             'max_retries': int(self.max_retries.text() or 3),
             'retry_delay': int(self.retry_delay.text() or 1),
-            'timeout': int(self.timeout.text() or 60)
+            'timeout': int(self.timeout.text() or 60),
+            'prefetch_examples': self.prefetch_examples.isChecked(),
+            'hedge_enabled': self.hedge_enabled.isChecked()
         }
         
-        if updates['api_provider'] == 'OpenAI':
-            updates['openai_model'] = self.model_combo.currentText()
-        else:
-            updates['chatglm_model'] = self.model_combo.currentText()
+        model_field = get_provider_class(updates['api_provider']).model_field
+        updates[model_field] = self.model_combo.currentText()
             
         return updates
 
@@ -200,8 +220,9 @@ class ConfigDialog(QDialog):
         try:
             updates = self.get_config_updates()
             self.config_manager.save_config(updates)
-            api_handler = APIHandler(self.config_manager.config_path)
-            _ = api_handler.generate_examples("test", count=1)
+            api_handler = get_api_handler(self.config_manager.config_path)
+            # Goes to the provider directly, a cached response would hide a bad key
+            api_handler.test_connection()
             QMessageBox.information(self, "Success", "API connection test successful!")
         except Exception as e:
             QMessageBox.warning(self, "Error", f"Connection test failed: {str(e)}")
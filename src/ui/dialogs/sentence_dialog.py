@@ -2,8 +2,9 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
     QTextEdit, QComboBox, QGroupBox, QWidget, QSplitter
 )
-from PyQt6.QtCore import Qt
-from ...api.api_handler import APIHandler
+from PyQt6.QtCore import Qt, QTimer
+from ...api.api_handler import get_api_handler
+from ...api.prefetch import ExamplePrefetcher
 from ...utils.worker import AIWorker
 from ..widgets.word_combobox import WordComboBox
 from ..widgets.loading_overlay import LoadingOverlay
@@ -11,18 +12,26 @@ from ..styles.dark_mode import apply_dark_mode_style
 import time
 from PyQt6.QtWidgets import QApplication
 from aqt import mw
-import markdown2
+from ...utils.markdown_renderer import IncrementalMarkdownRenderer
 class SentenceDialog(QDialog):
     def __init__(self, words, config_path, parent=None):
         super().__init__(parent)
         self.words = words
-        self.api_handler = APIHandler(config_path)
+        self.api_handler = get_api_handler(config_path)
         self.loading_overlay = None
         self.worker = None
         self.night_mode = self.is_night_mode()
+        self.prefetcher = ExamplePrefetcher(config_path)
+        
+        # Wait for the selection to settle before prefetching
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(500)
+        self.prefetch_timer.timeout.connect(self.prefetch_examples)
         
         self.setup_ui()
         self.setup_connections()
+        self.prefetch_timer.start()
         
     def setup_ui(self):
         self.setWindowTitle("Practice Sentences")
@@ -117,6 +126,7 @@ class SentenceDialog(QDialog):
         self.feedback_text.setReadOnly(True)
         self.feedback_text.setMinimumHeight(50)
         self.feedback_text.setPlaceholderText("Feedback will appear here...")
+        self.feedback_renderer = IncrementalMarkdownRenderer(self.feedback_text)
         
         layout.addWidget(self.feedback_text)
         group.setLayout(layout)
@@ -131,10 +141,17 @@ class SentenceDialog(QDialog):
         self.example_text.setReadOnly(True)
         self.example_text.setMinimumHeight(50)
         self.example_text.setPlaceholderText("Example sentences will appear here...")
+        self.example_renderer = IncrementalMarkdownRenderer(self.example_text)
         layout.addWidget(self.example_text)
         
+        btn_layout = QHBoxLayout()
         self.examples_btn = QPushButton("Show Examples")
-        layout.addWidget(self.examples_btn)
+        btn_layout.addWidget(self.examples_btn)
+        
+        self.regenerate_btn = QPushButton("Regenerate")
+        self.regenerate_btn.setToolTip("Ignore cached examples and ask the AI again")
+        btn_layout.addWidget(self.regenerate_btn)
+        layout.addLayout(btn_layout)
         
         group.setLayout(layout)
         return group
@@ -142,6 +159,7 @@ class SentenceDialog(QDialog):
     def setup_connections(self):
         self.evaluate_btn.clicked.connect(self.evaluate_sentence)
         self.examples_btn.clicked.connect(self.show_examples)
+        self.regenerate_btn.clicked.connect(self.regenerate_examples)
         
     def evaluate_sentence(self):
         sentence = self.sentence_input.toPlainText().strip()
@@ -155,21 +173,29 @@ class SentenceDialog(QDialog):
             "target_word": word
         })
         
-    def show_examples(self):
+    def show_examples(self, force_refresh: bool = False):
         word = self.word_combo.currentText().strip()
         if not word:
             return
             
         self.start_worker("generate_examples", {
             "word": word,
-            "count": 3
+            "count": 3,
+            "force_refresh": force_refresh
         })
         
+    def regenerate_examples(self):
+        """Show freshly generated examples, bypassing the response cache"""
+        self.show_examples(force_refresh=True)
+        
     def start_worker(self, action, params):
         if self.worker is not None:
+            # Cancels the old request without blocking the event loop
             self.worker.stop()
-            self.worker.wait()
             
+        renderer = self.output_renderer(action)
+        if renderer is not None:
+            renderer.reset()
         self.worker = AIWorker(action, params, self.api_handler.config_path)
         self.worker.finished.connect(self.handle_result)
         self.worker.error.connect(self.handle_error)
@@ -178,25 +204,30 @@ class SentenceDialog(QDialog):
         self.loading_overlay.show()
         self.worker.start()
         
+    def is_stale_signal(self) -> bool:
+        """Check if the current signal was queued by a worker that has been replaced"""
+        return self.sender() is not self.worker
+        
     def handle_result(self, result):
-        if self.worker.action == "evaluate_sentence":
-            self.feedback_text.clear()
-            html = markdown2.markdown(result)
-            self.feedback_text.setHtml(f"<div style='font-family: Georgia, serif; font-size: 16px;'>{html}</div>")
-        elif self.worker.action == "generate_examples":
-            self.example_text.clear()
-            html = markdown2.markdown(result)
-            self.example_text.setHtml(f"<div style='font-family: Georgia, serif; font-size: 16px;'>{html}</div>")
+        if self.is_stale_signal():
+            return
+        renderer = self.output_renderer(self.worker.action)
+        if renderer is not None:
+            renderer.finish(result)
         QApplication.processEvents()  # Update UI
         self.loading_overlay.hide() 
 
                 
     def handle_error(self, error_msg):
+        if self.is_stale_signal():
+            return
         from aqt.utils import showWarning
         showWarning(f"Error: {error_msg}")
         self.loading_overlay.hide() 
         
     def handle_rate_limit(self, message, wait_time):
+        if self.is_stale_signal():
+            return
         from aqt.utils import showWarning
         showWarning(f"Rate limit exceeded. Please wait {wait_time} seconds and try again.")
         
@@ -214,7 +245,44 @@ class SentenceDialog(QDialog):
     def on_word_selected(self, word: str):
         """Handle word selection change"""
         self.evaluate_btn.setEnabled(bool(word))
+        self.prefetch_timer.start()
+        
+    def prefetch_examples(self):
+        """Prefetch examples for the selected word and the next few in the list"""
+        index = self.word_combo.currentIndex()
+        if index < 0:
+            return
+        ahead = self.api_handler.config['prefetch_ahead']
+        words = [
+            self.word_combo.itemText(i)
+            for i in range(index, min(index + 1 + ahead, self.word_combo.count()))
+        ]
+        self.prefetcher.prefetch([word.strip() for word in words if word.strip()])
+        
+    def done(self, result):
+        """Cancel pending requests when the dialog closes"""
+        self.prefetch_timer.stop()
+        self.prefetcher.cancel()
+        if self.worker is not None:
+            self.worker.stop()
+        super().done(result)
         
     def on_chunk_received(self, chunk: str):
         """Handle receiving a chunk of generated text"""
-        ...
+        if self.is_stale_signal():
+            return
+        renderer = self.output_renderer(self.worker.action)
+        if renderer is None:
+            return
+        if not renderer.text:
+            # First token arrived, show the text as it grows
+            self.loading_overlay.hide()
+        renderer.append(chunk)
+
+    def output_renderer(self, action: str):
+        """Get the renderer of the text area that displays results of an action"""
+        if action == "evaluate_sentence":
+            return self.feedback_renderer
+        elif action == "generate_examples":
+            return self.example_renderer
+        return None
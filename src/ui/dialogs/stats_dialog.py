@@ -0,0 +1,133 @@
+import time
+
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLabel,
+    QComboBox, QTableWidget, QTableWidgetItem, QHeaderView, QMessageBox
+)
+from PyQt6.QtCore import Qt
+
+from ...api.api_handler import get_api_handler
+from ..styles.dark_mode import apply_dark_mode_style
+
+# Label and seconds of each selectable period, None covers the whole log
+PERIODS = [
+    ("Last 24 hours", 24 * 3600),
+    ("Last 7 days", 7 * 24 * 3600),
+    ("Last 30 days", 30 * 24 * 3600),
+    ("All recorded", None),
+]
+
+# Header, summary key and format of each column
+COLUMNS = [
+    ("Requests", 'requests', "{:d}"),
+    ("Cache hits", 'cache_hit_ratio', "{:.0%}"),
+    ("Errors", 'errors', "{:d}"),
+    ("Retries", 'retries', "{:d}"),
+    ("p50 (s)", 'p50_latency', "{:.2f}"),
+    ("p95 (s)", 'p95_latency', "{:.2f}"),
+    ("p99 (s)", 'p99_latency', "{:.2f}"),
+    ("Avg prompt tokens", 'avg_prompt_tokens', "{:.0f}"),
+    ("Avg completion tokens", 'avg_completion_tokens', "{:.0f}"),
+    ("Total tokens", 'total_tokens', "{:d}"),
+    ("Hedged", 'hedge_rate', "{:.0%}"),
+    ("Hedge wins", 'hedge_wins', "{:d}"),
+    ("Avg saved (s)", 'avg_latency_saved', "{:.2f}"),
+]
+
+
+class StatsDialog(QDialog):
+    """Dialog showing per-action request metrics"""
+
+    def __init__(self, config_path: str, parent=None):
+        super().__init__(parent)
+        self.api_handler = get_api_handler(config_path)
+
+        self.setWindowTitle("VocabMaster Usage Statistics")
+        self.resize(900, 300)
+
+        if self.is_night_mode():
+            apply_dark_mode_style(self)
+
+        self.setup_ui()
+        self.refresh()
+
+    def setup_ui(self):
+        """Set up the dialog UI"""
+        layout = QVBoxLayout(self)
+        layout.setSpacing(10)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Period:"))
+        self.period_combo = QComboBox()
+        for label, _ in PERIODS:
+            self.period_combo.addItem(label)
+        self.period_combo.currentIndexChanged.connect(self.refresh)
+        controls.addWidget(self.period_combo)
+        controls.addStretch()
+        layout.addLayout(controls)
+
+        self.table = QTableWidget(0, len(COLUMNS))
+        self.table.setHorizontalHeaderLabels([header for header, _, _ in COLUMNS])
+        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.ResizeToContents)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("color: #666; font-size: 12px;")
+        layout.addWidget(self.status_label)
+
+        btn_layout = QHBoxLayout()
+        refresh_btn = QPushButton("Refresh")
+        refresh_btn.clicked.connect(self.refresh)
+        clear_btn = QPushButton("Clear Statistics")
+        clear_btn.clicked.connect(self.clear_stats)
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(refresh_btn)
+        btn_layout.addWidget(clear_btn)
+        btn_layout.addStretch()
+        btn_layout.addWidget(close_btn)
+        layout.addLayout(btn_layout)
+
+    def refresh(self):
+        """Reload statistics of the selected period"""
+        if self.api_handler.metrics is None:
+            self.table.setRowCount(0)
+            self.status_label.setText("Metrics are disabled in the settings.")
+            return
+
+        seconds = PERIODS[self.period_combo.currentIndex()][1]
+        since = time.time() - seconds if seconds is not None else None
+        summary = self.api_handler.metrics_summary(since)
+
+        self.table.setRowCount(len(summary))
+        self.table.setVerticalHeaderLabels(list(summary))
+        for row, stats in enumerate(summary.values()):
+            for column, (_, key, fmt) in enumerate(COLUMNS):
+                item = QTableWidgetItem(fmt.format(stats[key]))
+                item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.table.setItem(row, column, item)
+
+        if summary:
+            self.status_label.setText(
+                "Latency covers requests answered by the provider, cache hits are excluded."
+            )
+        else:
+            self.status_label.setText("No requests recorded in this period.")
+
+    def clear_stats(self):
+        """Delete all recorded metrics after confirmation"""
+        answer = QMessageBox.question(
+            self, "Clear Statistics", "Delete all recorded request metrics?"
+        )
+        if answer == QMessageBox.StandardButton.Yes and self.api_handler.metrics is not None:
+            self.api_handler.metrics.clear()
+            self.refresh()
+
+    def is_night_mode(self) -> bool:
+        """Check if night mode is enabled using theme manager"""
+        try:
+            from aqt import mw
+            return mw.theme_manager.night_mode
+        except:
+            return False
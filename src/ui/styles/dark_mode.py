@@ -17,14 +17,14 @@ def apply_dark_mode_style(widget):
         QPushButton:hover {
             background-color: #777777;
         }
-        QTextEdit, QListWidget, QComboBox {
+        QTextEdit, QListView, QComboBox {
             background-color: #2c2c2c;
             color: #e0e0e0;
             border: 1px solid #555555;
             border-radius: 4px;
             padding: 8px;
         }
-        QListWidget::item:selected {
+        QListView::item:selected {
             background-color: #3c3c3c;
             color: #e0e0e0;
         }
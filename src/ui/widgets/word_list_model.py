@@ -0,0 +1,158 @@
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator, List, Optional
+
+from PyQt6.QtCore import QAbstractListModel, QModelIndex, Qt, QTimer, pyqtSignal
+
+
+class WordListModel(QAbstractListModel):
+    """Checkable word list model backed by a set of selected words.
+
+    Selection changes are coalesced: all changes made in one event-loop
+    tick, or inside batch_update(), produce a single selection_changed
+    signal carrying the net added and removed words.
+    """
+
+    selection_changed = pyqtSignal(list, list)  # added, removed
+
+    def __init__(self, words: list[str], parent=None):
+        super().__init__(parent)
+        self._words = list(words)
+        self._rows = {word: row for row, word in enumerate(self._words)}
+        self._selected = set(self._words)
+        self._selected_list: Optional[List[str]] = None
+        self._pending_added: set = set()
+        self._pending_removed: set = set()
+        self._batch_depth = 0
+        self._emit_timer = QTimer(self)
+        self._emit_timer.setSingleShot(True)
+        self._emit_timer.setInterval(0)
+        self._emit_timer.timeout.connect(self.flush_selection_change)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._words)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        word = self._words[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return word
+        if role == Qt.ItemDataRole.CheckStateRole:
+            if word in self._selected:
+                return Qt.CheckState.Checked
+            return Qt.CheckState.Unchecked
+        return None
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        word = self._words[index.row()]
+        checked = Qt.CheckState(value) == Qt.CheckState.Checked
+        if checked == (word in self._selected):
+            return True
+        if checked:
+            self._selected.add(word)
+            self._record_change(added=(word,))
+        else:
+            self._selected.discard(word)
+            self._record_change(removed=(word,))
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return (Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+                | Qt.ItemFlag.ItemIsUserCheckable)
+
+    def set_all_checked(self, checked: bool):
+        """Check or uncheck every word with a single change notification"""
+        if checked:
+            added = [word for word in self._words if word not in self._selected]
+            self._selected = set(self._words)
+            self._record_change(added=added)
+        else:
+            removed = self._selected
+            self._selected = set()
+            self._record_change(removed=removed)
+        if self._words:
+            self.dataChanged.emit(
+                self.index(0), self.index(len(self._words) - 1),
+                [Qt.ItemDataRole.CheckStateRole]
+            )
+
+    def set_words_checked(self, words: Iterable[str], checked: bool):
+        """Check or uncheck several words with a single change notification"""
+        rows = [self._rows[word] for word in words if word in self._rows]
+        if checked:
+            changed = [self._words[row] for row in rows if self._words[row] not in self._selected]
+            self._selected.update(changed)
+            self._record_change(added=changed)
+        else:
+            changed = [self._words[row] for row in rows if self._words[row] in self._selected]
+            self._selected.difference_update(changed)
+            self._record_change(removed=changed)
+        if changed:
+            self.dataChanged.emit(
+                self.index(min(rows)), self.index(max(rows)),
+                [Qt.ItemDataRole.CheckStateRole]
+            )
+
+    @contextmanager
+    def batch_update(self) -> Iterator[None]:
+        """Hold selection_changed until the block exits, then emit the net change once"""
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush_selection_change()
+
+    def _record_change(self, added: Iterable[str] = (), removed: Iterable[str] = ()):
+        """Merge a change into the pending diff and schedule its emission"""
+        for word in added:
+            if word in self._pending_removed:
+                self._pending_removed.discard(word)
+            else:
+                self._pending_added.add(word)
+        for word in removed:
+            if word in self._pending_added:
+                self._pending_added.discard(word)
+            else:
+                self._pending_removed.add(word)
+        self._selected_list = None
+        if self._batch_depth == 0 and not self._emit_timer.isActive():
+            # Coalesce everything changed during this event-loop tick
+            self._emit_timer.start()
+
+    def flush_selection_change(self):
+        """Emit the pending selection diff now, if there is one"""
+        self._emit_timer.stop()
+        if not self._pending_added and not self._pending_removed:
+            return
+        added = sorted(self._pending_added, key=self._rows.__getitem__)
+        removed = sorted(self._pending_removed, key=self._rows.__getitem__)
+        self._pending_added = set()
+        self._pending_removed = set()
+        self.selection_changed.emit(added, removed)
+
+    def selected_words(self) -> list[str]:
+        """Get selected words in list order.
+
+        The list is cached until the selection changes, so callers must not
+        modify it.
+        """
+        if self._selected_list is None:
+            self._selected_list = [word for word in self._words if word in self._selected]
+        return self._selected_list
+
+    def selected_count(self) -> int:
+        """Get the number of selected words"""
+        return len(self._selected)
+
+    def is_selected(self, word: str) -> bool:
+        """Check whether a word is selected"""
+        return word in self._selected
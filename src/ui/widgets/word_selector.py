@@ -1,62 +1,70 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QListWidget, QListWidgetItem,
-    QCheckBox, QPushButton, QHBoxLayout, QLabel
+    QWidget, QVBoxLayout, QListView, QLineEdit,
+    QPushButton, QHBoxLayout, QLabel
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, pyqtSignal, QSortFilterProxyModel
+
+from .word_list_model import WordListModel
 
 class WordSelector(QWidget):
     """Widget for selecting words from a list with checkboxes"""
-    
-    words_selected = pyqtSignal(list)  # Signal emitted when selection changes
-    
+
+    words_selected = pyqtSignal(list)  # Full selection, emitted once per coalesced change
+    selection_diff = pyqtSignal(list, list)  # Words added and removed since the last emission
+
     def __init__(self, words: list[str], parent=None):
         super().__init__(parent)
         self.words = sorted(words)
         self.init_ui()
-        
+
     def init_ui(self):
         """Initialize the UI"""
         layout = QVBoxLayout(self)
         layout.setSpacing(10)
-        
+
         # Header with word count
-        header = QLabel(f"Total words: {len(self.words)}")
-        header.setStyleSheet("color: #666; font-size: 12px;")
-        layout.addWidget(header)
-        
-        # Word list with checkboxes
-        self.list_widget = QListWidget()
-        self.list_widget.setStyleSheet("""
-            QListWidget {
+        self.header = QLabel()
+        self.header.setStyleSheet("color: #666; font-size: 12px;")
+        layout.addWidget(self.header)
+
+        # Filter box
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter words...")
+        self.filter_edit.setClearButtonEnabled(True)
+        layout.addWidget(self.filter_edit)
+
+        # Word list with checkboxes, only visible rows are ever painted
+        self.model = WordListModel(self.words, self)
+        self.model.selection_changed.connect(self.on_selection_changed)
+
+        self.proxy_model = QSortFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+
+        self.list_view = QListView()
+        self.list_view.setModel(self.proxy_model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setStyleSheet("""
+            QListView {
                 border: 1px solid #ddd;
                 border-radius: 4px;
                 padding: 5px;
             }
-            QListWidget::item {
+            QListView::item {
                 padding: 5px;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: #E3F2FD;
             }
         """)
-        
-        for word in self.words:
-            item = QListWidgetItem()
-            self.list_widget.addItem(item)
-            
-            checkbox = QCheckBox(word)
-            checkbox.setChecked(True)
-            checkbox.stateChanged.connect(self.on_selection_changed)
-            
-            self.list_widget.setItemWidget(item, checkbox)
-            
-        layout.addWidget(self.list_widget)
-        
+        layout.addWidget(self.list_view)
+
         # Control buttons
         btn_layout = QHBoxLayout()
         select_all = QPushButton("Select All")
         deselect_all = QPushButton("Deselect All")
-        
+
         for btn in (select_all, deselect_all):
             btn.setStyleSheet("""
                 QPushButton {
@@ -70,40 +78,53 @@ class WordSelector(QWidget):
                     background-color: #1976D2;
                 }
             """)
-            
+
         select_all.clicked.connect(self.select_all)
         deselect_all.clicked.connect(self.deselect_all)
-        
+
         btn_layout.addWidget(select_all)
         btn_layout.addWidget(deselect_all)
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
-        
+
+        self.update_header()
+
     def select_all(self):
         """Select all words"""
         self._set_all_checked(True)
-        
+
     def deselect_all(self):
         """Deselect all words"""
         self._set_all_checked(False)
-        
+
     def _set_all_checked(self, checked: bool):
-        """Set all checkboxes to checked/unchecked state"""
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            checkbox = self.list_widget.itemWidget(item)
-            checkbox.setChecked(checked)
-            
+        """Set all words to checked/unchecked state"""
+        with self.model.batch_update():
+            self.model.set_all_checked(checked)
+
+    def set_words_checked(self, words: list[str], checked: bool):
+        """Set several words to checked/unchecked state"""
+        with self.model.batch_update():
+            self.model.set_words_checked(words, checked)
+
     def get_selected_words(self) -> list[str]:
         """Get list of selected words"""
-        selected = []
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            checkbox = self.list_widget.itemWidget(item)
-            if checkbox.isChecked():
-                selected.append(checkbox.text())
-        return selected
-        
-    def on_selection_changed(self):
-        """Handle selection change"""
-        self.words_selected.emit(self.get_selected_words())
+        return self.model.selected_words()
+
+    def selected_count(self) -> int:
+        """Get the number of selected words"""
+        return self.model.selected_count()
+
+    def update_header(self):
+        """Show total and selected word counts"""
+        self.header.setText(
+            f"Total words: {len(self.words)} (selected: {self.model.selected_count()})"
+        )
+
+    def on_selection_changed(self, added: list[str], removed: list[str]):
+        """Handle a coalesced selection change"""
+        self.update_header()
+        self.selection_diff.emit(added, removed)
+        # Building the full list is O(n), skip it when nobody listens
+        if self.receivers(self.words_selected) > 0:
+            self.words_selected.emit(self.get_selected_words())
@@ -1,66 +1,167 @@
-import os
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
-from typing import Optional
+import queue
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List, Optional
+
+LOGGER_NAME = 'VocabMaster'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+# Records from the ring buffer written to the log when an error is reported
+ERROR_CONTEXT_RECORDS = 50
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get the child of the VocabMaster logger for a module, e.g. get_logger(__name__)"""
+    # Drop the add-on package prefix so names look the same wherever Anki installs it
+    if '.src.' in name:
+        name = name.rsplit('.src.', 1)[1]
+    elif name.startswith('src.'):
+        name = name[len('src.'):]
+    return logging.getLogger(f"{LOGGER_NAME}.{name}")
+
+
+class RingBufferHandler(logging.Handler):
+    """Keeps the last records in memory so they can be dumped without reading the log file"""
+
+    def __init__(self, capacity: int = 500):
+        super().__init__()
+        self.records = deque(maxlen=capacity)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+    def dump(self, count: Optional[int] = None) -> List[str]:
+        """Format the last count records, or all kept ones, oldest first"""
+        records = list(self.records)
+        if count is not None:
+            records = records[-count:] if count > 0 else []
+        return [self.format(record) for record in records]
+
+
+_configure_lock = threading.Lock()
+_listener: Optional[QueueListener] = None
+_ring_buffer: Optional[RingBufferHandler] = None
+
+
+def configure_logging(log_file: str, level: int = logging.INFO,
+                      ring_capacity: int = 500) -> None:
+    """Set up the VocabMaster logger once; later calls do nothing.
+
+    Callers only put records on a queue and into the in-memory ring buffer.
+    A listener thread does the rotating file and console writes. The ring
+    buffer also keeps DEBUG records, which reach the file only through
+    log_error_context().
+    """
+    global _listener, _ring_buffer
+    with _configure_lock:
+        if _listener is not None:
+            return
+
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(min(level, logging.DEBUG))
+        # Records are handled here, Anki's root handlers would duplicate them
+        logger.propagate = False
+        formatter = logging.Formatter(LOG_FORMAT)
 
-class Logger:
-    """Centralized logging configuration for VocabMaster"""
-    
-    _instance: Optional['Logger'] = None
-    
-    def __init__(self, log_file: str):
-        if Logger._instance is not None:
-            raise RuntimeError("Logger is a singleton. Use Logger.get_instance() instead.")
-            
-        self.logger = logging.getLogger('VocabMaster')
-        self.logger.setLevel(logging.INFO)
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        # Create rotating file handler
         file_handler = RotatingFileHandler(
             log_file,
             maxBytes=1024 * 1024,  # 1MB
-            backupCount=3
+            backupCount=3,
+            encoding='utf-8'
         )
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
-        
-        # Create console handler
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
-        
-        Logger._instance = self
+
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(
+            log_queue, file_handler, console_handler, respect_handler_level=True
+        )
+        _ring_buffer = RingBufferHandler(ring_capacity)
+        _ring_buffer.setFormatter(formatter)
+
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setLevel(level)
+        logger.addHandler(queue_handler)
+        logger.addHandler(_ring_buffer)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread"""
+    global _listener
+    with _configure_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+
+def recent_records(count: Optional[int] = None) -> List[str]:
+    """Get the last formatted records from the in-memory ring buffer"""
+    if _ring_buffer is None:
+        return []
+    return _ring_buffer.dump(count)
+
+
+def log_error_context(count: int = ERROR_CONTEXT_RECORDS) -> None:
+    """Write the last records of the ring buffer, DEBUG ones included, to the log.
+
+    Called where an error is reported, so the log file shows what led up
+    to it without every debug record being written to disk.
+    """
+    records = recent_records(count)
+    if records:
+        logging.getLogger(LOGGER_NAME).error(
+            "Last %d log records before the error:\n%s", len(records), '\n'.join(records))
+
+
+class Logger:
+    """Centralized logging configuration for VocabMaster"""
+
+    _instance: Optional['Logger'] = None
+    _lock = threading.Lock()
+
+    def __init__(self, log_file: str):
+        configure_logging(log_file)
+        self.log_file = log_file
+        self.logger = logging.getLogger(LOGGER_NAME)
 
     @classmethod
     def get_instance(cls, log_file: Optional[str] = None) -> 'Logger':
         """Get or create Logger instance"""
-        if cls._instance is None:
-            if log_file is None:
-                raise ValueError("log_file is required when creating new Logger instance")
-            cls(log_file)
-        return cls._instance
+        with cls._lock:
+            if cls._instance is None:
+                if log_file is None:
+                    raise ValueError("log_file is required when creating new Logger instance")
+                cls._instance = cls(log_file)
+            return cls._instance
 
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
 
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
 
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
 
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
+
+    def exception(self, message: str, *args):
+        """Log exception with traceback, followed by the records that led up to it"""
+        self.logger.exception(message, *args)
+        log_error_context()
 
-    def exception(self, message: str):
-        """Log exception with traceback"""
-        self.logger.exception(message)
+    def dump_recent(self, count: Optional[int] = None) -> str:
+        """Get the last log records as text, without touching the log file"""
+        return '\n'.join(recent_records(count))
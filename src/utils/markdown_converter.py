@@ -0,0 +1,102 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import markdown2
+
+# Extras applied to all AI responses rendered by VocabMaster
+MARKDOWN_EXTRAS = ["fenced-code-blocks", "tables", "strike", "cuddled-lists"]
+
+
+class MarkdownConverterPool:
+    """Thread-safe pool of preconfigured markdown2 converters.
+
+    A markdown2.Markdown instance keeps per-conversion state, so one
+    instance is never used by two threads at once. Idle instances are
+    reused instead of building a new one for every conversion, and the
+    HTML of recent texts is memoized by markdown2's own text hash.
+    """
+
+    def __init__(self, extras: Optional[List[str]] = None, cache_size: int = 256):
+        self.extras = list(MARKDOWN_EXTRAS if extras is None else extras)
+        self.cache_size = cache_size
+        self._idle: List[markdown2.Markdown] = []
+        self._cache: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _acquire(self) -> markdown2.Markdown:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return markdown2.Markdown(extras=self.extras)
+
+    def _release(self, converter: markdown2.Markdown) -> None:
+        with self._lock:
+            self._idle.append(converter)
+
+    def _convert(self, text: str) -> str:
+        converter = self._acquire()
+        try:
+            return str(converter.convert(text))
+        finally:
+            self._release(converter)
+
+    def convert(self, text: str, cache: bool = True) -> str:
+        """Convert markdown to HTML, reusing the result of an earlier identical text.
+
+        Pass cache=False for text that is unlikely to be seen again, such as
+        a partial streamed response, to keep it out of the cache.
+        """
+        if not cache:
+            return self._convert(text)
+
+        key = markdown2._hash_text(text)
+        with self._lock:
+            html = self._cache.get(key)
+            if html is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = self._convert(text)
+        with self._lock:
+            self._cache[key] = html
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return html
+
+    def clear_cache(self) -> None:
+        """Forget memoized results"""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Get pool and cache counters"""
+        with self._lock:
+            return {
+                'idle_converters': len(self._idle),
+                'cached': len(self._cache),
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+_converter_pool: Optional[MarkdownConverterPool] = None
+_converter_pool_lock = threading.Lock()
+
+
+def get_markdown_converter() -> MarkdownConverterPool:
+    """Get the shared converter pool"""
+    global _converter_pool
+    with _converter_pool_lock:
+        if _converter_pool is None:
+            _converter_pool = MarkdownConverterPool()
+        return _converter_pool
+
+
+def markdown_to_html(text: str, cache: bool = True) -> str:
+    """Convert markdown to HTML with the shared converter pool"""
+    return get_markdown_converter().convert(text, cache)
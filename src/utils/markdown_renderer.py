@@ -0,0 +1,111 @@
+import re
+
+from PyQt6.QtGui import QTextBlockFormat, QTextCursor, QTextDocument
+from PyQt6.QtWidgets import QTextEdit
+
+from .markdown_converter import markdown_to_html
+
+DEFAULT_STYLE = "font-family: Georgia, serif; font-size: 16px;"
+
+_FENCE_RE = re.compile(r'^\s*(```|~~~)', re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r'\n[ \t]*\n+')
+# Lines that continue the previous block even after a blank line
+_CONTINUATION_RE = re.compile(r'[ \t]|([-*+]|\d+[.)])[ \t]')
+
+
+def _first_block_format(html: str) -> QTextBlockFormat:
+    """Get the block format the given HTML starts with, without list membership"""
+    if not html:
+        return QTextBlockFormat()
+    document = QTextDocument()
+    document.setHtml(html)
+    block_format = document.begin().blockFormat()
+    # The index refers to a list object of the scratch document
+    block_format.setObjectIndex(-1)
+    return block_format
+
+
+class IncrementalMarkdownRenderer:
+    """Renders streamed markdown into a QTextEdit without re-rendering finished blocks.
+
+    Text is split at blank lines into blocks. Blocks that can no longer
+    change are converted once and appended to the document; only the
+    trailing open block is re-converted and replaced as chunks arrive.
+    A blank line does not end a block inside a code fence or when the next
+    line continues a list or indented block, so numbered lists stay intact.
+    """
+
+    def __init__(self, text_edit: QTextEdit, style: str = DEFAULT_STYLE):
+        self.text_edit = text_edit
+        self.style = style
+        self.reset()
+
+    def reset(self):
+        """Clear the document and forget streamed text"""
+        self._text = ""
+        self._committed = 0  # End of finished blocks in _text
+        self._tail_start = 0  # Document position where the open block's HTML starts
+        self.text_edit.clear()
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def _to_html(self, markdown_text: str, cache: bool = True) -> str:
+        return f"<div style='{self.style}'>{markdown_to_html(markdown_text, cache)}</div>"
+
+    def _find_block_end(self) -> int:
+        """Get the end of the last finished block in the uncommitted text"""
+        pending = self._text[self._committed:]
+        end = 0
+        for match in _BLANK_LINES_RE.finditer(pending):
+            following = pending[match.end():]
+            if not following:
+                # The next block has not started, it may still continue this one
+                break
+            if len(_FENCE_RE.findall(pending, 0, match.start())) % 2:
+                continue
+            if _CONTINUATION_RE.match(following):
+                continue
+            end = match.end()
+        return self._committed + end
+
+    def _replace_tail(self, html: str):
+        """Replace the open block's HTML at the end of the document"""
+        cursor = QTextCursor(self.text_edit.document())
+        cursor.setPosition(self._tail_start)
+        cursor.movePosition(QTextCursor.MoveOperation.End, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        # Inserted HTML keeps the format of the block it starts in, which is
+        # left over from the replaced HTML or the finished block before it
+        cursor.setBlockFormat(_first_block_format(html))
+        if html:
+            cursor.insertHtml(html)
+
+    def append(self, chunk: str):
+        """Add a streamed chunk and update the document"""
+        if not chunk:
+            return
+        self._text += chunk
+        block_end = self._find_block_end()
+        if block_end > self._committed:
+            finished = self._text[self._committed:block_end]
+            self._replace_tail(self._to_html(finished))
+            cursor = QTextCursor(self.text_edit.document())
+            cursor.movePosition(QTextCursor.MoveOperation.End)
+            cursor.insertBlock()
+            self._tail_start = cursor.position()
+            self._committed = block_end
+
+        tail = self._text[self._committed:]
+        # The open block changes with every chunk, caching it would only evict useful entries
+        self._replace_tail(self._to_html(tail, cache=False) if tail.strip() else "")
+
+    def finish(self, text: str):
+        """Show the complete text, rendering it fully only if it differs from the stream"""
+        if text.strip() == self._text.strip():
+            return
+        self._text = text
+        self._committed = len(text)
+        self.text_edit.setHtml(self._to_html(text))
+        self._tail_start = QTextCursor(self.text_edit.document()).position()
@@ -0,0 +1,12 @@
+import os
+
+
+def get_user_files_dir(config_path: str) -> str:
+    """Get the add-on's user_files directory next to config.json, creating it if needed.
+
+    Anki keeps user_files when an add-on is updated, so caches and logs
+    stored there survive upgrades.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(config_path)), 'user_files')
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -1,42 +1,98 @@
-from PyQt6.QtCore import QThread, pyqtSignal
-from ..api.api_handler import APIHandler, RateLimitError, APIError
+from typing import Optional
 
-class AIWorker(QThread):
-    """Worker thread for handling AI API requests"""
+from PyQt6.QtCore import QObject, pyqtSignal
+from ..api.api_handler import get_api_handler, RateLimitError, APIError
+from ..api.async_handler import get_async_engine, get_async_handler
+from ..api.cancel import CancelToken
+from ..api.scheduler import DEFAULT_PRIORITIES, Priority
+from .logger import get_logger, log_error_context
+from .worker_pool import get_worker_pool
+
+logger = get_logger(__name__)
+
+class AIWorker(QObject):
+    """Handles one AI API request on the shared worker pool"""
     finished = pyqtSignal(str)
     error = pyqtSignal(str)
     rate_limit = pyqtSignal(str, int)
     result_ready = pyqtSignal(str)  # Signal for streaming results
+    progress = pyqtSignal(str, int, int)  # word, done, total of a batch
+    batch_finished = pyqtSignal(dict)
 
-    def __init__(self, action: str, params: dict, config_path: str):
+    def __init__(self, action: str, params: dict, config_path: str,
+                 priority: Optional[Priority] = None):
         super().__init__()
         self.action = action
         self.params = params
         self.config_path = config_path
+        self.priority = DEFAULT_PRIORITIES.get(action, Priority.NORMAL) if priority is None else priority
         self.api_handler = None
         self._is_running = True
+        self._cancel_token = CancelToken()
+        self._task = None
+
+    def start(self):
+        """Queue the request on the worker pool"""
+        pool = get_worker_pool()
+        try:
+            pool.configure(get_api_handler(self.config_path).config['max_worker_threads'])
+        except Exception:
+            # run() reports the configuration error
+            pass
+        self._task = pool.submit(self.run, self.priority)
+
+    def isRunning(self) -> bool:
+        """Check if the request is queued or running"""
+        return self._task is not None and not self._task.done
 
     def run(self):
-        """Execute the API request in a separate thread"""
+        """Execute the API request on a pool thread"""
         try:
-            self.api_handler = APIHandler(self.config_path)
+            self.api_handler = get_api_handler(self.config_path)
             
             if not self._is_running:
                 return
                 
             result = None
             if self.action == "generate_article":
-                result =self.api_handler.generate_article(self.params["words"])
+                result = self.api_handler.generate_article(
+                    self.params["words"],
+                    on_chunk=self._emit_chunk,
+                    priority=self.priority,
+                    cancel_token=self._cancel_token
+                )
             elif self.action == "evaluate_sentence":
                 result = self.api_handler.evaluate_sentence(
                     self.params["sentence"],
-                    self.params["target_word"]
+                    self.params["target_word"],
+                    on_chunk=self._emit_chunk,
+                    force_refresh=self.params.get("force_refresh", False),
+                    priority=self.priority,
+                    cancel_token=self._cancel_token
                 )
             elif self.action == "generate_examples":
                 result = self.api_handler.generate_examples(
                     self.params["word"],
-                    self.params.get("count", 3)
+                    self.params.get("count", 3),
+                    on_chunk=self._emit_chunk,
+                    force_refresh=self.params.get("force_refresh", False),
+                    priority=self.priority,
+                    cancel_token=self._cancel_token
+                )
+            elif self.action == "generate_examples_batch":
+                async_handler = get_async_handler(self.config_path)
+                batch = async_handler.generate_examples_batch(
+                    self.params["words"],
+                    self.params.get("count", 3),
+                    on_progress=self._emit_progress,
+                    force_refresh=self.params.get("force_refresh", False),
+                    cancel_token=self._cancel_token
                 )
+                future = get_async_engine().submit(batch)
+                self._cancel_token.on_cancel(future.cancel)
+                results = future.result()
+                if self._is_running:
+                    self.batch_finished.emit(results)
             else:
                 raise ValueError(f"Unknown action: {self.action}")
                 
@@ -47,13 +103,33 @@ class AIWorker(QThread):
             if not self._is_running:
                 return
                 
-            if isinstance(e, RateLimitError):
+            logger.warning("%s request failed: %s", self.action, e, exc_info=not isinstance(e, APIError))
+            log_error_context()
+            if isinstance(e, RateLimitError) and e.retry_after is not None:
                 self.rate_limit.emit(str(e), e.retry_after)
-            elif isinstance(e, APIError):
+            elif isinstance(e, (APIError, RateLimitError)):
                 self.error.emit(f"API Error: {str(e)}")
             else:
                 self.error.emit(f"Error: {str(e)}")
                 
+    def _emit_chunk(self, chunk: str):
+        """Forward a streamed text chunk to the UI thread"""
+        if self._is_running:
+            self.result_ready.emit(chunk)
+
+    def _emit_progress(self, word: str, done: int, total: int):
+        """Forward batch progress to the UI thread"""
+        if self._is_running:
+            self.progress.emit(word, done, total)
+
     def stop(self):
-        """Stop the worker thread"""
+        """Cancel the request without waiting for it to finish.
+
+        A request still waiting in the pool queue is removed from it. No
+        signal is emitted after stop() returns, though ones already queued
+        for the receiver's thread may still be delivered.
+        """
         self._is_running = False
+        self._cancel_token.cancel()
+        if self._task is not None:
+            get_worker_pool().cancel(self._task)
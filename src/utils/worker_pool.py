@@ -0,0 +1,141 @@
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from PyQt6.QtCore import QRunnable, QThreadPool
+
+from ..api.scheduler import Priority
+
+DEFAULT_MAX_THREADS = 4
+# Idle threads are kept this long for reuse before they exit
+THREAD_EXPIRY_MS = 60000
+
+
+class PoolTask(QRunnable):
+    """A callable queued on a WorkerPool"""
+
+    def __init__(self, pool: 'WorkerPool', fn: Callable[[], None]):
+        super().__init__()
+        # The pool keeps the Python reference, Qt must not delete the C++
+        # object while cancel() may still look it up
+        self.setAutoDelete(False)
+        self.pool = pool
+        self.fn = fn
+        self.queued_at = time.monotonic()
+        self.started_at: Optional[float] = None
+        self.done = False
+
+    def run(self):
+        self.pool._task_started(self)
+        try:
+            self.fn()
+        finally:
+            self.pool._task_finished(self)
+
+
+class WorkerPool:
+    """Bounded pool of reusable threads running AI requests.
+
+    Tasks wait in the QThreadPool queue, which starts higher priorities
+    first and is FIFO within a priority. Priorities use the request
+    scheduler's Priority values, so INTERACTIVE work overtakes queued
+    BACKGROUND work.
+    """
+
+    def __init__(self, max_threads: int = DEFAULT_MAX_THREADS):
+        self._pool = QThreadPool()
+        self._pool.setMaxThreadCount(max_threads)
+        self._pool.setExpiryTimeout(THREAD_EXPIRY_MS)
+        self._lock = threading.Lock()
+        # Queued and running tasks, also keeps them alive until they finish
+        self._tasks: Dict[int, PoolTask] = {}
+        self._queued = 0
+        self._submitted = 0
+        self._completed = 0
+        self._cancelled = 0
+        self._total_queue_wait = 0.0
+        self._busy_time = 0.0
+        self._created = time.monotonic()
+
+    @property
+    def max_threads(self) -> int:
+        return self._pool.maxThreadCount()
+
+    def configure(self, max_threads: int) -> None:
+        """Update the maximum number of concurrent threads"""
+        if max_threads != self._pool.maxThreadCount():
+            self._pool.setMaxThreadCount(max_threads)
+
+    def submit(self, fn: Callable[[], None], priority: int = Priority.NORMAL) -> PoolTask:
+        """Queue fn to run on a pool thread"""
+        task = PoolTask(self, fn)
+        with self._lock:
+            self._tasks[id(task)] = task
+            self._queued += 1
+            self._submitted += 1
+        # QThreadPool starts higher values first, Priority starts lower ones first
+        self._pool.start(task, int(Priority.BACKGROUND) - int(priority))
+        return task
+
+    def cancel(self, task: PoolTask) -> bool:
+        """Remove a task that has not started yet, returning whether it was removed"""
+        with self._lock:
+            if task.done:
+                return False
+        if not self._pool.tryTake(task):
+            return False
+        with self._lock:
+            self._tasks.pop(id(task), None)
+            self._queued -= 1
+            self._cancelled += 1
+        task.done = True
+        return True
+
+    def _task_started(self, task: PoolTask) -> None:
+        task.started_at = time.monotonic()
+        with self._lock:
+            self._queued -= 1
+            self._total_queue_wait += task.started_at - task.queued_at
+
+    def _task_finished(self, task: PoolTask) -> None:
+        with self._lock:
+            task.done = True
+            self._tasks.pop(id(task), None)
+            self._completed += 1
+            self._busy_time += time.monotonic() - task.started_at
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        """Wait for all tasks to finish, returning False on timeout"""
+        return self._pool.waitForDone(msecs)
+
+    def stats(self) -> Dict[str, float]:
+        """Get queue length and thread utilization metrics"""
+        with self._lock:
+            active = self._pool.activeThreadCount()
+            started = self._submitted - self._queued - self._cancelled
+            elapsed = time.monotonic() - self._created
+            return {
+                'queued': self._queued,
+                'active': active,
+                'max_threads': self.max_threads,
+                'utilization': active / self.max_threads if self.max_threads else 0.0,
+                'avg_utilization': self._busy_time / (elapsed * self.max_threads)
+                if elapsed and self.max_threads else 0.0,
+                'submitted': self._submitted,
+                'completed': self._completed,
+                'cancelled': self._cancelled,
+                'avg_queue_wait': self._total_queue_wait / started if started else 0.0
+            }
+
+
+_worker_pool: Optional[WorkerPool] = None
+_worker_pool_lock = threading.Lock()
+
+
+def get_worker_pool() -> WorkerPool:
+    """Get the process-wide worker pool"""
+    global _worker_pool
+    with _worker_pool_lock:
+        if _worker_pool is None:
+            _worker_pool = WorkerPool()
+        return _worker_pool
@@ -0,0 +1,57 @@
+import os
+import sys
+import timeit
+
+# Add parent and libs directories to Python path
+addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(addon_dir)
+sys.path.append(os.path.join(addon_dir, 'libs'))
+import markdown2
+from src.utils.markdown_converter import MARKDOWN_EXTRAS, MarkdownConverterPool
+
+SAMPLE_FEEDBACK = """## Evaluation
+
+Your sentence uses **resilient** correctly, but the tense is inconsistent.
+
+1. *Grammar*: "she was resilient and recover quickly" should be "recovered".
+2. *Word usage*: correct, the word describes her ability to recover.
+3. *Naturalness*: consider "She proved resilient and recovered quickly."
+
+| Aspect | Score |
+|--------|-------|
+| Grammar | 7/10 |
+| Usage | 9/10 |
+
+```
+She proved resilient and recovered quickly.
+```
+"""
+
+
+def bench(number: int = 2000):
+    """Compare markdown2.markdown() with the shared converter pool"""
+    pool = MarkdownConverterPool()
+
+    def fresh_instance():
+        markdown2.markdown(SAMPLE_FEEDBACK, extras=MARKDOWN_EXTRAS)
+
+    def pooled_uncached():
+        pool.convert(SAMPLE_FEEDBACK, cache=False)
+
+    def pooled_cached():
+        pool.convert(SAMPLE_FEEDBACK)
+
+    results = {}
+    for name, func in (("markdown2.markdown()", fresh_instance),
+                       ("pool, no cache", pooled_uncached),
+                       ("pool, cached", pooled_cached)):
+        func()  # Warm up regex caches
+        results[name] = min(timeit.repeat(func, number=number, repeat=3)) / number
+
+    baseline = results["markdown2.markdown()"]
+    for name, seconds in results.items():
+        print(f"{name:<22} {seconds * 1e6:9.1f} us/call  {baseline / seconds:6.1f}x")
+
+
+if __name__ == "__main__":
+    bench()
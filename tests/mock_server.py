@@ -0,0 +1,132 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+class MockResponse:
+    """How the mock server answers requests to one path"""
+
+    def __init__(self, chunks: Optional[List[str]] = None, status: int = 200,
+                 delay: float = 0.0, chunk_delay: float = 0.0,
+                 headers: Optional[Dict[str, str]] = None, body: str = ''):
+        self.chunks = ['Hel', 'lo'] if chunks is None else chunks
+        self.status = status
+        self.delay = delay  # before the response headers
+        self.chunk_delay = chunk_delay  # before each streamed chunk
+        self.headers = headers or {}
+        self.body = body  # error body for non-200 statuses
+
+
+class MockChatServer:
+    """Local OpenAI-compatible chat completions server for provider tests.
+
+    ChatGLM uses the same request and SSE formats, so one server serves
+    both providers. Requests are answered per path with respond(), the
+    others get the default MockResponse.
+    """
+
+    def __init__(self):
+        self.requests: List[Dict] = []
+        self._responses: Dict[str, MockResponse] = {}
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def respond(self, path: str, response: MockResponse) -> None:
+        self._responses[path] = response
+
+    def start(self) -> 'MockChatServer':
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'MockChatServer':
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                server.requests.append({'path': self.path, 'headers': dict(self.headers), 'body': body})
+                path = self.path.split('/chat/completions')[0]
+                response = server._responses.get(path, MockResponse())
+                time.sleep(response.delay)
+                try:
+                    if response.status != 200:
+                        self._send(response.status, response.body.encode(), response.headers)
+                    elif body.get('stream'):
+                        self._stream(response)
+                    else:
+                        self._send(200, json.dumps(self._completion(''.join(response.chunks))).encode())
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client closed a cancelled request
+                    pass
+
+            def _send(self, status: int, data: bytes, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _stream(self, response: MockResponse):
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/event-stream')
+                self.send_header('Transfer-Encoding', 'chunked')
+                self.end_headers()
+                self.wfile.flush()
+                events = [self._chunk({'content': text}) for text in response.chunks]
+                events.append(dict(self._chunk(None), choices=[], usage=self._usage()))
+                for event in events:
+                    time.sleep(response.chunk_delay)
+                    self._write_chunk(f"data: {json.dumps(event)}\n\n")
+                self._write_chunk("data: [DONE]\n\n")
+                self.wfile.write(b'0\r\n\r\n')
+
+            def _write_chunk(self, text: str):
+                data = text.encode()
+                self.wfile.write(b'%x\r\n' % len(data) + data + b'\r\n')
+                self.wfile.flush()
+
+            @staticmethod
+            def _usage() -> Dict:
+                return {'prompt_tokens': 5, 'completion_tokens': 2, 'total_tokens': 7}
+
+            @staticmethod
+            def _chunk(delta: Optional[Dict]) -> Dict:
+                return {
+                    'id': '1', 'object': 'chat.completion.chunk', 'created': 0, 'model': 'mock',
+                    'choices': [{'index': 0, 'delta': delta}] if delta else []
+                }
+
+            def _completion(self, text: str) -> Dict:
+                return {
+                    'id': '1', 'object': 'chat.completion', 'created': 0, 'model': 'mock',
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': text},
+                                 'finish_reason': 'stop'}],
+                    'usage': self._usage()
+                }
+
+        return Handler
@@ -0,0 +1,220 @@
+import json
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to Python path
+addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(addon_dir)
+sys.path.append(os.path.join(addon_dir, 'libs'))
+from src.api.api_handler import APIHandler, clear_api_handlers, get_api_handler
+from src.api.cancel import CancelToken, RequestCancelled
+from src.api.errors import APIError
+
+from mock_server import MockChatServer, MockResponse
+
+
+@pytest.fixture
+def server():
+    with MockChatServer() as server:
+        yield server
+
+
+def make_handler(tmp_path, server, path='', **overrides):
+    config = {
+        'api_provider': 'ChatGLM',
+        'chatglm_api_key': 'test-id.' + 's' * 32,
+        'chatglm_endpoint': f"{server.url}{path}/chat/completions",
+        'max_retries': 2,
+        'retry_delay': 0.01,
+        'timeout': 10,
+        'cache_enabled': False
+    }
+    config.update(overrides)
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps(config))
+    return APIHandler(str(config_path))
+
+
+@pytest.fixture
+def shared_handlers():
+    yield
+    clear_api_handlers()
+
+
+def cancel_after(token: CancelToken, seconds: float) -> None:
+    timer = threading.Timer(seconds, token.cancel)
+    timer.daemon = True
+    timer.start()
+
+
+@pytest.mark.parametrize('stream', [True, False])
+def test_cancel_before_response_raises(tmp_path, server, stream):
+    """A request cancelled while waiting for the response never ends as a success"""
+    server.respond('/slow', MockResponse(chunks=['a b c'], delay=0.5))
+    handler = make_handler(tmp_path, server, '/slow', stream_responses=stream)
+    token = CancelToken()
+    cancel_after(token, 0.1)
+    chunks = []
+    try:
+        with pytest.raises(RequestCancelled):
+            handler.evaluate_sentence('I am resilient.', 'resilient',
+                                      on_chunk=chunks.append, cancel_token=token)
+        assert handler.route_stats() == {}
+        assert handler.metrics_summary()['evaluate_sentence']['cancelled'] == 1
+    finally:
+        handler.close()
+
+
+def test_request_succeeds(tmp_path, server):
+    handler = make_handler(tmp_path, server)
+    chunks = []
+    try:
+        assert handler.evaluate_sentence('I am resilient.', 'resilient',
+                                         on_chunk=chunks.append) == 'Hello'
+        assert chunks == ['Hel', 'lo']
+        assert server.requests[0]['headers']['Authorization'].startswith('Bearer ')
+        summary = handler.metrics_summary()['evaluate_sentence']
+        assert summary['total_tokens'] == 7
+        assert summary['retries'] == 0
+    finally:
+        handler.close()
+
+
+def test_lost_hedge_degrades_primary(tmp_path, server):
+    """A primary that keeps losing to the backup is moved down, not hedged forever"""
+    server.respond('/hang', MockResponse(delay=1.0))
+    handler = make_handler(
+        tmp_path, server, '/hang',
+        local_base_url=server.url,
+        routes={'evaluate_sentence': [['ChatGLM', 'glm-4'], ['Local', 'mock']]},
+        route_min_samples=2,
+        hedge_enabled=True,
+        hedge_default_delay=0.1
+    )
+    primary, backup = handler.router.configured_routes('evaluate_sentence')
+    # Import the SDK up front so the backup's first request is not slowed by it
+    import openai
+    try:
+        for _ in range(2):
+            assert handler.evaluate_sentence('I am resilient.', 'resilient',
+                                             on_chunk=lambda chunk: None) == 'Hello'
+        # Let the cancelled primaries' late responses arrive
+        time.sleep(1.2)
+
+        stats = handler.route_stats()[f"evaluate_sentence {primary.provider}/{primary.model}"]
+        assert stats['requests'] == 2
+        assert stats['error_rate'] == 1.0
+        assert stats['degraded']
+        assert handler.router.routes_for('evaluate_sentence') == [backup, primary]
+
+        hedged = handler.metrics_summary()['evaluate_sentence']['hedged']
+        handler.evaluate_sentence('I am resilient.', 'resilient', on_chunk=lambda chunk: None)
+        assert handler.metrics_summary()['evaluate_sentence']['hedged'] == hedged
+    finally:
+        handler.close()
+
+
+def test_retries_count_only_repeated_attempts(tmp_path, server):
+    server.respond('/fail', MockResponse(status=500, body='{"error": "boom"}'))
+    handler = make_handler(tmp_path, server, '/fail', max_retries=3, stream_responses=False)
+    try:
+        with pytest.raises(APIError):
+            handler.evaluate_sentence('I am resilient.', 'resilient')
+        assert len(server.requests) == 3
+        summary = handler.metrics_summary()['evaluate_sentence']
+        assert summary['errors'] == 1
+        assert summary['retries'] == 2
+    finally:
+        handler.close()
+
+
+def test_connection_test_skips_the_cache(tmp_path, server):
+    """A rejected key fails the connection test even after a cached success"""
+    handler = make_handler(tmp_path, server, '/key', cache_enabled=True)
+    try:
+        assert handler.generate_examples('test', count=1) == 'Hello'
+        assert handler.test_connection()
+
+        server.respond('/key', MockResponse(status=401, body='{"error": "invalid api key"}'))
+        sent = len(server.requests)
+        assert handler.generate_examples('test', count=1) == 'Hello'
+        assert len(server.requests) == sent
+        with pytest.raises(APIError):
+            handler.test_connection()
+        assert len(server.requests) > sent
+    finally:
+        handler.close()
+
+
+def test_lost_hedge_frees_its_thread(tmp_path, server):
+    """A cancelled primary still waiting for headers does not hold a hedge thread"""
+    server.respond('/hang', MockResponse(delay=5.0))
+    handler = make_handler(
+        tmp_path, server, '/hang',
+        local_base_url=server.url,
+        routes={'evaluate_sentence': [['ChatGLM', 'glm-4'], ['Local', 'mock']]},
+        route_min_samples=10,
+        hedge_enabled=True,
+        hedge_default_delay=0.1,
+        max_concurrent_requests=1
+    )
+    import openai
+    start = time.monotonic()
+    try:
+        # Two hedge threads only, a busy loser would block the next request's legs
+        for _ in range(3):
+            assert handler.evaluate_sentence('I am resilient.', 'resilient',
+                                             on_chunk=lambda chunk: None) == 'Hello'
+        assert time.monotonic() - start < 2.0
+    finally:
+        handler.close()
+
+
+def test_non_finite_retry_after_backs_off(tmp_path, server):
+    server.respond('/inf', MockResponse(status=429, headers={'Retry-After': 'inf'}))
+    handler = make_handler(tmp_path, server, '/inf', stream_responses=False)
+    start = time.monotonic()
+    try:
+        with pytest.raises(APIError):
+            handler.evaluate_sentence('I am resilient.', 'resilient')
+        assert len(server.requests) == 2
+        assert time.monotonic() - start < 2.0
+    finally:
+        handler.close()
+
+
+def test_shared_handler_reloads_only_on_content_change(tmp_path, server, shared_handlers, monkeypatch):
+    make_handler(tmp_path, server, timeout=10).close()
+    config_path = tmp_path / 'config.json'
+    reloads = []
+    original_reload = APIHandler.reload_config
+    monkeypatch.setattr(APIHandler, 'reload_config',
+                        lambda self: (reloads.append(self), original_reload(self)))
+
+    handler = get_api_handler(str(config_path))
+    assert get_api_handler(str(config_path)) is handler
+    # Relative and absolute paths share the handler
+    monkeypatch.chdir(tmp_path)
+    assert get_api_handler('config.json') is handler
+
+    # A newer mtime with the same content keeps the loaded config
+    stat = os.stat(config_path)
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert get_api_handler(str(config_path)) is handler
+    assert reloads == []
+
+    # Same size, different content
+    config = json.loads(config_path.read_text())
+    config_path.write_text(json.dumps(dict(config, timeout=20)))
+    os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert get_api_handler(str(config_path)) is handler
+    assert reloads == [handler]
+    assert handler.config['timeout'] == 20
+
+    # The new stamp is remembered
+    assert get_api_handler(str(config_path)) is handler
+    assert reloads == [handler]
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api import scheduler
+from src.api.api_handler import APIHandler
+from src.api.async_handler import AsyncAPIHandler
+from src.api.cancel import CancelToken, RequestCancelled
+from src.api.errors import APIError
+
+
+@pytest.fixture
+def async_handler(tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({
+        'openai_api_key': 'test-key',
+        'cache_enabled': False,
+        'metrics_enabled': False,
+        'batch_max_words': 2
+    }))
+    handler = APIHandler(str(config_path))
+    yield AsyncAPIHandler(handler)
+    handler.close()
+
+
+def fake_requests(async_handler, failing):
+    """Answer requests without a server, failing the batches containing a word in failing"""
+    sent = []
+
+    async def make_api_request(action, params, on_chunk=None, force_refresh=False,
+                               priority=None, cancel_token=None):
+        sent.append((action, params.get('words') or params['word']))
+        if action == 'generate_examples_batch':
+            if failing & set(params['words']):
+                raise APIError("batch failed")
+            return json.dumps({word: [f"{word} one."] for word in params['words']})
+        if params['word'] in failing:
+            raise APIError("single failed")
+        return f"1. {params['word']} alone."
+
+    async_handler._make_api_request = make_api_request
+    return sent
+
+
+def test_failed_batch_falls_back_to_single_requests(async_handler):
+    sent = fake_requests(async_handler, failing={'c'})
+    progress = []
+
+    results = asyncio.run(async_handler.generate_examples_batch(
+        ['a', 'b', 'c', 'd'], on_progress=lambda word, done, total: progress.append(word)))
+
+    # The batch [c, d] failed, d was retried singly and c failed again
+    assert results == {'a': '1. a one.', 'b': '1. b one.', 'd': '1. d alone.'}
+    assert sorted(progress) == ['a', 'b', 'd']
+    assert ('generate_examples', 'c') in sent
+    assert ('generate_examples', 'd') in sent
+
+
+def test_batch_raises_when_nothing_succeeded(async_handler):
+    fake_requests(async_handler, failing={'a', 'b'})
+    with pytest.raises(APIError):
+        asyncio.run(async_handler.generate_examples_batch(['a', 'b']))
+
+
+def test_cancel_token_stops_requests_waiting_for_admission(async_handler, monkeypatch):
+    monkeypatch.setattr(scheduler, '_schedulers', {})
+    async_handler.api_handler._request_scheduler().pause(60)
+
+    async def cancelled_after(request, token):
+        asyncio.get_running_loop().call_later(0.1, token.cancel)
+        with pytest.raises(RequestCancelled):
+            await asyncio.wait_for(request, 1)
+
+    async def main():
+        token = CancelToken()
+        await cancelled_after(async_handler.evaluate_sentence(
+            'I am resilient.', 'resilient', cancel_token=token), token)
+        token = CancelToken()
+        await cancelled_after(async_handler.generate_article(['resilient'], cancel_token=token), token)
+
+    asyncio.run(main())
@@ -0,0 +1,46 @@
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.batch import (
+    PROMPT_OVERHEAD_TOKENS, chunk_words, estimate_word_tokens, format_examples, parse_batch_examples
+)
+
+
+def test_chunk_words_respects_word_limit():
+    words = [f"word{i}" for i in range(5)]
+    assert chunk_words(words, 3, max_tokens=100000, max_words=2) == [
+        ['word0', 'word1'], ['word2', 'word3'], ['word4']
+    ]
+
+
+def test_chunk_words_respects_token_limit():
+    cost = estimate_word_tokens('word', 3)
+    max_tokens = PROMPT_OVERHEAD_TOKENS + 2 * cost
+    assert chunk_words(['word'] * 5, 3, max_tokens, max_words=100) == [
+        ['word', 'word'], ['word', 'word'], ['word']
+    ]
+
+
+def test_chunk_words_keeps_oversized_word():
+    assert chunk_words(['big'], 100, max_tokens=10, max_words=5) == [['big']]
+    assert chunk_words([], 3, 1000, 5) == []
+
+
+def test_parse_batch_examples():
+    text = '```json\n{"Apple": ["An apple.", " "], "pear": "A pear.", "other": ["x"]}\n```'
+    assert parse_batch_examples(text, ['apple', 'pear', 'plum']) == {
+        'apple': ['An apple.'],
+        'pear': ['A pear.']
+    }
+
+
+def test_parse_batch_examples_rejects_invalid_responses():
+    assert parse_batch_examples('no json here', ['a']) == {}
+    assert parse_batch_examples('{"a": [1, }', ['a']) == {}
+    assert parse_batch_examples('{"a": {"nested": 1}}', ['a']) == {}
+
+
+def test_format_examples():
+    assert format_examples(['One.', 'Two.']) == '1. One.\n2. Two.'
@@ -0,0 +1,84 @@
+import os
+import sys
+import threading
+
+import jwt
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.providers import chatglm_auth
+from src.api.providers.chatglm_auth import ChatGLMTokenProvider, split_api_key
+
+SECRET = 's' * 32
+API_KEY = f"key-id.{SECRET}"
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(chatglm_auth.time, 'time', clock.time)
+    return clock
+
+
+def test_split_api_key():
+    assert split_api_key(API_KEY) == ('key-id', SECRET)
+    for key in ('', 'no-dot', '.secret', 'id.'):
+        with pytest.raises(ValueError):
+            split_api_key(key)
+
+
+def test_token_claims(clock):
+    token = ChatGLMTokenProvider(API_KEY, ttl=600).token()
+    claims = jwt.decode(token, SECRET, algorithms=['HS256'], options={'verify_exp': False})
+    assert claims == {'api_key': 'key-id', 'timestamp': 1000000, 'exp': 1600000}
+    assert jwt.get_unverified_header(token) == {'alg': 'HS256', 'sign_type': 'SIGN', 'typ': 'JWT'}
+
+
+def test_token_is_cached_until_refresh_margin(clock):
+    provider = ChatGLMTokenProvider(API_KEY, ttl=600)
+    token = provider.token()
+    clock.now += 600 - chatglm_auth.REFRESH_MARGIN - 1
+    assert provider.token() == token
+    clock.now += 1
+    assert provider.token() != token
+
+
+def test_short_ttl_refreshes_at_half_life(clock):
+    provider = ChatGLMTokenProvider(API_KEY, ttl=20)
+    token = provider.token()
+    clock.now += 9
+    assert provider.token() == token
+    clock.now += 1
+    assert provider.token() != token
+
+
+def test_invalidate_signs_new_token(clock):
+    provider = ChatGLMTokenProvider(API_KEY, ttl=600)
+    token = provider.token()
+    provider.invalidate()
+    clock.now += 1
+    assert provider.token() != token
+
+
+def test_threads_share_one_token(clock, monkeypatch):
+    provider = ChatGLMTokenProvider(API_KEY, ttl=600)
+    signed = []
+    sign = provider._sign
+    monkeypatch.setattr(provider, '_sign', lambda now: signed.append(now) or sign(now))
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(provider.token())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(set(tokens)) == 1
+    assert len(signed) == 1
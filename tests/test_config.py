@@ -0,0 +1,35 @@
+import json
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.api_handler import APIHandler
+from src.config.config_manager import ConfigManager
+from src.config.defaults import CONFIG_TYPES, DEFAULT_CONFIG
+
+ADDON_CONFIG = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'config.json')
+
+
+def test_defaults_have_valid_types():
+    for field, expected_type in CONFIG_TYPES.items():
+        assert isinstance(DEFAULT_CONFIG[field], expected_type), field
+
+
+def test_shipped_config_has_every_key():
+    with open(ADDON_CONFIG, encoding='utf-8') as f:
+        assert set(json.load(f)) == set(DEFAULT_CONFIG)
+
+
+def test_config_manager_saves_handler_keys(tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text(json.dumps({'openai_api_key': 'test-key'}))
+    ConfigManager(str(config_path)).save_config({'chatglm_token_ttl': 600})
+
+    saved = json.loads(config_path.read_text())
+    assert set(saved) == set(DEFAULT_CONFIG)
+    handler = APIHandler(str(config_path))
+    try:
+        assert handler.config['chatglm_token_ttl'] == 600
+    finally:
+        handler.close()
@@ -0,0 +1,102 @@
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.cancel import CancelToken, RequestCancelled
+from src.api.hedging import HedgedRequest
+
+
+@pytest.fixture
+def executor():
+    executor = ThreadPoolExecutor(max_workers=4)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+def leg_runner(delays, results=None, fail=()):
+    """Build a run_leg that streams after delays[index] unless its leg is cancelled"""
+    cancelled = []
+
+    def run_leg(index, on_chunk, cancel_token):
+        try:
+            cancel_token.sleep(delays[index])
+        except RequestCancelled:
+            cancelled.append(index)
+            raise
+        if index in fail:
+            raise ValueError(f"leg {index} failed")
+        text = (results or {}).get(index, f"leg {index}")
+        if on_chunk is not None:
+            on_chunk(text)
+        return text
+
+    return run_leg, cancelled
+
+
+def test_fast_primary_is_not_hedged(executor):
+    run_leg, cancelled = leg_runner({0: 0.0})
+    hedge = HedgedRequest(executor, run_leg)
+    assert hedge.run(hedge_delay=1.0) == 'leg 0'
+    assert not hedge.hedged
+    assert hedge.winner.index == 0
+
+
+def test_backup_wins_over_slow_primary(executor):
+    run_leg, cancelled = leg_runner({0: 5.0, 1: 0.0})
+    chunks = []
+    hedge = HedgedRequest(executor, run_leg, chunks.append)
+    start = time.monotonic()
+
+    assert hedge.run(hedge_delay=0.05) == 'leg 1'
+    assert time.monotonic() - start < 1.0
+    assert hedge.hedged
+    assert hedge.winner.index == 1
+    assert chunks == ['leg 1']
+    # The loser was cancelled
+    executor.shutdown(wait=True)
+    assert cancelled == [0]
+
+
+def test_loser_chunks_are_dropped(executor):
+    run_leg, cancelled = leg_runner({0: 0.3, 1: 0.0})
+    chunks = []
+    hedge = HedgedRequest(executor, run_leg, chunks.append)
+    hedge.run(hedge_delay=0.05)
+    time.sleep(0.4)
+    assert chunks == ['leg 1']
+
+
+def test_failed_primary_reports_error(executor):
+    run_leg, _ = leg_runner({0: 0.0}, fail={0})
+    hedge = HedgedRequest(executor, run_leg)
+    with pytest.raises(ValueError):
+        hedge.run(hedge_delay=1.0)
+
+
+def test_cancel_returns_at_once(executor):
+    run_leg, cancelled = leg_runner({0: 5.0, 1: 5.0})
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    start = time.monotonic()
+    with pytest.raises(RequestCancelled):
+        HedgedRequest(executor, run_leg, cancel_token=token).run(hedge_delay=0.05)
+    assert time.monotonic() - start < 1.0
+    executor.shutdown(wait=True)
+    assert sorted(cancelled) == [0, 1]
+
+
+def test_no_leg_starts_after_a_winner(executor):
+    run_leg, _ = leg_runner({0: 0.0, 1: 0.0})
+    hedge = HedgedRequest(executor, run_leg)
+    primary = hedge._start()
+    executor.shutdown(wait=True)
+    assert hedge.winner is primary
+    # A backup decided on before the primary claimed is never started
+    assert hedge._start() is None
+    assert len(hedge.legs) == 1
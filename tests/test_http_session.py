@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.http_session import PooledSession
+
+from mock_server import MockChatServer, MockResponse
+
+
+@pytest.fixture
+def server():
+    with MockChatServer() as server:
+        yield server
+
+
+def post(session, server, path='', stream=False):
+    return session.post(f"{server.url}{path}/chat/completions",
+                        json={'stream': stream}, timeout=10, stream=stream)
+
+
+def test_connections_are_reused(server):
+    session = PooledSession(pool_connections=1, pool_maxsize=2, idle_timeout=60)
+    try:
+        for _ in range(3):
+            assert post(session, server).status_code == 200
+        assert session.stats() == {
+            'requests': 3,
+            'connections_opened': 1,
+            'connections_reused': 2,
+            'idle_evictions': 0
+        }
+    finally:
+        session.close()
+
+
+def test_idle_session_is_evicted(server):
+    session = PooledSession(pool_connections=1, pool_maxsize=2, idle_timeout=0.05)
+    try:
+        post(session, server)
+        time.sleep(0.1)
+        post(session, server)
+        stats = session.stats()
+        assert stats['idle_evictions'] == 1
+        # Counters of the closed session are kept
+        assert stats['requests'] == 2
+        assert stats['connections_opened'] == 2
+    finally:
+        session.close()
+
+
+def test_open_stream_blocks_eviction(server):
+    server.respond('/stream', MockResponse(chunks=['a', 'b'], chunk_delay=0.1))
+    session = PooledSession(pool_connections=1, pool_maxsize=2, idle_timeout=0.05)
+    try:
+        response = post(session, server, '/stream', stream=True)
+        time.sleep(0.1)
+        # The stream still uses the session, another request must not close it
+        post(session, server)
+        assert session.stats()['idle_evictions'] == 0
+        with response:
+            assert b'[DONE]' in b''.join(response.iter_content(chunk_size=None))
+
+        time.sleep(0.1)
+        post(session, server)
+        assert session.stats()['idle_evictions'] == 1
+    finally:
+        session.close()
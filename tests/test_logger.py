@@ -0,0 +1,60 @@
+import logging
+import os
+import sys
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils import logger as logger_module
+from src.utils.logger import (
+    LOGGER_NAME, configure_logging, get_logger, log_error_context, recent_records, shutdown_logging
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / 'vocabmaster.log'
+    configure_logging(str(path))
+    yield path
+    shutdown_logging()
+    root = logging.getLogger(LOGGER_NAME)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.propagate = True
+    root.setLevel(logging.NOTSET)
+    logger_module._ring_buffer = None
+
+
+def test_debug_records_stay_in_memory(log_file):
+    log = get_logger('src.api.test_module')
+    log.debug("request details")
+    log.info("request sent")
+    assert [record.split(' - ', 1)[1] for record in recent_records()] == [
+        'VocabMaster.api.test_module - DEBUG - request details',
+        'VocabMaster.api.test_module - INFO - request sent'
+    ]
+
+    shutdown_logging()
+    text = log_file.read_text(encoding='utf-8')
+    assert 'request sent' in text
+    assert 'request details' not in text
+
+
+def test_error_context_writes_recent_records(log_file):
+    log = get_logger('src.api.test_module')
+    log.debug("request details")
+    log_error_context()
+
+    shutdown_logging()
+    lines = log_file.read_text(encoding='utf-8').splitlines()
+    assert 'ERROR - Last 1 log records before the error:' in lines[0]
+    assert lines[1].endswith('DEBUG - request details')
+
+
+def test_recent_records_count(log_file):
+    log = get_logger('src.api.test_module')
+    for i in range(5):
+        log.info("record %d", i)
+    assert [record.rsplit(' - ', 1)[1] for record in recent_records(2)] == ['record 3', 'record 4']
+    assert recent_records(0) == []
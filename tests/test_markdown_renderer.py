@@ -0,0 +1,90 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+from PyQt6.QtWidgets import QApplication, QTextEdit
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.markdown_renderer import IncrementalMarkdownRenderer
+
+TEXT = (
+    "# Title\n\nFirst paragraph with **bold** and *italic*.\n\n"
+    "1. one\n\n2. two\n\n```\ncode\n\nmore\n```\n\n- a\n- b\n\n"
+    "## Sub\n\n> quote\n\n| a | b |\n|---|---|\n| 1 | 2 |\n\nLast line."
+)
+
+
+@pytest.fixture
+def app():
+    return QApplication.instance() or QApplication([])
+
+
+def blocks(text_edit):
+    """Describe each non-empty block by its text, block format, list and character formats"""
+    described = []
+    block = text_edit.document().begin()
+    while block.isValid():
+        if block.text().strip():
+            block_format = block.blockFormat()
+            text_list = block.textList()
+            fragments = []
+            it = block.begin()
+            while not it.atEnd():
+                fragment = it.fragment()
+                char_format = fragment.charFormat()
+                if fragment.text().strip():
+                    fragments.append((fragment.text().strip(), char_format.fontWeight(),
+                                      char_format.fontItalic(), char_format.fontFixedPitch()))
+                it += 1
+            described.append((
+                block.text().rstrip(),
+                block_format.headingLevel(),
+                block_format.nonBreakableLines(),
+                block_format.topMargin(),
+                block_format.bottomMargin(),
+                text_list.format().style() if text_list else None,
+                fragments
+            ))
+        block = block.next()
+    return described
+
+
+def render_streamed(text, chunk_size):
+    text_edit = QTextEdit()
+    renderer = IncrementalMarkdownRenderer(text_edit)
+    for start in range(0, len(text), chunk_size):
+        renderer.append(text[start:start + chunk_size])
+    return text_edit, renderer
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 16])
+def test_streamed_render_matches_full_render(app, chunk_size):
+    text_edit, renderer = render_streamed(TEXT, chunk_size)
+    full = QTextEdit()
+    full.setHtml(renderer._to_html(TEXT))
+    assert blocks(text_edit) == blocks(full)
+
+
+def test_finished_blocks_are_not_rendered_again(app, monkeypatch):
+    text_edit, renderer = render_streamed("First.\n\nSecond.\n\n", 4)
+    converted = []
+    convert = renderer._to_html
+    monkeypatch.setattr(renderer, '_to_html',
+                        lambda text, cache=True: converted.append(text) or convert(text, cache))
+    renderer.append("Third")
+    renderer.append(" line")
+    # Second is finished once Third starts, First is never converted again
+    assert converted == ["Second.\n\n", "Third", "Third line"]
+
+
+def test_finish_keeps_matching_stream(app):
+    text_edit, renderer = render_streamed(TEXT, 5)
+    before = blocks(text_edit)
+    renderer.finish(TEXT + "\n")
+    assert blocks(text_edit) == before
+
+    renderer.finish("Replaced.")
+    assert [block[0] for block in blocks(text_edit)] == ["Replaced."]
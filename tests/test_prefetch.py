@@ -0,0 +1,68 @@
+import json
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api import scheduler
+from src.api.api_handler import get_api_handler
+from src.api.prefetch import ExamplePrefetcher
+
+from mock_server import MockChatServer
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def prefetcher(tmp_path, monkeypatch):
+    # A private scheduler, so the tiny RPM budget does not slow other tests
+    monkeypatch.setattr(scheduler, '_schedulers', {})
+    with MockChatServer() as server:
+        config_path = tmp_path / 'config.json'
+        config_path.write_text(json.dumps({
+            'api_provider': 'ChatGLM',
+            'chatglm_api_key': 'test-id.' + 's' * 32,
+            'chatglm_endpoint': f"{server.url}/chat/completions",
+            'prefetch_examples': True,
+            'rate_limit_rpm': 1
+        }))
+        prefetcher = ExamplePrefetcher(str(config_path))
+        prefetcher.server = server
+        yield prefetcher
+        prefetcher.cancel()
+        get_api_handler(str(config_path)).close()
+
+
+def test_cancelled_prefetch_stops_waiting_and_is_refunded(prefetcher):
+    limiter = scheduler._schedulers
+    prefetcher.prefetch(['alpha', 'beta'])
+    charged = prefetcher.tokens_used
+
+    # One request fits the budget, the other waits for admission
+    wait_until(lambda: 'ChatGLM' in limiter and limiter['ChatGLM'].stats()['queue_depth'] == 1)
+    wait_until(lambda: prefetcher.pending_words() == ['beta'])
+
+    prefetcher.prefetch(['alpha'])
+    wait_until(lambda: limiter['ChatGLM'].stats()['queue_depth'] == 0)
+    assert prefetcher.pending_words() == []
+    assert 0 < prefetcher.tokens_used < charged
+    assert len(prefetcher.server.requests) == 1
+
+
+def test_prefetch_is_opt_in(prefetcher, tmp_path):
+    config_path = tmp_path / 'config.json'
+    config = json.loads(config_path.read_text())
+    del config['prefetch_examples']
+    config_path.write_text(json.dumps(config))
+
+    prefetcher.prefetch(['alpha'])
+    assert prefetcher.pending_words() == []
+    assert prefetcher.tokens_used == 0
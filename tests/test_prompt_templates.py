@@ -0,0 +1,81 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.prompt_templates import PromptTemplate, get_templates, load_template
+
+
+def write_template(tmp_path, name, text):
+    path = tmp_path / f"{name}.txt"
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_load_template_reads_version_header(tmp_path):
+    path = write_template(tmp_path, 'greet', '# version: 3\n# owner: me\n\nSay hi to {name}.\n')
+    template = load_template(path)
+    assert template.name == 'greet'
+    assert template.version == '3'
+    assert template.fields == {'name'}
+    assert template.render(name='Ann') == 'Say hi to Ann.'
+
+
+def test_load_template_without_header_is_version_1(tmp_path):
+    template = load_template(write_template(tmp_path, 'plain', 'Just {word}'))
+    assert template.version == '1'
+    assert template.render(word='text') == 'Just text'
+
+
+def test_literal_braces_are_kept(tmp_path):
+    path = write_template(tmp_path, 'json', 'Reply as {{"{word}": [...]}} in {language}')
+    template = load_template(path)
+    assert template.fields == {'word', 'language'}
+    assert template.render(word='apple', language='English') == \
+        'Reply as {"apple": [...]} in English'
+
+
+def test_bind_fills_fields_ahead_of_render():
+    template = PromptTemplate.compile('t', 'Use {word} in {language}, {{literal}}')
+    bound = template.bind(language='French')
+    assert bound.fields == {'word'}
+    assert bound.name == 't' and bound.version == template.version
+    # Neighbouring literals are joined once bound
+    assert bound.segments == [(False, 'Use '), (True, 'word'),
+                              (False, ' in French, {literal}')]
+    assert bound.render(word='pain') == 'Use pain in French, {literal}'
+    # The original template is unchanged
+    assert template.fields == {'word', 'language'}
+
+
+def test_values_with_braces_are_inserted_verbatim():
+    template = PromptTemplate.compile('t', 'Check: {sentence}').bind(sentence='{bound}')
+    assert template.render() == 'Check: {bound}'
+    template = PromptTemplate.compile('t', 'Check: {sentence} ({word})')
+    assert template.render(sentence='a {word} b {0}', word='x') == 'Check: a {word} b {0} (x)'
+
+
+@pytest.mark.parametrize('text', ['{word!r}', '{word:>10}', '{0}', '{}', '{word.attr}', '{items[0]}'])
+def test_unsupported_fields_are_rejected(text):
+    with pytest.raises(ValueError, match='Unsupported field'):
+        PromptTemplate.compile('t', text)
+
+
+def test_missing_value_raises_value_error():
+    template = PromptTemplate.compile('t', '{word} and {count}')
+    with pytest.raises(ValueError, match="Missing value 'count'"):
+        template.render(word='x')
+
+
+def test_shipped_templates_load():
+    templates = get_templates()
+    assert {'test', 'generate_article', 'evaluate_sentence',
+            'generate_examples', 'generate_examples_batch'} <= set(templates)
+    assert get_templates() is templates
+    for name, template in templates.items():
+        assert template.name == name
+        assert template.version
+        # Every field can be filled in
+        template.render(**{field: 'x' for field in template.fields})
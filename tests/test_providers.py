@@ -0,0 +1,159 @@
+import os
+import sys
+import threading
+import time
+
+import jwt
+import pytest
+
+# Add parent and libs directories to Python path
+addon_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(addon_dir)
+sys.path.append(os.path.join(addon_dir, 'libs'))
+from src.api import openai_client
+from src.api.cancel import CancelToken, RequestCancelled
+from src.api.errors import APIError, RateLimitError
+from src.api.providers import create_provider
+
+from mock_server import MockChatServer, MockResponse
+
+
+@pytest.fixture
+def server():
+    with MockChatServer() as server:
+        yield server
+
+
+def local_config(server, path=''):
+    return {
+        'local_base_url': f"{server.url}{path}",
+        'local_model': 'mock',
+        'local_api_key': '',
+        'temperature': 0.7,
+        'timeout': 10,
+        'pool_maxsize': 2,
+        'pool_idle_timeout': 60
+    }
+
+
+def test_local_provider_streams(server):
+    provider = create_provider('Local', local_config(server))
+    chunks = []
+    try:
+        assert provider.complete([{'role': 'user', 'content': 'hi'}], chunks.append) == 'Hello'
+        assert chunks == ['Hel', 'lo']
+        assert provider.complete([{'role': 'user', 'content': 'hi'}]) == 'Hello'
+        assert server.requests[0]['body']['model'] == 'mock'
+    finally:
+        provider.close()
+
+
+def test_local_provider_maps_errors(server):
+    server.respond('/fail', MockResponse(status=500, body='{"error": "boom"}'))
+    provider = create_provider('Local', local_config(server, '/fail'))
+    try:
+        with pytest.raises(APIError):
+            provider.complete([{'role': 'user', 'content': 'hi'}])
+    finally:
+        provider.close()
+
+
+def test_openai_clients_are_released(server):
+    config = local_config(server)
+    provider = create_provider('Local', config)
+    provider.complete([{'role': 'user', 'content': 'hi'}])
+    old_settings = provider._settings
+    assert old_settings in openai_client._clients
+
+    # A new base URL replaces the client built for the old one
+    provider.configure(dict(config, local_base_url=f"{server.url}/v2"))
+    assert old_settings not in openai_client._clients
+    provider.complete([{'role': 'user', 'content': 'hi'}])
+    assert server.requests[-1]['path'] == '/v2/chat/completions'
+
+    settings = provider._settings
+    provider.close()
+    assert settings not in openai_client._clients
+
+
+def chatglm_config(server, path=''):
+    return {
+        'chatglm_api_key': 'test-id.' + 's' * 32,
+        'chatglm_model': 'glm-4',
+        'chatglm_endpoint': f"{server.url}{path}/chat/completions",
+        'chatglm_token_ttl': 3600,
+        'temperature': 0.7,
+        'timeout': 10,
+        'pool_connections': 1,
+        'pool_maxsize': 2,
+        'pool_idle_timeout': 60
+    }
+
+
+def test_chatglm_provider_sends_signed_token(server):
+    provider = create_provider('ChatGLM', chatglm_config(server))
+    chunks = []
+    try:
+        assert provider.complete([{'role': 'user', 'content': 'hi'}], chunks.append) == 'Hello'
+        assert provider.complete([{'role': 'user', 'content': 'hi'}]) == 'Hello'
+        assert chunks == ['Hel', 'lo']
+        tokens = {request['headers']['Authorization'] for request in server.requests}
+        # Both requests reuse one cached token
+        assert len(tokens) == 1
+        token = tokens.pop()[len('Bearer '):]
+        claims = jwt.decode(token, 's' * 32, algorithms=['HS256'])
+        assert claims['api_key'] == 'test-id'
+        assert jwt.get_unverified_header(token)['sign_type'] == 'SIGN'
+    finally:
+        provider.close()
+
+
+def test_chatglm_provider_resigns_after_401(server):
+    server.respond('/auth', MockResponse(status=401, body='{"error": "expired"}'))
+    provider = create_provider('ChatGLM', chatglm_config(server, '/auth'))
+    try:
+        token = provider.auth.token()
+        with pytest.raises(APIError):
+            provider.complete([{'role': 'user', 'content': 'hi'}])
+        time.sleep(0.002)
+        assert provider.auth.token() != token
+    finally:
+        provider.close()
+
+
+def test_chatglm_rate_limit_carries_retry_after(server):
+    server.respond('/busy', MockResponse(status=429, headers={'Retry-After': '7'}))
+    provider = create_provider('ChatGLM', chatglm_config(server, '/busy'))
+    try:
+        with pytest.raises(RateLimitError) as error:
+            provider.complete([{'role': 'user', 'content': 'hi'}])
+        assert error.value.retry_after == 7
+    finally:
+        provider.close()
+
+
+def test_chatglm_rejects_plain_keys(server):
+    config = dict(chatglm_config(server), chatglm_api_key='plain-key')
+    assert 'id.secret' in create_provider('ChatGLM', config).config_error(config)
+
+
+@pytest.mark.parametrize('name', ['Local', 'ChatGLM'])
+@pytest.mark.parametrize('stream, response', [
+    (True, MockResponse(delay=3.0)),
+    (False, MockResponse(delay=3.0)),
+    (True, MockResponse(chunk_delay=3.0))
+], ids=['before-headers-stream', 'before-headers', 'mid-stream'])
+def test_cancel_returns_while_server_delays(server, name, stream, response):
+    server.respond('/slow', response)
+    config = local_config(server, '/slow') if name == 'Local' else chatglm_config(server, '/slow')
+    provider = create_provider(name, config)
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+    start = time.monotonic()
+    try:
+        with pytest.raises(RequestCancelled):
+            provider.complete([{'role': 'user', 'content': 'hi'}],
+                              (lambda chunk: None) if stream else None, cancel_token=token)
+        assert time.monotonic() - start < 1.0
+    finally:
+        provider.close()
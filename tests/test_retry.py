@@ -0,0 +1,92 @@
+import os
+import sys
+import time
+from email.utils import formatdate
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.retry import RetryScheduler, TokenBucket, parse_retry_after
+
+
+class FakeLimiter:
+    """Records pauses instead of holding requests"""
+
+    def __init__(self):
+        self.pauses = []
+
+    def pause(self, seconds):
+        self.pauses.append(seconds)
+
+    def acquire(self, priority, tokens, cancel_token):
+        return 0.0
+
+
+def make_scheduler(max_attempts=3, base_delay=1.0, max_delay=30.0, max_rate_limit_wait=60.0):
+    return RetryScheduler(FakeLimiter(), max_attempts, base_delay, max_delay, max_rate_limit_wait)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) == 60
+    assert parse_retry_after('2.1') == 3
+    assert parse_retry_after('-5') == 0
+    assert parse_retry_after('soon', default=7) == 7
+    # Non-finite values are ignored, the caller backs off instead
+    assert parse_retry_after('inf') is None
+    assert parse_retry_after('-inf') is None
+    assert parse_retry_after('nan') is None
+    assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.wait_time(2) == 0
+    bucket.consume(2)
+    assert bucket.wait_time(1) == pytest.approx(0.1, abs=0.02)
+    time.sleep(0.1)
+    assert bucket.wait_time(1) == pytest.approx(0, abs=0.02)
+
+
+def test_token_bucket_caps_at_capacity():
+    bucket = TokenBucket(rate=1000, capacity=2)
+    time.sleep(0.01)
+    bucket.consume(2)
+    assert bucket.wait_time(1) > 0
+
+
+def test_token_bucket_pause():
+    bucket = TokenBucket(rate=100, capacity=5)
+    bucket.pause(0.2)
+    # Nothing is handed out during the pause, then one request may go
+    assert bucket.wait_time(1) == pytest.approx(0.2, abs=0.02)
+    assert bucket.wait_time(2) == pytest.approx(0.21, abs=0.02)
+
+
+def test_token_bucket_configure_shrinks_burst():
+    bucket = TokenBucket(rate=1, capacity=10)
+    bucket.configure(rate=2, capacity=3)
+    bucket.consume(3)
+    assert bucket.wait_time(1) == pytest.approx(0.5, abs=0.02)
+
+
+def test_on_error_backs_off_within_ceiling():
+    scheduler = make_scheduler(max_attempts=4, base_delay=1.0, max_delay=3.0)
+    for ceiling in (1.0, 2.0, 3.0):
+        delay = scheduler.on_error(ValueError())
+        assert 0 <= delay <= ceiling
+    assert scheduler.on_error(ValueError()) is None
+    assert scheduler.attempts == 4
+
+
+def test_on_error_rate_limit_pauses_limiter():
+    scheduler = make_scheduler()
+    assert scheduler.on_error(ValueError(), retry_after=5) == 0.0
+    assert scheduler.limiter.pauses == [5]
+
+
+def test_on_error_gives_up_on_long_rate_limit():
+    scheduler = make_scheduler(max_rate_limit_wait=10)
+    assert scheduler.on_error(ValueError(), retry_after=30) is None
+    # Other requests still wait for the provider to accept requests again
+    assert scheduler.limiter.pauses == [30]
@@ -0,0 +1,116 @@
+import os
+import sys
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.routing import Failover, Route, Router, parse_routes, routes_config_error
+from src.config.defaults import DEFAULT_CONFIG
+
+FAST = Route('OpenAI', 'gpt-4')
+SLOW = Route('ChatGLM', 'glm-4')
+
+
+def make_config(**overrides):
+    config = dict(DEFAULT_CONFIG, openai_api_key='test-key', chatglm_api_key='id.secret')
+    config['routes'] = {'evaluate_sentence': [list(SLOW), list(FAST)]}
+    config['route_min_samples'] = 3
+    config.update(overrides)
+    return config
+
+
+def test_parse_routes():
+    assert parse_routes(['OpenAI', ['ChatGLM', 'glm-3'], ['Local', None]]) == [
+        ('OpenAI', None), ('ChatGLM', 'glm-3'), ('Local', None)
+    ]
+    with pytest.raises(ValueError):
+        parse_routes([['OpenAI']])
+
+
+def test_routes_config_error():
+    assert routes_config_error(make_config()) is None
+    assert 'Unknown provider' in routes_config_error(make_config(routes={'test': ['Nope']}))
+    assert routes_config_error(make_config(routes={'test': 'OpenAI'})) is not None
+
+
+def test_actions_without_routes_use_selected_provider():
+    router = Router(make_config(api_provider='OpenAI', openai_model='gpt-3.5-turbo'))
+    assert router.routes_for('generate_article') == [Route('OpenAI', 'gpt-3.5-turbo')]
+
+
+def test_failing_route_is_degraded():
+    router = Router(make_config())
+    assert router.routes_for('evaluate_sentence') == [SLOW, FAST]
+
+    for _ in range(2):
+        router.record('evaluate_sentence', SLOW, 1.0, ok=False)
+    # Too few samples to judge
+    assert not router.is_degraded('evaluate_sentence', SLOW)
+    router.record('evaluate_sentence', SLOW, 1.0, ok=False)
+    assert router.is_degraded('evaluate_sentence', SLOW)
+    assert router.routes_for('evaluate_sentence') == [FAST, SLOW]
+    assert router.stats()['evaluate_sentence ChatGLM/glm-4']['error_rate'] == 1.0
+
+
+def test_slow_route_is_degraded():
+    router = Router(make_config(route_latency_budget={'evaluate_sentence': 10}))
+    for latency in (20, 20, 20):
+        router.record('evaluate_sentence', SLOW, latency)
+    assert router.is_degraded('evaluate_sentence', SLOW)
+    # The budget only applies to the action it is set for
+    for latency in (20, 20, 20):
+        router.record('generate_article', SLOW, latency)
+    assert not router.is_degraded('generate_article', SLOW)
+
+
+def test_degraded_route_is_probed_again():
+    router = Router(make_config(route_probe_interval=0))
+    for _ in range(3):
+        router.record('evaluate_sentence', SLOW, 1.0, ok=False)
+    assert router.routes_for('evaluate_sentence') == [SLOW, FAST]
+
+
+def test_first_token_percentile_needs_samples():
+    router = Router(make_config())
+    router.record('evaluate_sentence', FAST, 5.0, first_token=1.0)
+    assert router.first_token_percentile('evaluate_sentence', FAST, 90) is None
+    for first_token in (2.0, 3.0):
+        router.record('evaluate_sentence', FAST, 5.0, first_token=first_token)
+    assert router.first_token_percentile('evaluate_sentence', FAST, 50) == 2.0
+    assert router.expected_first_token('evaluate_sentence', FAST, 1.5) == 2.5
+    assert router.expected_first_token('evaluate_sentence', FAST, 3.0) is None
+
+
+class FakeRetryScheduler:
+    pass
+
+
+def test_failover_moves_on_while_route_backs_off():
+    schedulers = {}
+
+    def make_scheduler(route):
+        schedulers[route] = FakeRetryScheduler()
+        return schedulers[route]
+
+    failover = Failover([SLOW, FAST], make_scheduler)
+    route, scheduler, wait = failover.current()
+    assert (route, wait) == (SLOW, 0.0)
+
+    failover.retry_later(SLOW, 10)
+    route, _, wait = failover.current()
+    assert (route, wait) == (FAST, 0.0)
+
+    # Back to the first route, which waits out the rest of its delay
+    failover.retry_later(FAST, 0)
+    route, again, wait = failover.current()
+    assert route == SLOW and again is scheduler
+    assert 9 < wait <= 10
+
+
+def test_failover_drop():
+    failover = Failover([SLOW, FAST], lambda route: FakeRetryScheduler())
+    failover.current()
+    assert failover.drop(SLOW)
+    assert failover.current()[0] == FAST
+    assert not failover.drop(FAST)
@@ -0,0 +1,158 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.cancel import CancelToken, RequestCancelled
+from src.api.scheduler import Priority, RequestScheduler
+
+
+def wait_until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        time.sleep(0.005)
+
+
+def start_acquire(scheduler, priority, admitted, cancel_token=None):
+    def run():
+        try:
+            scheduler.acquire(priority, cancel_token=cancel_token)
+            admitted.append(priority)
+        except RequestCancelled:
+            admitted.append('cancelled')
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_acquire_is_immediate_within_budget():
+    scheduler = RequestScheduler(requests_per_minute=600, tokens_per_minute=0)
+    assert scheduler.acquire() < 0.05
+    assert scheduler.stats()['admitted'] == 1
+
+
+def test_acquire_admits_higher_priority_first():
+    # 60 RPM gives one request per second after a burst of ten
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=0)
+    for _ in range(10):
+        scheduler.acquire()
+
+    admitted = []
+    threads = [start_acquire(scheduler, Priority.BACKGROUND, admitted)]
+    wait_until(lambda: scheduler.stats()['queue_depth'] == 1)
+    threads.append(start_acquire(scheduler, Priority.NORMAL, admitted))
+    wait_until(lambda: scheduler.stats()['queue_depth'] == 2)
+    threads.append(start_acquire(scheduler, Priority.INTERACTIVE, admitted))
+    wait_until(lambda: scheduler.stats()['queue_depth'] == 3)
+
+    # Refill quickly instead of waiting a second per request
+    scheduler.configure(requests_per_minute=6000, tokens_per_minute=0)
+    for thread in threads:
+        thread.join(5)
+    assert admitted == [Priority.INTERACTIVE, Priority.NORMAL, Priority.BACKGROUND]
+
+
+def test_cancel_leaves_queue():
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=0)
+    for _ in range(10):
+        scheduler.acquire()
+
+    admitted = []
+    token = CancelToken()
+    thread = start_acquire(scheduler, Priority.INTERACTIVE, admitted, token)
+    wait_until(lambda: scheduler.stats()['queue_depth'] == 1)
+    token.cancel()
+    thread.join(1)
+
+    assert admitted == ['cancelled']
+    assert scheduler.stats()['queue_depth'] == 0
+    assert scheduler.stats()['admitted'] == 10
+
+
+def test_cancelled_token_raises_at_once():
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=0)
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(RequestCancelled):
+        scheduler.acquire(cancel_token=token)
+
+
+def test_token_budget_limits_large_requests():
+    scheduler = RequestScheduler(requests_per_minute=0, tokens_per_minute=600)
+    # The burst is ten seconds' worth, 100 tokens
+    scheduler.acquire(tokens=100)
+    assert scheduler._wait_time(10) == pytest.approx(1.0, abs=0.05)
+    # A request over the burst size only waits for a full bucket
+    assert scheduler._wait_time(1000) == pytest.approx(10.0, abs=0.05)
+
+
+def test_pause_holds_requests():
+    scheduler = RequestScheduler(requests_per_minute=600, tokens_per_minute=0)
+    scheduler.pause(0.2)
+    assert scheduler.acquire() >= 0.15
+
+
+def test_acquire_async_waits_without_threads():
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=0)
+    for _ in range(10):
+        scheduler.acquire()
+
+    async def main():
+        admitted = []
+
+        async def request(priority):
+            await scheduler.acquire_async(priority)
+            admitted.append(priority)
+
+        threads = threading.active_count()
+        tasks = [asyncio.create_task(request(priority)) for priority in
+                 [Priority.BACKGROUND] * 20 + [Priority.INTERACTIVE]]
+        while scheduler.stats()['queue_depth'] < len(tasks):
+            await asyncio.sleep(0.005)
+        assert threading.active_count() == threads
+
+        scheduler.configure(requests_per_minute=60000, tokens_per_minute=0)
+        await asyncio.wait_for(asyncio.gather(*tasks), 5)
+        return admitted
+
+    admitted = asyncio.run(main())
+    assert admitted == [Priority.INTERACTIVE] + [Priority.BACKGROUND] * 20
+    assert scheduler.stats()['queue_depth'] == 0
+
+
+def test_acquire_async_queues_behind_threads():
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=0)
+    for _ in range(10):
+        scheduler.acquire()
+
+    admitted = []
+    thread = start_acquire(scheduler, Priority.INTERACTIVE, admitted)
+    wait_until(lambda: scheduler.stats()['queue_depth'] == 1)
+
+    async def main():
+        await scheduler.acquire_async(Priority.BACKGROUND)
+        admitted.append(Priority.BACKGROUND)
+
+    asyncio.run(asyncio.wait_for(main(), 5))
+    thread.join(1)
+    # The thread was admitted first, the coroutine a second later
+    assert admitted == [Priority.INTERACTIVE, Priority.BACKGROUND]
+
+
+def test_cancel_wakes_acquire_async():
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=0)
+    for _ in range(10):
+        scheduler.acquire()
+    token = CancelToken()
+    threading.Timer(0.1, token.cancel).start()
+
+    with pytest.raises(RequestCancelled):
+        asyncio.run(asyncio.wait_for(scheduler.acquire_async(cancel_token=token), 0.5))
+    assert scheduler.stats()['queue_depth'] == 0
@@ -0,0 +1,43 @@
+import os
+import sys
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.api.sse import SSEDecoder, iter_sse_data
+
+
+def test_events_end_at_blank_lines():
+    lines = [b'data: {"a": 1}', b'', 'data: {"b": 2}\r', '']
+    assert list(iter_sse_data(lines)) == ['{"a": 1}', '{"b": 2}']
+
+
+def test_multiline_data_is_joined():
+    assert list(iter_sse_data(['data: one', 'data:two', ''])) == ['one\ntwo']
+
+
+def test_comments_and_other_fields_are_skipped():
+    lines = [': keep-alive', 'event: message', 'id: 7', 'retry: 100', 'data: x', '']
+    assert list(iter_sse_data(lines)) == ['x']
+
+
+def test_done_marker_ends_stream():
+    lines = ['data: x', '', 'data: [DONE]', '', 'data: after', '']
+    assert list(iter_sse_data(lines)) == ['x']
+
+
+def test_unterminated_event_is_flushed():
+    assert list(iter_sse_data(['data: x', '', 'data: last'])) == ['x', 'last']
+
+
+def test_decoder_feeds_incrementally():
+    decoder = SSEDecoder()
+    assert decoder.feed('data: partial') is None
+    assert decoder.feed('') == 'partial'
+    assert decoder.feed('') is None
+    assert decoder.feed('data: [DONE]') is None
+    assert decoder.feed('') is None
+    assert decoder.done
+
+
+def test_utf8_bytes_are_decoded():
+    assert list(iter_sse_data(['data: 日本語'.encode('utf-8'), b''])) == ['日本語']
@@ -0,0 +1,76 @@
+import os
+import sys
+
+import pytest
+from PyQt6.QtCore import QCoreApplication, Qt
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.ui.widgets.word_list_model import WordListModel
+
+WORDS = ['alpha', 'beta', 'gamma', 'delta']
+
+
+@pytest.fixture
+def app():
+    return QCoreApplication.instance() or QCoreApplication([])
+
+
+@pytest.fixture
+def model(app):
+    model = WordListModel(WORDS)
+    model.changes = []
+    model.selection_changed.connect(lambda added, removed: model.changes.append((added, removed)))
+    return model
+
+
+def set_checked(model, word, checked):
+    state = Qt.CheckState.Checked if checked else Qt.CheckState.Unchecked
+    return model.setData(model.index(WORDS.index(word)), state.value, Qt.ItemDataRole.CheckStateRole)
+
+
+def test_changes_in_one_tick_are_coalesced(app, model):
+    set_checked(model, 'beta', False)
+    set_checked(model, 'alpha', False)
+    set_checked(model, 'gamma', False)
+    assert model.changes == []
+
+    app.processEvents()
+    # Words come in list order, not in the order they changed
+    assert model.changes == [([], ['alpha', 'beta', 'gamma'])]
+    assert model.selected_words() == ['delta']
+
+
+def test_changes_that_cancel_out_emit_nothing(app, model):
+    set_checked(model, 'beta', False)
+    set_checked(model, 'beta', True)
+    app.processEvents()
+    assert model.changes == []
+
+
+def test_batch_update_emits_net_change_once(model):
+    with model.batch_update():
+        model.set_all_checked(False)
+        model.set_words_checked(['gamma', 'alpha'], True)
+        with model.batch_update():
+            set_checked(model, 'alpha', False)
+        assert model.changes == []
+    assert model.changes == [([], ['alpha', 'beta', 'delta'])]
+    assert model.selected_words() == ['gamma']
+    assert model.selected_count() == 1
+
+
+def test_unchanged_words_are_ignored(model):
+    model.set_words_checked(['alpha', 'unknown'], True)
+    assert set_checked(model, 'beta', True)
+    model.flush_selection_change()
+    assert model.changes == []
+
+
+def test_check_state_data(model):
+    set_checked(model, 'gamma', False)
+    index = model.index(WORDS.index('gamma'))
+    assert model.data(index) == 'gamma'
+    assert model.data(index, Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Unchecked
+    assert not model.is_selected('gamma')
+    assert model.rowCount() == len(WORDS)
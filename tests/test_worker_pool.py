@@ -0,0 +1,47 @@
+import os
+import sys
+import threading
+
+# Add parent directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.utils.worker import AIWorker
+from src.utils.worker_pool import WorkerPool, get_worker_pool
+
+
+def wait_done(task, timeout=5):
+    pool = get_worker_pool()
+    assert pool.wait_for_done(int(timeout * 1000))
+    assert task.done
+
+
+def test_stop_finished_worker(tmp_path):
+    """stop() after the request finished must not touch the deleted runnable"""
+    worker = AIWorker("unknown_action", {}, str(tmp_path / "config.json"))
+    worker.start()
+    wait_done(worker._task)
+
+    assert not worker.isRunning()
+    worker.stop()
+    worker.stop()
+    assert not get_worker_pool().cancel(worker._task)
+
+
+def test_cancel_queued_task():
+    pool = WorkerPool(max_threads=1)
+    release = threading.Event()
+    ran = []
+    blocker = pool.submit(release.wait)
+    queued = pool.submit(lambda: ran.append(True))
+
+    assert pool.cancel(queued)
+    assert queued.done
+    assert not pool.cancel(blocker)  # already running
+    release.set()
+    assert pool.wait_for_done(5000)
+
+    assert not ran
+    assert not pool.cancel(blocker)
+    stats = pool.stats()
+    assert stats['cancelled'] == 1
+    assert stats['completed'] == 1
+    assert stats['queued'] == 0